@@ -5,8 +5,17 @@
 
 import os
 from dotenv import load_dotenv
+from config.settings import settings
+from src.brain.macros import MacroLibrary
+from src.brain.memory import MemoryStore
+from src.brain.metrics import BrainMetrics
 from src.brain.robot_brain import RobotBrain
+from src.perception.audio_prep import UploadPreprocessor
 from src.perception.speech_recognizer import SpeechRecognizer
+from src.perception.stt_backends import create_backend
+from src.perception.capture_service import AudioCaptureService
+from src.perception.keyword_spotter import KeywordSpotter
+from src.perception.low_power import LowPowerListener
 from src.perception.microphone import MicrophoneRecorder
 from src.perception.text_to_speech import create_tts, MacOSTTS
 from src.perception.wake_word import SmartWakeWordDetector
@@ -43,27 +52,69 @@ class Atreides:
         print("=" * 60)
 
         # AI Brain - with robot identity
-        self.brain = RobotBrain(api_key=api_key, model="gpt-4o-mini")
+        memory = MemoryStore(path=settings.memory_dir) if settings.memory_dir else None
+        self.macros = MacroLibrary(path=settings.macro_library_path or None)
+        self.brain = RobotBrain(
+            api_key=api_key,
+            model="gpt-4o-mini",
+            memory=memory,
+            macro_library=self.macros,
+            known_objects=lambda: self.simulator.objects,  # macro slots must name a simulator object
+            metrics=BrainMetrics(log_path=settings.metrics_log_path or None),
+        )
         self._customize_brain()
         print(f"✓ AI Brain ({self.name})")
 
         # Speech Recognition
-        self.recognizer = SpeechRecognizer(api_key=api_key)
-        print("✓ Speech Recognition")
+        local_stt = settings.stt_backend != "openai"
+        backend = create_backend(
+            settings.stt_backend,
+            api_key=api_key,
+            **({"model": settings.stt_local_model, "compute_type": settings.stt_compute_type, "preload": True}
+               if local_stt else {})
+        )
+        self.recognizer = SpeechRecognizer(
+            backend=backend,
+            preprocessor=UploadPreprocessor(codec=settings.stt_upload_codec, trim=settings.stt_trim_silence)
+        )
+        print(f"✓ Speech Recognition ({backend.model_id})")
 
-        # Microphone
-        self.microphone = MicrophoneRecorder()
+        # Microphone - one always-on stream shared by wake word and command capture
+        self.capture = AudioCaptureService(echo_suppression=settings.echo_suppression)
+        self.microphone = MicrophoneRecorder(capture=self.capture)
         print("✓ Microphone")
 
-        # Wake Word Detector
+        # Wake Word Detector - local templates if enrolled, otherwise Whisper
+        spotter = None
+        if os.path.exists(settings.wake_word_templates):
+            spotter = KeywordSpotter.load(settings.wake_word_templates, self.capture.sample_rate)
+        # Idle mode - only a cheap energy check runs until something is heard
+        self.low_power = LowPowerListener(self.capture) if settings.idle_mode else None
         self.wake_detector = SmartWakeWordDetector(
             self.recognizer,
-            wake_words=self.wake_words
+            wake_words=self.wake_words,
+            capture=self.capture,
+            spotter=spotter,
+            low_power=self.low_power
         )
-        print(f"✓ Wake Word Detection ({', '.join(self.wake_words)})")
+        mode = "local" if spotter else "Whisper"
+        if self.low_power is not None:
+            mode += ", idle mode"
+        print(f"✓ Wake Word Detection ({', '.join(self.wake_words)}, {mode})")
 
         # TTS
-        self.tts = create_tts(api_key=api_key, use_openai=use_openai_tts) if use_openai_tts else MacOSTTS()
+        # Echo suppression - Atreides hears itself while capture stays open, so playback is announced
+        echo = self.capture.echo
+        if use_openai_tts:
+            self.tts = create_tts(
+                api_key=api_key,
+                use_openai=True,
+                echo=echo,
+                streaming=settings.tts_streaming,
+                max_workers=settings.tts_max_workers
+            )
+        else:
+            self.tts = MacOSTTS(echo=echo)
         tts_type = "OpenAI" if use_openai_tts else "macOS"
         print(f"✓ Voice Output ({tts_type})")
 
@@ -72,7 +123,7 @@ class Atreides:
         print("✓ Simulator")
 
         # Action Executor
-        self.executor = ActionExecutor(self.simulator)
+        self.executor = ActionExecutor(self.simulator, macro_library=self.macros)
         print("✓ Action Executor")
 
         print(f"\n✅ {self.name} Ready!")
@@ -104,22 +155,29 @@ Always speak naturally and concisely in English.
         print(f"\n🔊 {greeting}")
         self.tts.speak(greeting)
 
-    def listen_for_command(self, duration=5.0):
+    def listen_for_command(self, duration=8.0, start=None, pre_roll=0.0):
         """
         Listen for command
 
+        Speech is recognized while the user is still talking (overlapping
+        segments in the background), so only the last segment is left when
+        they stop.
+
         Args:
-            duration: Recording duration (seconds)
+            duration: Maximum recording duration (seconds)
+            start: Capture position to record from (default: now)
+            pre_roll: Audio before start to include (seconds)
 
         Returns:
             str: Recognized command or None
         """
+        stream = self.recognizer.stream(self.microphone.sample_rate, on_transcript=self._show_partial)
         try:
-            print(f"\n🎤 Listening for {duration} seconds...")
-            audio_file = self.microphone.record(duration=duration)
+            print("\n🎤 Listening...")
+            self.microphone.stream_until_silence(stream.feed, max_duration=duration, start=start, pre_roll=pre_roll)
 
             print("🎤 Recognizing speech...")
-            command = self.recognizer.transcribe_file(audio_file)
+            command = stream.finish()[-1].text
 
             print(f"👤 User: {command}")
             return command
@@ -128,6 +186,22 @@ Always speak naturally and concisely in English.
             print(f"✗ Speech recognition failed: {e}")
             return None
 
+        finally:
+            stream.close()
+
+    def _speaking_since(self, position):
+        """Whether the user has started speaking since the given capture position"""
+        if position is None:
+            return False
+        audio = self.capture.ring.read(max(position, self.capture.ring.oldest), self.capture.position, copy=True)
+        return bool(len(audio)) and bool(self.microphone.vad.segments(audio[:, 0]))
+
+    @staticmethod
+    def _show_partial(transcript):
+        """Print transcripts of segments committed while the user is speaking"""
+        if not transcript.is_final and transcript.text:
+            print(f"   … {transcript.text}")
+
     def process_command(self, command: str):
         """
         Process and execute command
@@ -150,7 +224,7 @@ Always speak naturally and concisely in English.
         # Execute actions
         if response.commands:
             print(f"\n⚙️  Executing {len(response.commands)} action(s)")
-            self.executor.execute_commands(response.commands)
+            self.executor.execute_commands(response.commands, intent=command)
 
             # Completion notification
             completion = "Done."
@@ -163,6 +237,7 @@ Always speak naturally and concisely in English.
         """
         # Greet
         self.greet()
+        self.capture.start()
 
         print("\n" + "=" * 60)
         print("Standby Mode")
@@ -173,22 +248,29 @@ Always speak naturally and concisely in English.
         try:
             while True:
                 # Detect wake word
-                detected, text = self.wake_detector.listen_smart(
-                    max_silence=1.5,
-                    min_volume=400
-                )
+                detected, text = self.wake_detector.listen_smart(max_silence=1.5)
 
                 if detected:
                     # Wake up!
                     print(f"\n✅ {self.name} activated!")
 
-                    # Acknowledgment
-                    ack = "Yes, I'm listening."
-                    print(f"🔊 {ack}")
-                    self.tts.speak(ack)
+                    # "Jarvis, pick up the red block" - command already spoken with the wake word
+                    command = self.wake_detector.strip_wake_word(text)
+                    if command:
+                        print(f"👤 User: {command}")
+                    elif self._speaking_since(self.wake_detector.last_utterance_end):
+                        # Command started while the wake word was being confirmed - no acknowledgment,
+                        # so the pre-roll cannot pick up Atreides's own voice
+                        command = self.listen_for_command(start=self.wake_detector.last_utterance_end,
+                                                          pre_roll=settings.capture_pre_roll)
+                    else:
+                        # Acknowledgment
+                        ack = "Yes, I'm listening."
+                        print(f"🔊 {ack}")
+                        self.tts.speak(ack)
 
-                    # Listen for command
-                    command = self.listen_for_command(duration=5.0)
+                        # Listen for command - from the end of the acknowledgment, not before it
+                        command = self.listen_for_command()
 
                     if command:
                         # Process command
@@ -204,10 +286,44 @@ Always speak naturally and concisely in English.
 
         except KeyboardInterrupt:
             print(f"\n\nShutting down {self.name} system.")
+            self.capture.stop()
+            self._print_metrics()
             goodbye = "Goodbye."
             print(f"🔊 {goodbye}")
             self.tts.speak(goodbye)
 
+    def _print_metrics(self):
+        """Print LLM usage summary"""
+        summary = self.brain.metrics.summary()
+        p95 = summary["total_time_seconds_p95"]
+        print(
+            f"📊 Brain: {summary['calls']} calls ({summary['macro_calls']} via macros), "
+            f"{summary['prompt_tokens'] + summary['completion_tokens']} tokens, "
+            f"${summary['cost_usd']:.4f}, p95 latency "
+            + (f"{p95:.2f}s" if p95 is not None else "n/a")
+        )
+        wake = self.wake_detector.stats
+        print(
+            f"📊 Wake word: {wake.candidates} candidates, {wake.verification_calls} STT calls, "
+            f"{wake.false_accepts} false accepts"
+        )
+        if self.low_power is not None:
+            power = self.low_power.summary()
+            idle, active = power["idle"], power["active"]
+            print(
+                f"📊 Listening: idle {idle['seconds']:.0f}s at {idle['cpu_percent']:.1f}% CPU, "
+                f"active {active['seconds']:.0f}s at {active['cpu_percent']:.1f}% CPU, "
+                f"{power['escalations']} wake-ups"
+            )
+        first_audio = getattr(self.tts, "first_audio_latency", None)
+        if first_audio is not None:
+            print(f"📊 Voice output: first audio {first_audio:.2f}s after request")
+        upload = self.recognizer.preprocessor.summary()
+        print(
+            f"📊 STT uploads: {upload['uploads']}, {upload['bytes_out'] / 1024:.0f} KB sent, "
+            f"{upload['bytes_saved'] / 1024:.0f} KB saved ({upload['seconds_in']:.1f}s → {upload['seconds_out']:.1f}s audio)"
+        )
+
 
 def main():
     """Main function"""
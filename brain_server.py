@@ -0,0 +1,54 @@
+"""
+Brain Server - 다중 세션 로봇 두뇌 서비스
+하나의 프로세스로 여러 로봇팔/운영자의 대화를 처리합니다.
+"""
+
+import os
+import sys
+from dotenv import load_dotenv
+from config.settings import settings
+from src.brain.macros import MacroLibrary
+from src.brain.session_manager import BrainSessionManager, create_http_server
+
+load_dotenv()
+
+
+def main():
+    """메인 함수"""
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        print("✗ OPENAI_API_KEY가 설정되지 않았습니다.")
+        return 1
+
+    host, port = settings.brain_host, settings.brain_port
+
+    manager = BrainSessionManager(
+        api_key=api_key,
+        storage_dir=settings.brain_session_dir,
+        max_sessions=settings.brain_max_sessions,
+        macro_library=MacroLibrary(),
+    )
+    server = create_http_server(manager, host=host, port=port)
+
+    print("=" * 60)
+    print(f"🧠 Brain Server: http://{host}:{port}")
+    print("=" * 60)
+    print("  POST   /sessions/<id>/think  {\"message\": \"...\"}")
+    print("  GET    /sessions/<id>")
+    print("  DELETE /sessions/<id>")
+    print("  GET    /sessions")
+    print("  GET    /metrics")
+    print("(Ctrl+C로 종료)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n종료합니다.")
+        manager.evict_idle(now=float("inf"))
+        server.server_close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -28,6 +28,29 @@ class Settings(BaseSettings):
     log_level: str = Field(default="INFO", description="로그 레벨")
     enable_tts: bool = Field(default=False, description="TTS 활성화")
     enable_vision: bool = Field(default=False, description="비전 활성화")
+    memory_dir: str = Field(default="", description="장기 기억 저장 디렉토리 (비어 있으면 비활성화)")
+    metrics_log_path: str = Field(default="", description="LLM 호출 측정 JSON Lines 파일 (비어 있으면 기록 안 함)")
+    macro_library_path: str = Field(default="", description="동작 매크로 저장 파일 (비어 있으면 메모리 전용)")
+
+    # Brain Server (brain_server.py)
+    brain_host: str = Field(default="127.0.0.1", description="두뇌 서버 주소")
+    brain_port: int = Field(default=8080, description="두뇌 서버 포트")
+    brain_session_dir: str = Field(default="sessions", description="내보낸 대화 세션을 저장할 디렉토리")
+    brain_max_sessions: int = Field(default=32, description="메모리에 상주할 최대 세션 수 (넘으면 오래 쉰 세션부터 디스크로)")
+
+    # Audio Settings
+    capture_pre_roll: float = Field(default=0.5, description="웨이크워드 확인 중에 명령을 말하기 시작했을 때 발화 끝 이전부터 포함할 시간 (초, 응답 음성 없이 바로 녹음)")
+    stt_backend: str = Field(default="openai", description="음성 인식 백엔드 (openai | faster-whisper, 로컬 CPU 오프라인)")
+    stt_local_model: str = Field(default="base.en", description="로컬 음성 인식 모델 (tiny.en, base.en, small.en 또는 경로)")
+    stt_compute_type: str = Field(default="int8", description="로컬 모델 양자화 타입 (int8 | int8_float32 | float32)")
+    stt_cache_dir: str = Field(default=".cache/stt", description="음성 인식 결과 디스크 캐시 디렉토리 (파일 입력만, 비어 있으면 메모리만)")
+    stt_upload_codec: str = Field(default="flac", description="음성 인식 업로드 코덱 (flac | opus | wav, soundfile 필요)")
+    stt_trim_silence: bool = Field(default=True, description="업로드 전 앞뒤 무음 제거")
+    wake_word_templates: str = Field(default="data/wake_word.npz", description="로컬 웨이크워드 템플릿 파일 (없으면 음성 인식 API로 감지)")
+    echo_suppression: bool = Field(default=True, description="TTS 재생 중/직후 캡처에서 로봇 자신의 목소리 억제")
+    idle_mode: bool = Field(default=True, description="저전력 대기: 조용할 때는 에너지 검사만 하고 소리가 나면 웨이크워드 감지 시작")
+    tts_streaming: bool = Field(default=True, description="OpenAI TTS를 합성되는 대로 바로 재생 (False면 파일로 저장 후 재생)")
+    tts_max_workers: int = Field(default=3, description="긴 답변을 문장별로 동시에 합성할 최대 요청 수 (1이면 한 번에 합성)")
 
     # Safety Settings
     max_velocity: float = Field(default=1.0, description="최대 속도 (m/s)")
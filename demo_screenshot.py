@@ -5,8 +5,10 @@ Physical AI 스크린샷 데모
 
 import os
 from dotenv import load_dotenv
+from config.settings import settings
 from src.brain.robot_brain import RobotBrain
 from src.perception.speech_recognizer import VoiceCommandListener
+from src.perception.stt_cache import TranscriptionCache
 from src.simulation.simple_robot_sim import SimpleRobotSimulator
 from src.motion.action_executor import ActionExecutor
 from src.simulation.visualizer import RobotVisualizer
@@ -29,7 +31,10 @@ def main():
     # 시스템 초기화
     print("\n시스템 초기화 중...")
     brain = RobotBrain(api_key=api_key, model="gpt-4o-mini")
-    listener = VoiceCommandListener(api_key=api_key)
+    listener = VoiceCommandListener(
+        api_key=api_key,
+        cache=TranscriptionCache(path=settings.stt_cache_dir or None)
+    )
     simulator = SimpleRobotSimulator()
     executor = ActionExecutor(simulator)
 
@@ -46,6 +51,10 @@ def main():
     visualizer.draw_state(simulator, title="초기 상태")
     visualizer.save("output/01_initial.png")
 
+    # 두 시나리오 음성을 미리 동시에 인식 (결과는 캐시에 남음)
+    audio_files = [f for f in ("test_audio/command1.wav", "test_audio/command2.wav") if os.path.exists(f)]
+    listener.listen_from_files(audio_files)
+
     # 시나리오 1: 빨간 블록 집기
     print("\n" + "=" * 60)
     print("시나리오 1: 빨간 블록 집기")
@@ -0,0 +1,57 @@
+"""
+웨이크워드 등록 스크립트
+웨이크워드를 몇 번 녹음해 로컬 키워드 스포터 템플릿을 만듭니다.
+
+사용법:
+    python enroll_wake_word.py                 # "jarvis" 5회 녹음
+    python enroll_wake_word.py atreides 6      # 단어와 횟수 지정
+    python enroll_wake_word.py jarvis a.wav b.wav  # WAV 파일로 등록
+"""
+
+import os
+import sys
+
+from config.settings import settings
+from src.perception.keyword_spotter import KeywordSpotter
+
+
+def main():
+    word = sys.argv[1] if len(sys.argv) > 1 else "jarvis"
+    args = sys.argv[2:]
+    path = settings.wake_word_templates
+
+    # 기존 템플릿에 추가
+    spotter = KeywordSpotter.load(path) if os.path.exists(path) else KeywordSpotter()
+
+    print("=" * 60)
+    print(f"🎙️  웨이크워드 등록: '{word}'")
+    print("=" * 60)
+
+    wav_files = [arg for arg in args if arg.endswith(".wav")]
+    if wav_files:
+        for wav in wav_files:
+            spotter.enroll_file(word, wav)
+            print(f"  ✓ {wav}")
+    else:
+        from src.perception.microphone import MicrophoneRecorder
+
+        count = int(args[0]) if args else 5
+        microphone = MicrophoneRecorder(sample_rate=spotter.sample_rate)
+        for i in range(count):
+            input(f"\n[{i + 1}/{count}] Enter를 누르고 '{word}'라고 말하세요...")
+            audio = microphone.record_audio(duration=1.5)
+            try:
+                spotter.enroll(word, audio)
+                print("  ✓ 등록됨")
+            except ValueError as e:
+                print(f"  ✗ {e}")
+
+    threshold = spotter.calibrate()
+    spotter.save(path)
+
+    templates = sum(len(t) for t in spotter.templates.values())
+    print(f"\n✓ 저장: {path} (템플릿 {templates}개, 임계값 {threshold:.3f})")
+
+
+if __name__ == "__main__":
+    main()
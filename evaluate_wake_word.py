@@ -0,0 +1,108 @@
+"""
+웨이크워드 평가 스크립트
+라벨링한 긴 녹음으로 로컬 스포터의 FAR/FRR 곡선과 감지 지연을 측정하고,
+텍스트 매칭 규칙("man", "tre" 같은 일부 매칭 포함)의 오감지를 집계합니다.
+
+사용법:
+    python evaluate_wake_word.py                          # 텍스트 규칙만 (기본 문장 목록)
+    python evaluate_wake_word.py day.wav                  # day.txt(Audacity 라벨) 사용
+    python evaluate_wake_word.py day.wav day.json transcripts.jsonl
+
+transcripts.jsonl: 한 줄에 {"text": "인식된 문장", "wake": true/false}
+"""
+
+import json
+import os
+import sys
+
+from config.settings import settings
+from src.perception.keyword_spotter import KeywordSpotter
+from src.perception.wake_eval import LabeledRecording, WakeWordEvaluator, evaluate_text_rules
+from src.perception.wake_word import WAKE_WORD_ENDINGS
+
+
+WAKE_WORDS = [
+    "jarvis", "자비스", "제비스",
+    "atreides", "아트레이디스", "아트레이데스", "아트레",
+    "ironman", "아이언맨",
+]
+
+# 웨이크워드가 없는 평범한 명령/대화 (음성 인식 결과 형태)
+DEFAULT_TRANSCRIPTS = [(text, False) for text in [
+    "pick up the red block", "put it on the tray", "move to the left", "open the gripper",
+    "close the gripper", "go back to the start position", "put the jar on the table",
+    "what is the temperature", "show me the street", "that is a tree", "move the blue cube over there",
+    "stop", "thank you very much", "the man is standing", "manual mode please", "many blocks are here",
+    "how is the environment", "visit the kitchen", "turn the visor up", "human detected",
+    "are you there", "lift the arm a little higher", "rotate the wrist", "okay", "never mind",
+    "빨간 블록 집어", "왼쪽으로 가", "그 사람 어디 있어", "트레이에 올려", "크리스마스 트리",
+]] + [(text, True) for text in [
+    "jarvis", "jarvis pick up the red block", "hey jarvis", "jarvis, open the gripper",
+    "atreides", "jar vis", "jarvi", "ironman", "iron man", "자비스", "자비스 블록 집어", "아트레이디스",
+]]
+
+
+def print_curve(points):
+    print(f"\n{'임계값':>8} {'감지':>5} {'오감지':>6} {'FAR/h':>8} {'FRR':>6} {'지연 p50':>9} {'p90':>7} {'p99':>7}")
+    for point in points:
+        latency = point.latency
+        print(
+            f"{point.threshold:8.3f} {point.detections:5d} {point.false_accepts:6d} {point.far_per_hour:8.1f} "
+            f"{point.frr:6.2f} {latency.get('p50', float('nan')):9.2f} "
+            f"{latency.get('p90', float('nan')):7.2f} {latency.get('p99', float('nan')):7.2f}"
+        )
+
+
+def print_text_rules(report):
+    print(f"\n텍스트 규칙 (웨이크워드 문장 {report['positives']}개, 일반 문장 {report['negatives']}개)")
+    for rule, stats in report["rules"].items():
+        examples = ", ".join(f"'{e}'" for e in stats["examples"][:3])
+        print(f"  {rule:9s} 감지 {stats['true_accepts']:3d}  오감지 {stats['false_accepts']:3d}  {examples}")
+
+    noisy = {ending: count for ending, count in report["endings"].items() if count}
+    if noisy:
+        print("  일부 매칭 오감지: " + ", ".join(f"'{e}' {c}" for e, c in noisy.items()))
+
+    print("\n  규칙 누적        FAR     FRR")
+    for row in report["cumulative"]:
+        print(f"  {row['rules']:32s} {row['far']:5.2f}  {row['frr']:5.2f}")
+
+
+def load_transcripts(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [(item["text"], item["wake"]) for item in map(json.loads, f) if item]
+
+
+def main():
+    args = sys.argv[1:]
+    wav_files = [arg for arg in args if arg.endswith(".wav")]
+    label_files = [arg for arg in args if arg.endswith((".txt", ".json"))]
+    transcript_files = [arg for arg in args if arg.endswith(".jsonl")]
+
+    print("=" * 60)
+    print("📏 웨이크워드 평가")
+    print("=" * 60)
+
+    if wav_files:
+        path = settings.wake_word_templates
+        if not os.path.exists(path):
+            print(f"✗ 템플릿 없음: {path} (python enroll_wake_word.py 먼저 실행)")
+            return 1
+
+        spotter = KeywordSpotter.load(path)
+        recording = LabeledRecording.load(wav_files[0], label_files[0] if label_files else None)
+        evaluator = WakeWordEvaluator(spotter)
+        times, costs = evaluator.score_windows(recording)
+
+        print(f"\n{recording.name}: {recording.duration / 60:.1f}분, 웨이크워드 {len(recording.events)}회, "
+              f"창 {len(times)}개 ({evaluator.realtime_factor:.0f}배속)")
+        print(f"현재 임계값: {spotter.threshold:.3f}")
+        print_curve(evaluator.sweep(recording, times, costs))
+
+    samples = load_transcripts(transcript_files[0]) if transcript_files else DEFAULT_TRANSCRIPTS
+    print_text_rules(evaluate_text_rules(samples, WAKE_WORDS, WAKE_WORD_ENDINGS))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -75,7 +75,7 @@ class InteractiveRobot:
 
         # 1. 마이크로 녹음
         try:
-            audio_file = self.microphone.record(duration=duration)
+            audio = self.microphone.record_audio(duration=duration)
         except Exception as e:
             print(f"✗ 녹음 실패: {e}")
             return False
@@ -83,7 +83,7 @@ class InteractiveRobot:
         # 2. 음성 인식
         print("\n🎤 음성 인식 중...")
         try:
-            user_speech = self.recognizer.transcribe_file(audio_file)
+            user_speech = self.recognizer.transcribe_audio(audio, self.microphone.sample_rate)
             print(f"👤 사용자: {user_speech}")
         except Exception as e:
             print(f"✗ 음성 인식 실패: {e}")
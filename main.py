@@ -5,8 +5,11 @@ Physical AI - 메인 프로그램
 
 import os
 from dotenv import load_dotenv
+from config.settings import settings
+from src.brain.macros import MacroLibrary
 from src.brain.robot_brain import RobotBrain
 from src.perception.speech_recognizer import VoiceCommandListener
+from src.perception.stt_cache import TranscriptionCache
 from src.simulation.simple_robot_sim import SimpleRobotSimulator
 from src.motion.action_executor import ActionExecutor
 
@@ -30,16 +33,22 @@ class PhysicalAIRobot:
 
         # 각 모듈 초기화
         print("\n초기화 중...")
-        self.brain = RobotBrain(api_key=api_key, model="gpt-4o-mini")
+        self.macros = MacroLibrary()
+        # 매크로 슬롯은 시뮬레이터에 있는 물체만 허용 (시뮬레이터는 아래에서 생성)
+        self.brain = RobotBrain(api_key=api_key, model="gpt-4o-mini", macro_library=self.macros,
+                                known_objects=lambda: self.simulator.objects)
         print("✓ AI 두뇌 초기화")
 
-        self.listener = VoiceCommandListener(api_key=api_key)
+        self.listener = VoiceCommandListener(
+            api_key=api_key,
+            cache=TranscriptionCache(path=settings.stt_cache_dir or None)
+        )
         print("✓ 음성 인식 초기화")
 
         self.simulator = SimpleRobotSimulator()
         print("✓ 시뮬레이터 초기화")
 
-        self.executor = ActionExecutor(self.simulator)
+        self.executor = ActionExecutor(self.simulator, macro_library=self.macros)
         print("✓ 동작 실행기 초기화")
 
         print("\n✅ 시스템 준비 완료!")
@@ -82,7 +91,7 @@ class PhysicalAIRobot:
 
         # 4. 동작 실행
         print("\n[3단계] 동작 실행")
-        self.executor.execute_commands(response.commands)
+        self.executor.execute_commands(response.commands, intent=user_speech)
 
         # 5. 결과 확인
         print(self.simulator.get_state_summary())
@@ -108,15 +117,20 @@ class PhysicalAIRobot:
             },
         ]
 
+        for scenario in demo_scenarios:
+            if not os.path.exists(scenario["file"]):
+                print(f"\n✗ 파일 없음: {scenario['file']}")
+                print("먼저 'python create_test_audio.py'를 실행하세요.")
+                return
+
+        # 모든 시나리오 음성을 미리 동시에 인식 (결과는 캐시에 남아 시나리오별 인식은 즉시 끝남)
+        print("\n🎤 시나리오 음성 미리 인식 중...")
+        self.listener.listen_from_files([scenario["file"] for scenario in demo_scenarios])
+
         for i, scenario in enumerate(demo_scenarios, 1):
             audio_file = scenario["file"]
             description = scenario["description"]
 
-            if not os.path.exists(audio_file):
-                print(f"\n✗ 파일 없음: {audio_file}")
-                print("먼저 'python create_test_audio.py'를 실행하세요.")
-                return
-
             print(f"\n{'='*60}")
             print(f"시나리오 {i}/{len(demo_scenarios)}: {description}")
             print(f"{'='*60}")
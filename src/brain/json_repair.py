@@ -0,0 +1,173 @@
+"""
+JSON Repair Module
+LLM 출력 JSON 보정 + Structured Outputs용 strict 스키마 변환
+
+거의 올바른 JSON(코드 블록, 뒤쪽 쉼표, 작은따옴표, Python 리터럴, 잘린 출력)을
+로컬에서 고쳐 다시 LLM을 호출하지 않도록 합니다.
+"""
+
+import copy
+import re
+from typing import Any, Dict, Optional
+
+
+_CODE_FENCE = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL)
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+
+def repair_json(text: str) -> Optional[str]:
+    """
+    거의 올바른 JSON 문자열 보정
+
+    처리하는 경우:
+      - ```json 코드 블록 / 앞뒤 설명 문장
+      - 작은따옴표 문자열
+      - True / False / None
+      - 닫는 괄호 앞의 쉼표
+      - 잘린 출력 (열린 문자열/괄호 닫기)
+
+    Args:
+        text: LLM 출력
+
+    Returns:
+        str: 보정된 JSON 문자열 (객체를 찾지 못하면 None)
+    """
+    fenced = _CODE_FENCE.search(text)
+    if fenced:
+        text = fenced.group(1)
+
+    start = text.find("{")
+    if start < 0:
+        return None
+    text = text[start:]
+
+    out = []
+    stack = []  # 열린 괄호의 짝
+    quote = None  # 현재 문자열의 따옴표 (" 또는 ')
+    i = 0
+
+    while i < len(text):
+        ch = text[i]
+
+        if quote:
+            if ch == "\\" and i + 1 < len(text):
+                out.append(text[i:i + 2])
+                i += 2
+                continue
+            if ch == quote:
+                out.append('"')
+                quote = None
+            elif ch == '"':
+                # 작은따옴표 문자열 안의 큰따옴표
+                out.append('\\"')
+            elif ch == "\n":
+                out.append("\\n")
+            else:
+                out.append(ch)
+            i += 1
+            continue
+
+        if ch in "\"'":
+            quote = ch
+            out.append('"')
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+            out.append(ch)
+        elif ch in "}]":
+            # 닫는 괄호 앞의 쉼표 제거
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+            if stack:
+                stack.pop()
+            out.append(ch)
+            if not stack:
+                break  # 최상위 객체 끝 (뒤쪽 설명 문장 무시)
+        elif ch.isalpha():
+            # 따옴표 없는 단어 (비ASCII 포함) - 리터럴이 아니면 그대로 두어 json.loads가 거부하게 함
+            word = re.match(r"\w+", text[i:]).group(0)
+            out.append(_PYTHON_LITERALS.get(word, word))
+            i += len(word)
+            continue
+        else:
+            out.append(ch)
+        i += 1
+
+    # 잘린 출력: 열린 문자열과 괄호 닫기
+    if quote:
+        out.append('"')
+    while out and (out[-1].isspace() or out[-1] in ",:"):
+        out.pop()
+    out.extend(reversed(stack))
+
+    return "".join(out)
+
+
+def strict_json_schema(schema: Dict[str, Any], closed_key: str = "strict_properties") -> Dict[str, Any]:
+    """
+    Pydantic JSON 스키마 → OpenAI Structured Outputs strict 스키마
+
+    - 모든 객체에 additionalProperties: false
+    - 모든 속성을 required로 둠 (Optional 필드는 원래 스키마대로 null 허용)
+    - default/title 제거
+    - 열린 딕셔너리 필드는 스키마의 closed_key에 적힌 속성으로 닫음
+      (strict 모드는 임의 키를 가진 객체를 허용하지 않음)
+
+    Args:
+        schema: TypeAdapter(...).json_schema() 결과
+        closed_key: 열린 딕셔너리를 닫을 속성 정의가 담긴 키
+
+    Returns:
+        dict: strict 스키마
+    """
+    schema = copy.deepcopy(schema)
+
+    def nullable(node: Dict[str, Any]) -> Dict[str, Any]:
+        variants = node.get("anyOf", [])
+        if node.get("type") == "null" or any(v.get("type") == "null" for v in variants):
+            return node
+        description = node.pop("description", None)
+        wrapped = {"anyOf": [node, {"type": "null"}]}
+        if description:
+            wrapped["description"] = description
+        return wrapped
+
+    def convert(node: Any) -> Any:
+        if isinstance(node, list):
+            return [convert(item) for item in node]
+        if not isinstance(node, dict):
+            return node
+
+        node.pop("default", None)
+        node.pop("title", None)
+
+        if closed_key in node:
+            properties = node.pop(closed_key)
+            closed = {
+                "type": "object",
+                "properties": {key: nullable(dict(value)) for key, value in properties.items()},
+                "required": list(properties),
+                "additionalProperties": False,
+            }
+            variants = node.pop("anyOf", None)
+            node.pop("type", None)
+            node.pop("additionalProperties", None)
+            if variants and any(v.get("type") == "null" for v in variants):
+                node["anyOf"] = [closed, {"type": "null"}]
+            else:
+                node.update(closed)
+            return node
+
+        for key, value in list(node.items()):
+            if key != "properties":
+                node[key] = convert(value)
+
+        if "properties" in node:
+            node["properties"] = {name: convert(prop) for name, prop in node["properties"].items()}
+            node["required"] = list(node["properties"])
+            node["additionalProperties"] = False
+
+        return node
+
+    return convert(schema)
@@ -0,0 +1,319 @@
+"""
+Plan Macro Module
+성공한 동작 계획을 매크로로 저장하고 재사용
+
+같은 요청("tidy the table")이 반복되면 LLM이 매번 같은 다단계 계획을 다시 생성합니다.
+성공적으로 실행된 명령 시퀀스를 정규화된 의도(intent)로 색인하고,
+물체 이름은 슬롯({0}, {1} ...)으로 추상화하여 다른 물체에도 재사용합니다.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.brain.robot_brain import ActionCommand
+
+
+# 이전 대화 맥락에 의존하는 단어 - 이런 의도는 매크로로 저장하지 않음
+CONTEXT_WORDS = {"it", "that", "this", "them", "there", "those", "these", "again", "그거", "그걸", "저거", "이거", "거기"}
+
+# 여러 동작을 잇는 접속어 - 템플릿에 없는 접속어가 있으면 복합 명령이므로 LLM으로 보냄
+CONJUNCTION_WORDS = {"and", "then", "after", "before", "also", "while", "그리고", "다음에", "그다음", "하고"}
+
+# 슬롯 하나(물체 이름 한 개)에 들어갈 수 있는 최대 단어 수
+MAX_SLOT_WORDS = 3
+
+# 의도 비교 시 무시하는 공손 표현
+FILLER_WORDS = {"please", "could", "would", "can", "you", "kindly", "now", "좀"}
+
+MACRO_ACTION = "macro"
+
+# 물체 이름만으로 실행기가 위치를 찾는 동작 - 슬롯 물체에 대한 좌표는 저장하지 않음
+OBJECT_RESOLVED_ACTIONS = {"move", "pick"}
+
+
+@dataclass
+class Macro:
+    """저장된 동작 매크로"""
+
+    name: str
+    template: str  # 정규화된 의도, 물체 자리는 {0}, {1} ...
+    commands: List[Dict] = field(default_factory=list)  # target_object가 "{i}"일 수 있음
+    slot_count: int = 0
+    slot_values: List[str] = field(default_factory=list)  # 기록 당시 슬롯 물체 ID
+    uses: int = 0
+
+
+class MacroLibrary:
+    """
+    동작 매크로 라이브러리
+
+    ActionExecutor가 성공한 명령 시퀀스를 기록하고,
+    RobotBrain은 일치하는 매크로가 있으면 LLM 호출 없이 매크로 호출 하나로 응답합니다.
+    """
+
+    def __init__(self, path: Optional[str] = None, min_commands: int = 1):
+        """
+        Args:
+            path: 매크로 저장 JSON 파일 (None이면 메모리 전용)
+            min_commands: 매크로로 저장할 최소 명령 수
+        """
+        self.path = path
+        self.min_commands = min_commands
+        self.macros: Dict[str, Macro] = {}  # template → Macro
+        self._patterns: Dict[str, re.Pattern] = {}
+
+        if path and os.path.exists(path):
+            self._load()
+
+    # ------------------------------------------------------------------
+    # 의도 정규화 / 슬롯 추상화
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def normalize_intent(text: str) -> str:
+        """
+        의도 정규화 (소문자, 구두점 제거, 공손 표현 제거)
+
+        Args:
+            text: 사용자 요청
+
+        Returns:
+            str: 정규화된 의도
+        """
+        words = re.findall(r"[\w]+", text.lower())
+        return " ".join(w for w in words if w not in FILLER_WORDS)
+
+    @staticmethod
+    def _object_phrase(object_name: str) -> str:
+        """물체 ID → 발화 표현 (red_block → red block)"""
+        return object_name.replace("_", " ").lower()
+
+    @staticmethod
+    def _object_name(phrase: str) -> str:
+        """발화 표현 → 물체 ID (red block → red_block)"""
+        return phrase.strip().replace(" ", "_")
+
+    @staticmethod
+    def _is_slot(value: Optional[str]) -> bool:
+        """슬롯 자리("{0}")인지"""
+        return bool(value) and re.fullmatch(r"\{\d+\}", value) is not None
+
+    def _abstract(self, intent: str, commands: List[ActionCommand]) -> Tuple[str, List[Dict], List[str]]:
+        """의도와 명령에서 물체 이름을 슬롯으로 치환 (템플릿, 명령, 슬롯 물체 ID)"""
+        template = intent
+        slots: Dict[str, str] = {}
+
+        for command in commands:
+            name = command.target_object
+            if not name or name in slots:
+                continue
+            phrase = self._object_phrase(name)
+            # 발화에 언급된 물체만 슬롯이 됨 (고정 물체는 그대로 유지)
+            if re.search(rf"\b{re.escape(phrase)}\b", template):
+                placeholder = "{" + str(len(slots)) + "}"
+                template = re.sub(rf"\b{re.escape(phrase)}\b", placeholder, template)
+                slots[name] = placeholder
+
+        abstract_commands = []
+        for command in commands:
+            data = command.model_dump(exclude_none=True)
+            if command.target_object in slots:
+                data["target_object"] = slots[command.target_object]
+                # 기록된 물체의 좌표는 다른 물체에 맞지 않으므로 실행 시 이름으로 찾게 함
+                if command.action_type in OBJECT_RESOLVED_ACTIONS:
+                    data.pop("location", None)
+            abstract_commands.append(data)
+
+        return template, abstract_commands, list(slots)
+
+    @staticmethod
+    def _macro_name(template: str) -> str:
+        """템플릿으로부터 매크로 이름 생성"""
+        return re.sub(r"\{\d+\}", "x", template).replace(" ", "_")
+
+    def _pattern(self, template: str) -> re.Pattern:
+        """슬롯 템플릿 → 정규식 (캐시)"""
+        if template not in self._patterns:
+            regex = re.escape(template)
+            # 슬롯은 명사구 하나 (최대 MAX_SLOT_WORDS 단어)
+            slot = rf"(?P<s\1>\\w+(?: \\w+){{0,{MAX_SLOT_WORDS - 1}}})"
+            regex = re.sub(r"\\\{(\d+)\\\}", slot, regex)
+            self._patterns[template] = re.compile(regex)
+        return self._patterns[template]
+
+    # ------------------------------------------------------------------
+    # 기록 / 검색 / 전개
+    # ------------------------------------------------------------------
+
+    def record(self, intent: str, commands: List[ActionCommand]) -> Optional[Macro]:
+        """
+        성공한 명령 시퀀스를 매크로로 기록
+
+        Args:
+            intent: 사용자 요청 원문
+            commands: 성공적으로 실행된 명령 리스트 (매크로 호출은 미리 전개되어 있어야 함)
+
+        Returns:
+            Macro: 저장/갱신된 매크로 (저장하지 않으면 None)
+        """
+        normalized = self.normalize_intent(intent)
+        if not normalized or len(commands) < self.min_commands:
+            return None
+        if CONTEXT_WORDS & set(normalized.split()):
+            return None
+        if any(command.action_type == MACRO_ACTION for command in commands):
+            return None
+
+        template, abstract_commands, slot_values = self._abstract(normalized, commands)
+
+        macro = self.macros.get(template)
+        if macro is None:
+            macro = Macro(
+                name=self._macro_name(template),
+                template=template,
+                slot_count=len(re.findall(r"\{\d+\}", template)),
+            )
+            self.macros[template] = macro
+
+        # 가장 최근에 성공한 계획으로 갱신
+        macro.commands = abstract_commands
+        macro.slot_values = slot_values
+        macro.uses += 1
+        self._save()
+        return macro
+
+    def match(self, intent: str, known_objects: Optional[Iterable[str]] = None) -> Optional[Tuple[Macro, List[str]]]:
+        """
+        요청과 일치하는 매크로 검색
+
+        맥락 의존 요청("put it there")과 템플릿에 없는 접속어가 있는 복합 요청
+        ("pick up the red block and put ...")은 일부만 실행되지 않도록 매칭하지 않습니다 (LLM으로 처리).
+        슬롯 물체의 좌표가 계획에 남아 있는 매크로는 기록 당시와 같은 물체일 때만 매칭합니다.
+
+        Args:
+            intent: 사용자 요청 원문
+            known_objects: 슬롯에 허용할 물체 ID (None이면 명사구 하나면 허용)
+
+        Returns:
+            (Macro, 슬롯 값 리스트) 또는 None
+        """
+        normalized = self.normalize_intent(intent)
+        words = set(normalized.split())
+        if words & CONTEXT_WORDS:
+            return None
+
+        macro = self.macros.get(normalized)
+        if macro is not None:
+            return macro, []
+
+        known = set(known_objects) if known_objects is not None else None
+        for template, macro in self.macros.items():
+            if not macro.slot_count:
+                continue
+            if (words & CONJUNCTION_WORDS) - set(template.split()):
+                continue
+            found = self._pattern(template).fullmatch(normalized)
+            if not found:
+                continue
+            phrases = [found.group(f"s{i}") for i in range(macro.slot_count)]
+            if any(set(phrase.split()) & CONJUNCTION_WORDS for phrase in phrases):
+                continue
+            slots = [self._object_name(phrase) for phrase in phrases]
+            if known is not None and not set(slots) <= known:
+                continue
+            if slots != macro.slot_values and self._has_slot_locations(macro):
+                continue
+            return macro, slots
+
+        return None
+
+    def _has_slot_locations(self, macro: Macro) -> bool:
+        """슬롯 물체를 대상으로 하는 명령에 기록된 좌표가 있는지"""
+        return any(data.get("location") and self._is_slot(data.get("target_object")) for data in macro.commands)
+
+    def get(self, name: str) -> Optional[Macro]:
+        """이름으로 매크로 검색"""
+        for macro in self.macros.values():
+            if macro.name == name:
+                return macro
+        return None
+
+    def invocation(self, macro: Macro, slots: List[str]) -> ActionCommand:
+        """매크로 호출 명령 생성"""
+        return ActionCommand(
+            action_type=MACRO_ACTION,
+            parameters={"macro": macro.name, "slots": slots},
+            reasoning=f"Reuse learned plan '{macro.template}'",
+        )
+
+    def expand(self, name: str, slots: Optional[List[str]] = None) -> List[ActionCommand]:
+        """
+        매크로를 실제 명령 리스트로 전개
+
+        Args:
+            name: 매크로 이름
+            slots: 슬롯 값 (물체 ID)
+
+        Returns:
+            List[ActionCommand]: 실행할 명령 리스트
+        """
+        macro = self.get(name)
+        if macro is None:
+            raise KeyError(f"알 수 없는 매크로: {name}")
+
+        slots = slots or []
+        if len(slots) != macro.slot_count:
+            raise ValueError(f"매크로 '{name}'은(는) 슬롯 {macro.slot_count}개가 필요합니다 (받음: {len(slots)})")
+
+        commands = []
+        for data in macro.commands:
+            data = dict(data)
+            target = data.get("target_object")
+            if self._is_slot(target):
+                data["target_object"] = slots[int(target[1:-1])]
+            commands.append(ActionCommand(**data))
+        return commands
+
+    def prompt_section(self) -> str:
+        """LLM 프롬프트에 넣을 매크로 목록 (없으면 빈 문자열)"""
+        if not self.macros:
+            return ""
+
+        lines = [
+            "# Learned Macros",
+            "If a request matches one of these, respond with a single command",
+            '{"action_type": "macro", "parameters": {"macro": "<name>", "slots": ["<object>", ...]}, "reasoning": "..."}',
+            "instead of listing every step.",
+        ]
+        for macro in self.macros.values():
+            lines.append(f'- {macro.name}: "{macro.template}" (slots: {macro.slot_count})')
+        return "\n".join(lines)
+
+    def __len__(self) -> int:
+        return len(self.macros)
+
+    # ------------------------------------------------------------------
+    # 저장
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        """JSON 파일에서 매크로 로드"""
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for item in data:
+            macro = Macro(**item)
+            self.macros[macro.template] = macro
+
+    def _save(self):
+        """JSON 파일로 매크로 저장"""
+        if not self.path:
+            return
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump([asdict(m) for m in self.macros.values()], f, ensure_ascii=False, indent=2)
@@ -0,0 +1,279 @@
+"""
+Long-term Memory Module
+장기 기억 저장소 - 로컬 임베딩 + 코사인 top-k 검색
+
+대화 턴과 사실("사용자의 컵은 파란색")을 NumPy 행렬에 임베딩하여 저장하고,
+프롬프트에는 현재 메시지와 관련된 top-k 기억만 주입합니다.
+memmap 파일로 저장되므로 프로세스를 재시작해도 기억이 유지됩니다.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+import numpy as np
+
+
+@dataclass
+class MemoryHit:
+    """검색된 기억"""
+
+    text: str
+    kind: str
+    score: float
+    timestamp: float
+
+
+class HashingEmbedder:
+    """
+    로컬 해싱 임베더 (API 호출 없음)
+
+    단어와 문자 3-gram을 고정 차원 벡터로 해싱합니다.
+    한국어/영어 모두 처리되며 외부 모델 없이 동작합니다.
+    """
+
+    def __init__(self, dim: int = 256):
+        """
+        Args:
+            dim: 임베딩 차원
+        """
+        self.dim = dim
+
+    def _features(self, text: str) -> List[str]:
+        """텍스트를 해싱할 특징 리스트로 변환"""
+        text = text.lower()
+        words = re.findall(r"\w+", text)
+        features = [f"w:{w}" for w in words]
+
+        for word in words:
+            padded = f"#{word}#"
+            features.extend(f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2))
+
+        return features
+
+    def __call__(self, text: str) -> np.ndarray:
+        """
+        텍스트 임베딩
+
+        Args:
+            text: 입력 텍스트
+
+        Returns:
+            np.ndarray: L2 정규화된 float32 벡터 (dim,)
+        """
+        vector = np.zeros(self.dim, dtype=np.float32)
+
+        for feature in self._features(text):
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            h = int.from_bytes(digest, "little")
+            sign = 1.0 if (h >> 63) & 1 else -1.0
+            # 단어 특징에 더 큰 가중치
+            weight = 2.0 if feature.startswith("w:") else 1.0
+            vector[h % self.dim] += sign * weight
+
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+
+class MemoryStore:
+    """
+    장기 기억 저장소
+
+    임베딩은 (capacity, dim) float32 행렬에, 본문은 JSON Lines 파일에 저장합니다.
+    path를 지정하지 않으면 메모리에서만 동작합니다.
+    """
+
+    VECTORS_FILE = "vectors.f32"
+    RECORDS_FILE = "memories.jsonl"
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        dim: int = 256,
+        embedder: Optional[Callable[[str], np.ndarray]] = None,
+        initial_capacity: int = 1024,
+        dedupe_threshold: float = 0.98,
+    ):
+        """
+        Args:
+            path: 저장 디렉토리 (None이면 메모리 전용)
+            dim: 임베딩 차원 (embedder 출력과 같아야 함)
+            embedder: 텍스트 → 벡터 함수 (기본: HashingEmbedder)
+            initial_capacity: 초기 행렬 크기 (가득 차면 2배로 확장)
+            dedupe_threshold: 이 유사도 이상인 기억은 중복으로 보고 저장하지 않음
+        """
+        self.path = path
+        self.dim = dim
+        self.embedder = embedder or HashingEmbedder(dim)
+        self.dedupe_threshold = dedupe_threshold
+        self.records: List[dict] = []
+
+        if path:
+            os.makedirs(path, exist_ok=True)
+            self._load_records()
+
+        capacity = max(initial_capacity, len(self.records))
+        self._vectors = self._open_matrix(capacity)
+
+    # ------------------------------------------------------------------
+    # 저장소 관리
+    # ------------------------------------------------------------------
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.path, self.VECTORS_FILE)
+
+    @property
+    def _records_path(self) -> str:
+        return os.path.join(self.path, self.RECORDS_FILE)
+
+    def _load_records(self):
+        """저장된 기억 본문 로드"""
+        if not os.path.exists(self._records_path):
+            return
+
+        with open(self._records_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    self.records.append(json.loads(line))
+
+    def _open_matrix(self, capacity: int) -> np.ndarray:
+        """임베딩 행렬 열기 (파일이 있으면 memmap으로 재사용)"""
+        if not self.path:
+            return np.zeros((capacity, self.dim), dtype=np.float32)
+
+        row_bytes = self.dim * np.dtype(np.float32).itemsize
+        if os.path.exists(self._vectors_path):
+            existing_rows = os.path.getsize(self._vectors_path) // row_bytes
+            if existing_rows >= len(self.records):
+                capacity = max(capacity, existing_rows)
+                mode = "r+"
+            else:
+                # 벡터 파일이 손상됨 → 본문에서 다시 임베딩
+                mode = "w+"
+        else:
+            mode = "w+"
+
+        matrix = np.memmap(self._vectors_path, dtype=np.float32, mode=mode, shape=(capacity, self.dim))
+
+        if mode == "w+" and self.records:
+            for i, record in enumerate(self.records):
+                matrix[i] = self.embedder(record["text"])
+            matrix.flush()
+
+        return matrix
+
+    def _grow(self):
+        """행렬 용량 2배 확장"""
+        old = self._vectors
+        new_capacity = old.shape[0] * 2
+
+        if self.path:
+            old.flush()
+            del self._vectors
+            del old
+            # 파일 크기만 늘리고 memmap 다시 열기 (기존 행은 그대로 유지)
+            with open(self._vectors_path, "r+b") as f:
+                f.truncate(new_capacity * self.dim * np.dtype(np.float32).itemsize)
+            self._vectors = np.memmap(
+                self._vectors_path, dtype=np.float32, mode="r+", shape=(new_capacity, self.dim)
+            )
+        else:
+            self._vectors = np.zeros((new_capacity, self.dim), dtype=np.float32)
+            self._vectors[: old.shape[0]] = old
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    # ------------------------------------------------------------------
+    # 기억 추가 / 검색
+    # ------------------------------------------------------------------
+
+    def add(self, text: str, kind: str = "turn") -> bool:
+        """
+        기억 추가
+
+        Args:
+            text: 저장할 내용
+            kind: 기억 종류 (turn: 대화 턴, fact: 사실)
+
+        Returns:
+            bool: 저장 여부 (중복이면 False)
+        """
+        text = text.strip()
+        if not text:
+            return False
+
+        vector = self.embedder(text).astype(np.float32, copy=False)
+
+        count = len(self.records)
+        if count and self.dedupe_threshold < 1.0:
+            best = float(np.max(self._vectors[:count] @ vector))
+            if best >= self.dedupe_threshold:
+                return False
+
+        if count >= self._vectors.shape[0]:
+            self._grow()
+
+        self._vectors[count] = vector
+        record = {"text": text, "kind": kind, "timestamp": time.time()}
+        self.records.append(record)
+
+        if self.path:
+            self._vectors.flush()
+            with open(self._records_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        return True
+
+    def add_fact(self, fact: str) -> bool:
+        """사실 기억 추가 (예: "the user's cup is the blue one")"""
+        return self.add(fact, kind="fact")
+
+    def search(self, query: str, k: int = 5, min_score: float = 0.1) -> List[MemoryHit]:
+        """
+        코사인 유사도 top-k 검색
+
+        Args:
+            query: 검색 질의 (보통 현재 사용자 메시지)
+            k: 반환할 최대 개수
+            min_score: 최소 유사도
+
+        Returns:
+            List[MemoryHit]: 유사도 내림차순 결과
+        """
+        count = len(self.records)
+        if count == 0 or k <= 0:
+            return []
+
+        query_vector = self.embedder(query).astype(np.float32, copy=False)
+        scores = self._vectors[:count] @ query_vector
+
+        k = min(k, count)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        hits = []
+        for i in top:
+            score = float(scores[i])
+            if score < min_score:
+                break
+            record = self.records[i]
+            hits.append(MemoryHit(record["text"], record["kind"], score, record["timestamp"]))
+
+        return hits
+
+    def clear(self):
+        """모든 기억 삭제"""
+        self.records = []
+        self._vectors[:] = 0
+        if self.path:
+            self._vectors.flush()
+            open(self._records_path, "w").close()
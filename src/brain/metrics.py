@@ -0,0 +1,261 @@
+"""
+Brain Metrics Module
+LLM 호출별 토큰/비용/지연시간 측정
+
+RobotBrain.think 호출마다 토큰 사용량, 첫 토큰까지 걸린 시간(TTFT), 전체 시간,
+재시도 횟수, 파싱 실패를 기록하고 히스토그램(누적)과 최근 N회 백분위수로 집계합니다.
+JSON Lines 또는 Prometheus 텍스트 포맷으로 내보낼 수 있습니다.
+"""
+
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from itertools import accumulate
+from typing import Deque, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+# 모델별 가격 (USD / 1M 토큰): (입력, 캐시된 입력, 출력)
+MODEL_PRICES: Dict[str, tuple] = {
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+}
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0)
+TOKEN_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192)
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> float:
+    """
+    호출 비용 추정 (USD)
+
+    Args:
+        model: 모델 이름 (날짜 접미사가 붙어도 됨)
+        prompt_tokens: 입력 토큰 (캐시 포함)
+        completion_tokens: 출력 토큰
+        cached_tokens: 캐시된 입력 토큰
+
+    Returns:
+        float: 추정 비용 (가격을 모르는 모델이면 0)
+    """
+    # "gpt-4o-mini-2024-07-18" 같은 이름은 가장 긴 접두사로 매칭
+    matches = [name for name in MODEL_PRICES if model.startswith(name)]
+    if not matches:
+        return 0.0
+
+    input_price, cached_price, output_price = MODEL_PRICES[max(matches, key=len)]
+    uncached = max(prompt_tokens - cached_tokens, 0)
+    return (uncached * input_price + cached_tokens * cached_price + completion_tokens * output_price) / 1_000_000
+
+
+@dataclass
+class CallMetrics:
+    """LLM 호출 1회의 측정값"""
+
+    model: str
+    timestamp: float = field(default_factory=time.time)
+    source: str = "llm"  # llm | macro
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    time_to_first_token: Optional[float] = None  # 초
+    total_time: float = 0.0  # 초
+    retries: int = 0
+    parse_failures: int = 0
+    repaired: bool = False
+    cost_usd: float = 0.0
+    error: Optional[str] = None
+
+
+class Histogram:
+    """
+    누적 버킷 히스토그램 + 최근 N개 관측값 백분위수
+
+    버킷/합계/개수는 시작 이후 전체 관측값 기준이라 줄어들지 않습니다 (Prometheus histogram).
+    백분위수만 최근 window개 관측값으로 계산합니다.
+    """
+
+    def __init__(self, buckets: Sequence[float], window: int = 1000):
+        """
+        Args:
+            buckets: 버킷 상한값 (오름차순)
+            window: 백분위수 계산에 유지할 최근 관측값 수
+        """
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)  # 버킷별 개수 (마지막은 +Inf)
+        self.count = 0
+        self.sum = 0.0
+        self.values: Deque[float] = deque(maxlen=window)
+
+    def observe(self, value: float):
+        """관측값 추가"""
+        value = float(value)
+        self._counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.values.append(value)
+
+    def bucket_counts(self) -> List[int]:
+        """누적 버킷 카운트 (Prometheus 방식, 마지막은 +Inf)"""
+        return list(accumulate(self._counts))
+
+    def percentile(self, q: float) -> Optional[float]:
+        """최근 관측값 기준 백분위수 (관측값이 없으면 None)"""
+        if not self.values:
+            return None
+        return float(np.percentile(np.fromiter(self.values, dtype=np.float64), q))
+
+
+class BrainMetrics:
+    """
+    RobotBrain 호출 측정 집계기
+
+    스레드 안전하며 여러 RobotBrain 인스턴스가 공유할 수 있습니다.
+    """
+
+    def __init__(self, window: int = 1000, log_path: Optional[str] = None):
+        """
+        Args:
+            window: 백분위수/최근 호출 유지 개수
+            log_path: 호출마다 JSON Lines로 추가 기록할 파일 (선택)
+        """
+        self.log_path = log_path
+        self.calls: Deque[CallMetrics] = deque(maxlen=window)
+        self.histograms = {
+            "time_to_first_token_seconds": Histogram(LATENCY_BUCKETS, window),
+            "total_time_seconds": Histogram(LATENCY_BUCKETS, window),
+            "prompt_tokens": Histogram(TOKEN_BUCKETS, window),
+            "completion_tokens": Histogram(TOKEN_BUCKETS, window),
+        }
+        self.totals = {
+            "calls": 0,
+            "llm_calls": 0,
+            "macro_calls": 0,
+            "errors": 0,
+            "retries": 0,
+            "parse_failures": 0,
+            "repaired": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "cached_tokens": 0,
+            "cost_usd": 0.0,
+        }
+        self._lock = threading.Lock()
+
+    def record(self, call: CallMetrics):
+        """
+        호출 측정값 기록
+
+        Args:
+            call: 측정값
+        """
+        with self._lock:
+            self.calls.append(call)
+
+            self.totals["calls"] += 1
+            self.totals[f"{call.source}_calls"] = self.totals.get(f"{call.source}_calls", 0) + 1
+            self.totals["errors"] += 1 if call.error else 0
+            self.totals["retries"] += call.retries
+            self.totals["parse_failures"] += call.parse_failures
+            self.totals["repaired"] += 1 if call.repaired else 0
+            self.totals["prompt_tokens"] += call.prompt_tokens
+            self.totals["completion_tokens"] += call.completion_tokens
+            self.totals["cached_tokens"] += call.cached_tokens
+            self.totals["cost_usd"] += call.cost_usd
+
+            if call.source == "llm":
+                if call.time_to_first_token is not None:
+                    self.histograms["time_to_first_token_seconds"].observe(call.time_to_first_token)
+                self.histograms["total_time_seconds"].observe(call.total_time)
+                self.histograms["prompt_tokens"].observe(call.prompt_tokens)
+                self.histograms["completion_tokens"].observe(call.completion_tokens)
+
+            if self.log_path:
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(asdict(call), ensure_ascii=False) + "\n")
+
+    def summary(self) -> Dict[str, float]:
+        """누적 합계 + 지연시간 백분위수"""
+        with self._lock:
+            result = dict(self.totals)
+            for name in ("time_to_first_token_seconds", "total_time_seconds"):
+                histogram = self.histograms[name]
+                for q in (50, 95, 99):
+                    result[f"{name}_p{q}"] = histogram.percentile(q)
+            return result
+
+    def to_jsonl(self) -> str:
+        """최근 호출들을 JSON Lines 문자열로 변환"""
+        with self._lock:
+            return "".join(json.dumps(asdict(call), ensure_ascii=False) + "\n" for call in self.calls)
+
+    def export_jsonl(self, path: str):
+        """
+        최근 호출들을 JSON Lines 파일로 저장
+
+        Args:
+            path: 저장할 파일 경로
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_jsonl())
+
+    def to_prometheus(self, prefix: str = "robot_brain") -> str:
+        """
+        Prometheus 텍스트 포맷으로 변환
+
+        Args:
+            prefix: 메트릭 이름 접두사
+
+        Returns:
+            str: exposition 포맷 텍스트
+        """
+        lines = []
+
+        with self._lock:
+            counters = [
+                ("calls_total", "Total think() calls", self.totals["calls"]),
+                ("llm_calls_total", "think() calls answered by the LLM", self.totals["llm_calls"]),
+                ("macro_calls_total", "think() calls answered by a learned macro", self.totals["macro_calls"]),
+                ("errors_total", "think() calls that ended in an error", self.totals["errors"]),
+                ("retries_total", "LLM request retries", self.totals["retries"]),
+                ("parse_failures_total", "Responses that failed to parse", self.totals["parse_failures"]),
+                ("repaired_total", "Responses fixed by local JSON repair", self.totals["repaired"]),
+                ("cost_usd_total", "Estimated LLM spend in USD", self.totals["cost_usd"]),
+            ]
+            for name, help_text, value in counters:
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                lines.append(f"{prefix}_{name} {value}")
+
+            lines.append(f"# HELP {prefix}_tokens_total Tokens used by type")
+            lines.append(f"# TYPE {prefix}_tokens_total counter")
+            for token_type in ("prompt", "completion", "cached"):
+                lines.append(f'{prefix}_tokens_total{{type="{token_type}"}} {self.totals[f"{token_type}_tokens"]}')
+
+            for name, histogram in self.histograms.items():
+                metric = f"{prefix}_{name}"
+                lines.append(f"# HELP {metric} Histogram of LLM calls since start")
+                lines.append(f"# TYPE {metric} histogram")
+                counts = histogram.bucket_counts()
+                for bound, count in zip(histogram.buckets, counts):
+                    lines.append(f'{metric}_bucket{{le="{bound}"}} {count}')
+                lines.append(f'{metric}_bucket{{le="+Inf"}} {counts[-1]}')
+                lines.append(f"{metric}_sum {histogram.sum}")
+                lines.append(f"{metric}_count {histogram.count}")
+
+                # 최근 N회 백분위수는 올라갔다 내려갈 수 있으므로 별도 gauge로
+                recent = f"{metric}_recent"
+                lines.append(f"# HELP {recent} Quantiles over the last {histogram.values.maxlen} LLM calls")
+                lines.append(f"# TYPE {recent} gauge")
+                for q in (50, 95, 99):
+                    value = histogram.percentile(q)
+                    if value is not None:
+                        lines.append(f'{recent}{{quantile="{q / 100}"}} {value}')
+
+        return "\n".join(lines) + "\n"
@@ -3,9 +3,22 @@ Robot Brain Module
 로봇의 두뇌 - GPT 기반 의사결정 시스템
 """
 
-from typing import Optional, List, Dict, Any
-from openai import OpenAI
-from pydantic import BaseModel, Field
+import json
+import time
+from typing import TYPE_CHECKING, Callable, Iterable, Optional, List, Dict, Any, Tuple
+from openai import OpenAI, APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, field_validator
+
+from src.brain.json_repair import repair_json, strict_json_schema
+from src.brain.memory import MemoryStore
+from src.brain.metrics import BrainMetrics, CallMetrics, estimate_cost
+
+if TYPE_CHECKING:
+    from src.brain.macros import MacroLibrary
+
+
+# 재시도할 일시적 API 오류
+RETRYABLE_ERRORS = (APIConnectionError, APITimeoutError, InternalServerError, RateLimitError)
 
 
 class ActionCommand(BaseModel):
@@ -13,10 +26,36 @@ class ActionCommand(BaseModel):
 
     action_type: str = Field(description="동작 타입: pick, place, move, rotate, open_gripper, close_gripper, home, wait")
     target_object: Optional[str] = Field(default=None, description="대상 객체")
-    location: Optional[Dict[str, float]] = Field(default=None, description="위치 좌표 {x, y, z}")
-    parameters: Optional[Dict[str, Any]] = Field(default=None, description="추가 파라미터")
+    location: Optional[Dict[str, float]] = Field(
+        default=None,
+        description="위치 좌표 {x, y, z}",
+        json_schema_extra={"strict_properties": {
+            "x": {"type": "number"},
+            "y": {"type": "number"},
+            "z": {"type": "number"},
+        }},
+    )
+    parameters: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="추가 파라미터",
+        json_schema_extra={"strict_properties": {
+            "angle": {"type": "number", "description": "rotate: 각도 (도)"},
+            "duration": {"type": "number", "description": "wait: 대기 시간 (초)"},
+            "macro": {"type": "string", "description": "macro: 매크로 이름"},
+            "slots": {"type": "array", "items": {"type": "string"}, "description": "macro: 슬롯 물체"},
+        }},
+    )
     reasoning: str = Field(description="이 동작을 선택한 이유")
 
+    @field_validator("location", "parameters", mode="before")
+    @classmethod
+    def _drop_null_entries(cls, value):
+        """strict 스키마에서 채워진 null 항목 제거 (실행기는 빠진 키에 기본값 사용)"""
+        if isinstance(value, dict):
+            value = {k: v for k, v in value.items() if v is not None}
+            return value or None
+        return value
+
 
 class RobotResponse(BaseModel):
     """로봇의 응답 구조"""
@@ -27,6 +66,49 @@ class RobotResponse(BaseModel):
     clarification_question: Optional[str] = Field(default=None, description="사용자에게 물어볼 질문")
 
 
+# 호출마다 재사용하는 사전 컴파일된 검증기와 strict 스키마
+RESPONSE_ADAPTER = TypeAdapter(RobotResponse)
+RESPONSE_SCHEMA = strict_json_schema(RESPONSE_ADAPTER.json_schema())
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "robot_response", "strict": True, "schema": RESPONSE_SCHEMA},
+}
+
+
+def parse_robot_response(text: str) -> Tuple[RobotResponse, bool]:
+    """
+    LLM 출력 → RobotResponse
+
+    먼저 사전 컴파일된 검증기로 바로 파싱하고, 실패하면 로컬 JSON 보정 후 한 번 더 시도합니다.
+
+    Args:
+        text: LLM 출력 텍스트
+
+    Returns:
+        (RobotResponse, 보정 여부)
+
+    Raises:
+        ValidationError: 보정 후에도 파싱할 수 없는 경우
+    """
+    try:
+        return RESPONSE_ADAPTER.validate_json(text), False
+    except ValidationError as error:
+        repaired = repair_json(text)
+        if repaired is None:
+            raise error
+
+    data = json.loads(repaired)
+    if isinstance(data, dict):
+        # 자주 빠지는 필수 필드 채우기
+        if "speech" not in data and data.get("clarification_question"):
+            data["speech"] = data["clarification_question"]
+        for command in data.get("commands") or []:
+            if isinstance(command, dict):
+                command.setdefault("reasoning", "")
+
+    return RESPONSE_ADAPTER.validate_python(data), True
+
+
 class RobotBrain:
     """
     로봇의 두뇌 - GPT 기반 의사결정 시스템
@@ -35,14 +117,60 @@ class RobotBrain:
     사용자와 자연스럽게 대화하는 지능형 에이전트
     """
 
-    def __init__(self, api_key: str, model: str = "gpt-4o"):
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gpt-4o",
+        memory: Optional[MemoryStore] = None,
+        memory_top_k: int = 5,
+        history_window: int = 10,
+        macro_library: Optional["MacroLibrary"] = None,
+        metrics: Optional[BrainMetrics] = None,
+        max_retries: int = 2,
+        retry_backoff: float = 0.5,
+        structured_outputs: bool = True,
+        client: Optional[OpenAI] = None,
+        max_history: Optional[int] = None,
+        known_objects: Optional[Callable[[], Iterable[str]]] = None,
+    ):
         """
         Args:
             api_key: OpenAI API 키
             model: 사용할 GPT 모델 (gpt-4o 추천)
+            memory: 장기 기억 저장소 (None이면 전체 대화 이력을 전송)
+            memory_top_k: 프롬프트에 주입할 관련 기억 개수
+            history_window: 기억 사용 시 프롬프트에 포함할 최근 메시지 수
+            macro_library: 학습된 동작 매크로 (일치하면 LLM 호출 생략)
+            metrics: 호출 측정 집계기 (기본: 새 BrainMetrics)
+            max_retries: 일시적 API 오류 시 재시도 횟수
+            retry_backoff: 재시도 대기 시간 기준값 (초, 지수 증가)
+            structured_outputs: RobotResponse에서 만든 strict 스키마로 출력 제한
+                (지원하지 않는 모델이면 False → JSON 모드)
+            client: 공유할 OpenAI 클라이언트 (None이면 새로 생성)
+            max_history: 보관할 최대 대화 메시지 수 (None이면 제한 없음)
+            known_objects: 현재 물체 ID 목록을 돌려주는 함수 (예: lambda: sim.objects).
+                매크로 슬롯이 이 목록에 없으면 LLM으로 보냄 (None이면 슬롯 매크로를 쓰지 않음)
+
+        Raises:
+            ValueError: max_retries가 음수인 경우
         """
-        self.client = OpenAI(api_key=api_key)
+        if max_retries < 0:
+            raise ValueError(f"max_retries는 0 이상이어야 합니다: {max_retries}")
+
+        # 재시도는 직접 처리하여 횟수를 측정함
+        self.client = client if client is not None else OpenAI(api_key=api_key, max_retries=0)
         self.model = model
+        self.memory = memory
+        self.memory_top_k = memory_top_k
+        self.history_window = history_window
+        self.macro_library = macro_library
+        self.metrics = metrics if metrics is not None else BrainMetrics()
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.response_format = RESPONSE_FORMAT if structured_outputs else {"type": "json_object"}
+        self.max_history = max_history
+        self.known_objects = known_objects
+        self.last_call: Optional[CallMetrics] = None
         self.conversation_history: List[Dict[str, str]] = []
         self.system_prompt = self._build_system_prompt()
 
@@ -123,42 +251,46 @@ Always respond in JSON format matching the RobotResponse structure."""
         Returns:
             RobotResponse: 로봇의 응답 (말 + 동작 명령)
         """
+        start_time = time.perf_counter()
+        call = CallMetrics(model=self.model)
+
         # 대화 이력에 추가
-        self.conversation_history.append({
-            "role": "user",
-            "content": user_message
-        })
+        self._append_history("user", user_message)
+
+        # 학습된 매크로와 일치하면 LLM 없이 바로 응답
+        macro_response = self._match_macro(user_message)
+        if macro_response is not None:
+            self._append_history("assistant", macro_response.model_dump_json(exclude_none=True))
+            self._store_turn(user_message, macro_response)
+            call.source = "macro"
+            call.total_time = time.perf_counter() - start_time
+            self._record_metrics(call)
+            return macro_response
 
         # GPT에게 질문
-        messages = [
-            {"role": "system", "content": self.system_prompt}
-        ] + self.conversation_history
+        messages = self._build_messages(user_message)
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                response_format={"type": "json_object"},
-                temperature=0.7,
-            )
+            response_text = self._complete(messages, call, start_time)
 
-            # 응답 파싱
-            response_text = response.choices[0].message.content
+            # JSON을 RobotResponse로 변환 (실패 시 로컬 보정)
+            try:
+                robot_response, call.repaired = parse_robot_response(response_text)
+            except (json.JSONDecodeError, ValidationError):
+                call.parse_failures += 1
+                raise
 
-            # 대화 이력에 추가
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": response_text
-            })
+            # 대화 이력에 추가 (보정된 경우 올바른 JSON으로 저장)
+            if call.repaired:
+                response_text = robot_response.model_dump_json(exclude_none=True)
+            self._append_history("assistant", response_text)
 
-            # JSON을 RobotResponse로 변환
-            import json
-            response_data = json.loads(response_text)
-            robot_response = RobotResponse(**response_data)
+            self._store_turn(user_message, robot_response)
 
             return robot_response
 
         except Exception as e:
+            call.error = f"{type(e).__name__}: {e}"
             # Safe response on error
             return RobotResponse(
                 speech=f"Sorry, I didn't understand that. Could you please repeat? (Error: {str(e)})",
@@ -167,6 +299,139 @@ Always respond in JSON format matching the RobotResponse structure."""
                 clarification_question="What can I help you with?"
             )
 
+        finally:
+            if call.source == "llm":
+                call.total_time = time.perf_counter() - start_time
+                call.cost_usd = estimate_cost(
+                    call.model, call.prompt_tokens, call.completion_tokens, call.cached_tokens
+                )
+                self._record_metrics(call)
+
+    def _complete(self, messages: List[Dict[str, str]], call: CallMetrics, start_time: float) -> str:
+        """
+        LLM 호출 (스트리밍) - 일시적 오류는 재시도
+
+        스트리밍으로 받아 첫 토큰까지의 시간을 측정하고,
+        마지막 청크의 usage로 토큰 사용량을 기록합니다.
+
+        Returns:
+            str: 응답 텍스트
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                stream = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    response_format=self.response_format,
+                    temperature=0.7,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                )
+
+                parts = []
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        if call.time_to_first_token is None:
+                            call.time_to_first_token = time.perf_counter() - start_time
+                        parts.append(chunk.choices[0].delta.content)
+
+                    if chunk.usage is not None:
+                        call.model = chunk.model or call.model
+                        call.prompt_tokens = chunk.usage.prompt_tokens
+                        call.completion_tokens = chunk.usage.completion_tokens
+                        details = chunk.usage.prompt_tokens_details
+                        call.cached_tokens = (details.cached_tokens or 0) if details else 0
+
+                return "".join(parts)
+
+            except RETRYABLE_ERRORS:
+                if attempt >= self.max_retries:
+                    raise
+                call.retries += 1
+                call.time_to_first_token = None
+                time.sleep(self.retry_backoff * (2 ** attempt))
+
+    def _record_metrics(self, call: CallMetrics):
+        """호출 측정값 기록"""
+        self.last_call = call
+        if self.metrics is not None:
+            self.metrics.record(call)
+
+    def _append_history(self, role: str, content: str):
+        """대화 이력에 추가 (max_history를 넘으면 오래된 메시지부터 삭제)"""
+        self.conversation_history.append({"role": role, "content": content})
+
+        if self.max_history and len(self.conversation_history) > self.max_history:
+            del self.conversation_history[:-self.max_history]
+            # 이력은 항상 사용자 메시지로 시작
+            while self.conversation_history and self.conversation_history[0]["role"] != "user":
+                del self.conversation_history[0]
+
+    def _build_messages(self, user_message: str) -> List[Dict[str, str]]:
+        """
+        프롬프트 메시지 구성
+
+        기억 저장소가 있으면 최근 history_window개 메시지와
+        현재 메시지와 관련된 top-k 기억만 포함합니다.
+        """
+        messages = [{"role": "system", "content": self.system_prompt}]
+
+        if self.macro_library is not None:
+            macro_section = self.macro_library.prompt_section()
+            if macro_section:
+                messages.append({"role": "system", "content": macro_section})
+
+        if self.memory is None:
+            return messages + self.conversation_history
+
+        hits = self.memory.search(user_message, k=self.memory_top_k)
+        if hits:
+            memory_lines = "\n".join(f"- {hit.text}" for hit in hits)
+            messages.append({
+                "role": "system",
+                "content": f"# Relevant memories from earlier conversations\n{memory_lines}"
+            })
+
+        return messages + self.conversation_history[-self.history_window:]
+
+    def _match_macro(self, user_message: str) -> Optional[RobotResponse]:
+        """학습된 매크로와 일치하면 매크로 호출 하나로 구성된 응답 반환"""
+        if self.macro_library is None:
+            return None
+
+        # 물체 목록이 없으면 슬롯을 검증할 수 없으므로 슬롯 없는 매크로만 사용
+        known = list(self.known_objects()) if self.known_objects is not None else []
+        found = self.macro_library.match(user_message, known_objects=known)
+        if found is None:
+            return None
+
+        macro, slots = found
+        return RobotResponse(
+            speech="Okay, on it.",
+            commands=[self.macro_library.invocation(macro, slots)],
+        )
+
+    def _store_turn(self, user_message: str, robot_response: RobotResponse):
+        """완료된 대화 턴을 장기 기억에 저장"""
+        if self.memory is None:
+            return
+
+        self.memory.add(f"User: {user_message}\nRobot: {robot_response.speech}", kind="turn")
+
+    def remember(self, fact: str) -> bool:
+        """
+        사실을 장기 기억에 저장 (예: "the user's cup is the blue one")
+
+        Args:
+            fact: 기억할 사실
+
+        Returns:
+            bool: 저장 여부 (기억 저장소가 없거나 중복이면 False)
+        """
+        if self.memory is None:
+            return False
+        return self.memory.add_fact(fact)
+
     def reset_conversation(self):
         """대화 이력 초기화"""
         self.conversation_history = []
@@ -182,4 +447,7 @@ Always respond in JSON format matching the RobotResponse structure."""
             content = msg["content"][:100]  # 100자까지만
             summary_lines.append(f"{role}: {content}")
 
+        if self.memory is not None:
+            summary_lines.append(f"(장기 기억 {len(self.memory)}개)")
+
         return "\n".join(summary_lines)
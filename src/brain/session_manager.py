@@ -0,0 +1,380 @@
+"""
+Brain Session Manager
+여러 대화를 하나의 프로세스에서 처리하는 세션 관리자
+
+세션 ID별로 독립적인 RobotBrain 대화를 유지합니다.
+- 세션별 대화 이력 상한 (max_history)
+- 상주 세션 수 상한 + 유휴 세션은 디스크로 내보냄 (다음 요청 시 복원)
+- OpenAI 클라이언트 풀 공유 (세션마다 HTTP 연결을 만들지 않음)
+"""
+
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional
+
+from openai import OpenAI
+
+from src.brain.metrics import BrainMetrics
+from src.brain.robot_brain import RobotBrain, RobotResponse
+
+if TYPE_CHECKING:
+    from src.brain.macros import MacroLibrary
+
+
+_SESSION_ID = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+
+
+class ClientPool:
+    """라운드 로빈 OpenAI 클라이언트 풀"""
+
+    def __init__(self, api_key: str, size: int = 4):
+        """
+        Args:
+            api_key: OpenAI API 키
+            size: 클라이언트 수 (각 클라이언트는 자체 연결 풀을 가짐)
+        """
+        self.clients = [OpenAI(api_key=api_key, max_retries=0) for _ in range(max(size, 1))]
+        self._cycle = itertools.cycle(self.clients)
+        self._lock = threading.Lock()
+
+    def acquire(self) -> OpenAI:
+        """다음 클라이언트 반환"""
+        with self._lock:
+            return next(self._cycle)
+
+
+@dataclass
+class Session:
+    """상주 중인 세션"""
+
+    session_id: str
+    brain: RobotBrain
+    last_active: float = field(default_factory=time.time)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class BrainSessionManager:
+    """
+    다중 세션 RobotBrain 서비스
+
+    사용 예:
+        manager = BrainSessionManager(api_key)
+        response = manager.think("arm-01", "pick up the red block")
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gpt-4o-mini",
+        storage_dir: str = "sessions",
+        max_sessions: int = 32,
+        max_history: int = 20,
+        idle_timeout: float = 600.0,
+        pool_size: int = 4,
+        metrics: Optional[BrainMetrics] = None,
+        macro_library: Optional["MacroLibrary"] = None,
+        known_objects: Optional[Callable[[], Iterable[str]]] = None,
+        system_prompt_suffix: str = "",
+    ):
+        """
+        Args:
+            api_key: OpenAI API 키
+            model: 사용할 GPT 모델
+            storage_dir: 내보낸 세션을 저장할 디렉토리
+            max_sessions: 메모리에 상주할 최대 세션 수 (초과 시 가장 오래 쉰 세션부터 내보냄)
+            max_history: 세션별 최대 대화 메시지 수
+            idle_timeout: 이 시간(초) 동안 요청이 없으면 디스크로 내보냄
+            pool_size: 공유 OpenAI 클라이언트 수
+            metrics: 모든 세션이 공유하는 측정 집계기
+            macro_library: 모든 세션이 공유하는 매크로 라이브러리
+            known_objects: 매크로 슬롯에 허용할 물체 ID를 돌려주는 함수 (None이면 슬롯 매크로 미사용)
+            system_prompt_suffix: 시스템 프롬프트에 덧붙일 내용 (로봇 이름 등)
+        """
+        self.api_key = api_key
+        self.model = model
+        self.storage_dir = storage_dir
+        self.max_sessions = max_sessions
+        self.max_history = max_history
+        self.idle_timeout = idle_timeout
+        self.metrics = metrics if metrics is not None else BrainMetrics()
+        self.macro_library = macro_library
+        self.known_objects = known_objects
+        self.system_prompt_suffix = system_prompt_suffix
+        self.pool = ClientPool(api_key, pool_size)
+
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_sweep = time.time()
+        self.evictions = 0
+        self.restores = 0
+
+        os.makedirs(storage_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # 세션 관리
+    # ------------------------------------------------------------------
+
+    def _session_path(self, session_id: str) -> str:
+        return os.path.join(self.storage_dir, f"{session_id}.json")
+
+    def _new_brain(self) -> RobotBrain:
+        """공유 자원을 사용하는 RobotBrain 생성"""
+        brain = RobotBrain(
+            api_key=self.api_key,
+            model=self.model,
+            macro_library=self.macro_library,
+            metrics=self.metrics,
+            client=self.pool.acquire(),
+            max_history=self.max_history,
+            known_objects=self.known_objects,
+        )
+        if self.system_prompt_suffix:
+            brain.system_prompt = brain.system_prompt + "\n\n" + self.system_prompt_suffix
+        return brain
+
+    @staticmethod
+    def _check_id(session_id: str):
+        if not _SESSION_ID.match(session_id):
+            raise ValueError(f"잘못된 세션 ID: {session_id!r}")
+
+    def _get_session(self, session_id: str) -> Session:
+        """세션 반환 (없으면 디스크에서 복원하거나 새로 생성)"""
+        self._check_id(session_id)
+
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+                session.last_active = time.time()
+                return session
+
+            brain = self._new_brain()
+            path = self._session_path(session_id)
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    brain.conversation_history = json.load(f)["history"][-self.max_history:]
+                os.remove(path)
+                self.restores += 1
+
+            session = Session(session_id=session_id, brain=brain)
+            self._sessions[session_id] = session
+
+            # 상주 세션 수 제한 (오래 쉰 세션부터, 처리 중인 세션은 건너뛰므로 모두 바쁘면 잠시 초과)
+            for victim_id in list(self._sessions)[:-1]:
+                if len(self._sessions) <= self.max_sessions:
+                    break
+                self._evict_locked(victim_id)
+
+            return session
+
+    def _evict_locked(self, session_id: str) -> bool:
+        """
+        세션을 디스크로 내보냄 (self._lock 보유 상태에서 호출)
+
+        요청을 처리 중인 세션(session.lock 보유)은 기다리지 않고 건너뜁니다.
+        LLM 호출이 끝날 때까지 전역 잠금을 쥐고 있으면 다른 모든 세션이 멈추기 때문입니다.
+
+        Returns:
+            bool: 내보냈는지 여부
+        """
+        session = self._sessions[session_id]
+        if not session.lock.acquire(blocking=False):
+            return False
+        try:
+            with open(self._session_path(session_id), "w", encoding="utf-8") as f:
+                json.dump(
+                    {"history": session.brain.conversation_history, "last_active": session.last_active},
+                    f,
+                    ensure_ascii=False,
+                )
+            del self._sessions[session_id]
+        finally:
+            session.lock.release()
+        self.evictions += 1
+        return True
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """
+        유휴 세션을 디스크로 내보냄
+
+        Args:
+            now: 기준 시각 (테스트용)
+
+        Returns:
+            int: 내보낸 세션 수 (처리 중인 세션은 제외)
+        """
+        now = now if now is not None else time.time()
+        with self._lock:
+            idle = [sid for sid, s in self._sessions.items() if now - s.last_active >= self.idle_timeout]
+            evicted = sum(self._evict_locked(session_id) for session_id in idle)
+            self._last_sweep = time.time()
+        return evicted
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+
+    def think(self, session_id: str, message: str) -> RobotResponse:
+        """
+        세션의 대화로 메시지 처리
+
+        Args:
+            session_id: 세션 ID (영문/숫자/._- 최대 64자)
+            message: 사용자 메시지
+
+        Returns:
+            RobotResponse: 로봇의 응답
+        """
+        if time.time() - self._last_sweep >= self.idle_timeout:
+            self.evict_idle()
+
+        while True:
+            session = self._get_session(session_id)
+            # 같은 세션의 요청은 순서대로 처리
+            with session.lock:
+                # 기다리는 동안 내보내졌으면 복원 후 다시 시도
+                if self._sessions.get(session_id) is not session:
+                    continue
+                response = session.brain.think(message)
+                session.last_active = time.time()
+            return response
+
+    def history(self, session_id: str) -> List[Dict[str, str]]:
+        """
+        세션의 대화 이력 (세션을 만들거나 복원하지 않음)
+
+        Raises:
+            KeyError: 없는 세션
+        """
+        self._check_id(session_id)
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                return list(session.brain.conversation_history)
+            try:
+                with open(self._session_path(session_id), "r", encoding="utf-8") as f:
+                    return json.load(f)["history"][-self.max_history:]
+            except FileNotFoundError:
+                raise KeyError(session_id) from None
+
+    def reset(self, session_id: str):
+        """세션 대화 초기화"""
+        session = self._get_session(session_id)
+        with session.lock:
+            session.brain.reset_conversation()
+
+    def close(self, session_id: str):
+        """세션 삭제 (메모리 + 디스크)"""
+        self._check_id(session_id)
+        with self._lock:
+            self._sessions.pop(session_id, None)
+        path = self._session_path(session_id)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def session_ids(self) -> List[str]:
+        """상주 + 내보낸 세션 ID 목록"""
+        with self._lock:
+            resident = list(self._sessions)
+        stored = [name[:-5] for name in os.listdir(self.storage_dir) if name.endswith(".json")]
+        return resident + [sid for sid in stored if sid not in resident]
+
+    def stats(self) -> Dict[str, int]:
+        """세션 통계"""
+        with self._lock:
+            resident = len(self._sessions)
+            messages = sum(len(s.brain.conversation_history) for s in self._sessions.values())
+        return {
+            "resident_sessions": resident,
+            "resident_messages": messages,
+            "evictions": self.evictions,
+            "restores": self.restores,
+            "clients": len(self.pool.clients),
+        }
+
+
+def create_http_server(manager: BrainSessionManager, host: str = "127.0.0.1", port: int = 8080) -> ThreadingHTTPServer:
+    """
+    세션 관리자용 작은 HTTP API 서버
+
+    POST   /sessions/<id>/think   {"message": "..."} → RobotResponse JSON
+    GET    /sessions/<id>         대화 이력
+    DELETE /sessions/<id>         세션 삭제
+    GET    /sessions              세션 목록 + 통계
+    GET    /metrics               Prometheus 텍스트
+
+    Args:
+        manager: 세션 관리자
+        host: 바인드 주소
+        port: 포트
+
+    Returns:
+        ThreadingHTTPServer: serve_forever()로 실행
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body, content_type: str = "application/json"):
+            data = body if isinstance(body, str) else json.dumps(body, ensure_ascii=False)
+            payload = data.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _parts(self) -> List[str]:
+            return [part for part in self.path.split("?")[0].split("/") if part]
+
+        def do_GET(self):
+            parts = self._parts()
+            try:
+                if parts == ["metrics"]:
+                    self._send(200, manager.metrics.to_prometheus(), "text/plain; version=0.0.4")
+                elif parts == ["sessions"]:
+                    self._send(200, {"sessions": manager.session_ids(), "stats": manager.stats()})
+                elif len(parts) == 2 and parts[0] == "sessions":
+                    self._send(200, {"history": manager.history(parts[1])})
+                else:
+                    self._send(404, {"error": "not found"})
+            except KeyError as e:
+                self._send(404, {"error": f"unknown session: {e.args[0]}"})
+            except ValueError as e:
+                self._send(400, {"error": str(e)})
+
+        def do_POST(self):
+            parts = self._parts()
+            if len(parts) != 3 or parts[0] != "sessions" or parts[2] != "think":
+                self._send(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                message = json.loads(self.rfile.read(length) or b"{}").get("message", "")
+                if not message:
+                    raise ValueError("message가 필요합니다")
+                response = manager.think(parts[1], message)
+                self._send(200, response.model_dump(exclude_none=True))
+            except (ValueError, AttributeError) as e:
+                self._send(400, {"error": str(e)})
+
+        def do_DELETE(self):
+            parts = self._parts()
+            if len(parts) != 2 or parts[0] != "sessions":
+                self._send(404, {"error": "not found"})
+                return
+            try:
+                manager.close(parts[1])
+                self._send(200, {"closed": parts[1]})
+            except ValueError as e:
+                self._send(400, {"error": str(e)})
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
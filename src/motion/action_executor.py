@@ -3,7 +3,8 @@
 Brain이 생성한 명령을 로봇 시뮬레이터로 실행
 """
 
-from typing import List
+from typing import List, Optional
+from src.brain.macros import MACRO_ACTION, MacroLibrary
 from src.brain.robot_brain import ActionCommand
 from src.simulation.simple_robot_sim import SimpleRobotSimulator
 
@@ -14,12 +15,36 @@ class ActionExecutor:
     Brain의 명령을 받아 시뮬레이터에서 실행
     """
 
-    def __init__(self, simulator: SimpleRobotSimulator):
+    def __init__(self, simulator: SimpleRobotSimulator, macro_library: Optional[MacroLibrary] = None):
         """
         Args:
             simulator: 로봇 시뮬레이터
+            macro_library: 성공한 명령 시퀀스를 기록할 매크로 라이브러리
         """
         self.sim = simulator
+        self.macro_library = macro_library
+
+    def expand_macros(self, commands: List[ActionCommand]) -> List[ActionCommand]:
+        """
+        매크로 호출 명령을 실제 동작 명령으로 전개
+
+        Args:
+            commands: 명령 리스트 (macro 명령 포함 가능)
+
+        Returns:
+            List[ActionCommand]: 전개된 명령 리스트
+        """
+        if self.macro_library is None:
+            return list(commands)
+
+        expanded = []
+        for command in commands:
+            if command.action_type == MACRO_ACTION:
+                parameters = command.parameters or {}
+                expanded.extend(self.macro_library.expand(parameters.get("macro", ""), parameters.get("slots")))
+            else:
+                expanded.append(command)
+        return expanded
 
     def execute_command(self, command: ActionCommand) -> bool:
         """
@@ -113,6 +138,13 @@ class ActionExecutor:
                 # 초기 위치
                 return self.sim.home()
 
+            elif action_type == MACRO_ACTION:
+                # 매크로: 전개 후 순차 실행
+                if self.macro_library is None:
+                    print("  ⚠ 매크로 라이브러리가 없습니다")
+                    return False
+                return all(self.execute_command(c) for c in self.expand_macros([command]))
+
             elif action_type == "wait":
                 # 대기
                 duration = parameters.get("duration", 1.0)
@@ -129,16 +161,23 @@ class ActionExecutor:
             print(f"  ✗ 실행 실패: {e}")
             return False
 
-    def execute_commands(self, commands: List[ActionCommand]) -> bool:
+    def execute_commands(self, commands: List[ActionCommand], intent: Optional[str] = None) -> bool:
         """
         여러 명령을 순차적으로 실행
 
         Args:
             commands: 실행할 명령 리스트
+            intent: 명령을 만든 사용자 요청 (모두 성공하면 매크로로 기록)
 
         Returns:
             모든 명령 성공 여부
         """
+        try:
+            commands = self.expand_macros(commands)
+        except (KeyError, ValueError) as e:
+            print(f"\n  ✗ 매크로 전개 실패: {e}")
+            return False
+
         if not commands:
             print("\n⚙️  실행할 동작이 없습니다")
             return True
@@ -159,4 +198,10 @@ class ActionExecutor:
         print("\n" + "=" * 60)
         print(f"실행 완료: {success_count}/{len(commands)} 성공")
 
-        return success_count == len(commands)
+        success = success_count == len(commands)
+        if success and intent and self.macro_library is not None:
+            macro = self.macro_library.record(intent, commands)
+            if macro is not None:
+                print(f"📚 매크로 기록: {macro.name}")
+
+        return success
@@ -0,0 +1,437 @@
+"""
+오디오 입출력 장치 모듈
+마이크(sounddevice)와 가상 장치(파일/합성 신호)를 같은 콜백 규약으로 다룹니다.
+
+녹음/웨이크워드 감지 코드는 sounddevice를 직접 부르지 않고 장치 객체를 통해 스트림을 엽니다.
+- SoundDeviceInput: 실제 마이크 (sounddevice는 처음 스트림을 열 때 import)
+- SimulatedInputDevice: WAV 파일이나 NumPy 버퍼를 실시간 또는 배속으로 흘려 보내는 가상 마이크
+- SoundDeviceOutput / SimulatedOutputDevice: TTS 스트리밍 재생용 출력 (write()로 PCM 조각을 바로 재생)
+
+콜백 규약은 sounddevice와 같습니다: callback(indata, frames, time_info, status)
+indata는 (frames, channels) int16 배열이고, status.input_overflow로 오버플로를 알립니다.
+
+가상 장치로 마이크 없이(PortAudio 없이) MicrophoneRecorder, WakeWordDetector,
+SmartWakeWordDetector, AudioCaptureService를 녹음 파일로 재현하고 테스트할 수 있습니다.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Callable, Optional, Union
+
+import numpy as np
+
+from src.perception.audio_io import decode_wav, to_int16
+
+
+# sounddevice 콜백과 같은 형식: callback(indata, frames, time_info, status)
+AudioCallback = Callable[[np.ndarray, int, object, object], None]
+
+
+@dataclass
+class CallbackStatus:
+    """가상 장치 콜백 상태 (sounddevice.CallbackFlags 대역)"""
+
+    input_overflow: bool = False
+
+    def __bool__(self):
+        return self.input_overflow
+
+
+class AudioInputDevice(ABC):
+    """
+    오디오 입력 장치 인터페이스
+
+    input_stream()은 sounddevice.InputStream처럼 start/stop/close와
+    with 문을 지원하는 스트림을 반환합니다.
+    """
+
+    #: 실제 시간 속도로 블록을 내는지 (진행 표시 등에서 사용)
+    realtime = True
+
+    @abstractmethod
+    def input_stream(self, samplerate: int, channels: int, callback: AudioCallback,
+                     blocksize: int = 1024, dtype: str = "int16"):
+        """콜백으로 블록을 전달하는 입력 스트림 생성"""
+
+    def rec(self, frames: int, samplerate: int, channels: int = 1, dtype: str = "int16") -> np.ndarray:
+        """
+        frames 샘플 녹음 시작 (sounddevice.rec과 같이 바로 반환, wait()로 완료 대기)
+
+        Returns:
+            np.ndarray: 녹음이 채워질 (frames, channels) 배열
+        """
+        out = np.zeros((frames, channels), dtype=dtype)
+        filled = 0
+        done = threading.Event()
+
+        def callback(indata, n, time_info, status):
+            nonlocal filled
+            take = min(n, frames - filled)
+            out[filled:filled + take] = indata[:take]
+            filled += take
+            if filled >= frames:
+                done.set()
+
+        stream = self.input_stream(samplerate, channels, callback, blocksize=min(frames, 1024) or 1, dtype=dtype)
+        stream.start()
+        self._recording = (stream, done)
+        return out
+
+    def wait(self):
+        """rec()으로 시작한 녹음이 끝날 때까지 대기"""
+        recording = getattr(self, "_recording", None)
+        if recording is None:
+            return
+        stream, done = recording
+        done.wait()
+        stream.stop()
+        stream.close()
+        self._recording = None
+
+    def query_devices(self):
+        """장치 목록 (표시용)"""
+        return str(self)
+
+
+class SoundDeviceInput(AudioInputDevice):
+    """실제 마이크 (sounddevice / PortAudio)"""
+
+    def __init__(self, device=None):
+        """
+        Args:
+            device: sounddevice 장치 번호 또는 이름 (None이면 시스템 기본 장치)
+        """
+        self.device = device
+
+    @staticmethod
+    def _sd():
+        import sounddevice as sd
+
+        return sd
+
+    def input_stream(self, samplerate, channels, callback, blocksize=1024, dtype="int16"):
+        return self._sd().InputStream(
+            samplerate=samplerate,
+            channels=channels,
+            callback=callback,
+            dtype=dtype,
+            blocksize=blocksize,
+            device=self.device
+        )
+
+    def rec(self, frames, samplerate, channels=1, dtype="int16"):
+        return self._sd().rec(frames, samplerate=samplerate, channels=channels, dtype=dtype, device=self.device)
+
+    def wait(self):
+        self._sd().wait()
+
+    def query_devices(self):
+        return self._sd().query_devices()
+
+
+class SimulatedInputDevice(AudioInputDevice):
+    """
+    가상 마이크: 오디오 버퍼/WAV 파일을 블록 단위로 콜백에 전달
+
+    - speed=1.0이면 실제 시간, 10.0이면 10배속, 0이면 기다리지 않고 최대한 빨리
+    - 스트림이 여러 번 열려도 재생 위치는 장치에 남아 이어집니다
+      (웨이크워드 감지 → 명령 녹음 순서로 같은 녹음을 이어서 들을 수 있음)
+    - 소스가 끝나면 무음(tail="silence")을 계속 내거나 스트림을 멈춥니다(tail="stop")
+    - push()로 재생 중에 오디오를 덧붙일 수 있습니다 (합성 시나리오)
+
+    사용 예:
+        device = SimulatedInputDevice.from_file("test_audio/command1.wav", speed=20.0)
+        recorder = MicrophoneRecorder(device=device)
+    """
+
+    def __init__(self, source: Union[np.ndarray, None] = None, sample_rate: int = 16000, speed: float = 1.0,
+                 loop: bool = False, tail: str = "silence", noise_level: float = 0.0, seed: int = 0):
+        """
+        Args:
+            source: int16/float 오디오 (samples,) 또는 (samples, channels), 없으면 빈 소스
+            sample_rate: source의 샘플링 레이트 (스트림 레이트가 다르면 리샘플링)
+            speed: 재생 배속 (0 이하면 대기 없음)
+            loop: 소스를 반복 재생
+            tail: 소스가 끝난 뒤 "silence" (무음 계속) | "stop" (콜백 중단)
+            noise_level: 무음 구간에 섞을 백색 잡음 RMS (int16 단위, 0이면 완전 무음)
+            seed: 잡음 시드
+        """
+        if tail not in ("silence", "stop"):
+            raise ValueError(f"알 수 없는 tail: {tail} (silence, stop)")
+
+        self.sample_rate = sample_rate
+        self.speed = speed
+        self.loop = loop
+        self.tail = tail
+        self.noise_level = noise_level
+        self.realtime = speed == 1.0
+        self._rng = np.random.default_rng(seed)
+
+        self._lock = threading.Lock()
+        self._source = np.zeros((0, 1), dtype=np.int16)
+        self._resampled = {}
+        self.position = 0            # 재생 위치 (source 샘플 기준)
+        self.finished = threading.Event()  # 소스를 끝까지 재생했는지
+        self.blocks_delivered = 0
+        if source is not None:
+            self.push(source)
+
+    @classmethod
+    def from_file(cls, path: Union[str, bytes], **kwargs) -> "SimulatedInputDevice":
+        """WAV 파일/바이트로 생성"""
+        audio, sample_rate = decode_wav(path)
+        return cls(audio, sample_rate=sample_rate, **kwargs)
+
+    @property
+    def duration(self) -> float:
+        """소스 길이 (초)"""
+        return len(self._source) / self.sample_rate
+
+    @property
+    def elapsed(self) -> float:
+        """재생한 시간 (초, 소스 기준)"""
+        return self.position / self.sample_rate
+
+    def push(self, audio: np.ndarray):
+        """소스 끝에 오디오 추가"""
+        pcm = to_int16(np.asarray(audio))
+        if pcm.ndim == 1:
+            pcm = pcm.reshape(-1, 1)
+        with self._lock:
+            if len(self._source) and pcm.shape[1] != self._source.shape[1]:
+                pcm = np.repeat(pcm.mean(axis=1, keepdims=True).astype(np.int16), self._source.shape[1], axis=1)
+            self._source = np.concatenate([self._source, pcm]) if len(self._source) else pcm
+            self._resampled.clear()
+            if len(pcm):
+                self.finished.clear()
+
+    def rewind(self):
+        """처음부터 다시 재생"""
+        with self._lock:
+            self.position = 0
+            self.finished.clear()
+
+    def _source_at(self, samplerate: int, channels: int) -> np.ndarray:
+        """스트림 형식으로 맞춘 소스 (레이트/채널별로 한 번만 변환)"""
+        key = (samplerate, channels)
+        converted = self._resampled.get(key)
+        if converted is None:
+            converted = self._source
+            if samplerate != self.sample_rate:
+                from src.perception.audio_prep import UploadPreprocessor
+
+                converted = UploadPreprocessor.resample(converted, self.sample_rate, samplerate)
+            if converted.shape[1] != channels:
+                mono = converted.mean(axis=1, keepdims=True).astype(np.int16)
+                converted = np.repeat(mono, channels, axis=1)
+            self._resampled[key] = converted
+        return converted
+
+    def _next_block(self, samplerate: int, channels: int, blocksize: int) -> Optional[np.ndarray]:
+        """다음 블록 (스트림 형식, 더 없으면 None)"""
+        with self._lock:
+            source = self._source_at(samplerate, channels)
+            scale = samplerate / self.sample_rate
+            start = int(round(self.position * scale))
+            block = source[start:start + blocksize]
+
+            if len(block) < blocksize and self.loop and len(source):
+                block = np.concatenate([block, np.resize(source, (blocksize - len(block), channels))])
+                self.position = ((start + blocksize) % len(source)) / scale
+            else:
+                self.position += len(block) / scale
+
+            if len(block) < blocksize:
+                self.finished.set()
+                if self.tail == "stop" and len(block) == 0:
+                    return None
+                fill = np.zeros((blocksize - len(block), channels), dtype=np.int16)
+                if self.noise_level:
+                    fill[:] = np.clip(self._rng.normal(0, self.noise_level, fill.shape), -32768, 32767)
+                block = np.concatenate([block, fill])
+
+            self.blocks_delivered += 1
+            return np.ascontiguousarray(block)
+
+    def input_stream(self, samplerate, channels, callback, blocksize=1024, dtype="int16"):
+        return SimulatedStream(self, samplerate, channels, callback, blocksize, dtype)
+
+    def __repr__(self):
+        return (f"SimulatedInputDevice({self.duration:.1f}s @ {self.sample_rate}Hz, "
+                f"speed={self.speed}, position={self.elapsed:.1f}s)")
+
+
+class SimulatedStream:
+    """SimulatedInputDevice의 스트림 (백그라운드 스레드에서 콜백 호출)"""
+
+    def __init__(self, device: SimulatedInputDevice, samplerate: int, channels: int, callback: AudioCallback,
+                 blocksize: int, dtype: str):
+        self.device = device
+        self.samplerate = samplerate
+        self.channels = channels
+        self.callback = callback
+        self.blocksize = blocksize
+        self.dtype = dtype
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def active(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="simulated-input", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def close(self):
+        self.stop()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self):
+        interval = self.blocksize / self.samplerate / self.device.speed if self.device.speed > 0 else 0.0
+        next_time = time.monotonic()
+        status = CallbackStatus()
+        stream_time = 0.0
+
+        while not self._stop.is_set():
+            block = self.device._next_block(self.samplerate, self.channels, self.blocksize)
+            if block is None:
+                break
+            if self.dtype != "int16":
+                block = (block / 32768.0).astype(self.dtype)
+
+            time_info = SimpleNamespace(inputBufferAdcTime=stream_time, currentTime=stream_time)
+            try:
+                self.callback(block, self.blocksize, time_info, status)
+            except Exception as e:
+                print(f"\n⚠ 가상 오디오 콜백 오류: {e}")
+                break
+            stream_time += self.blocksize / self.samplerate
+
+            if interval:
+                next_time += interval
+                delay = next_time - time.monotonic()
+                if delay > 0:
+                    self._stop.wait(delay)
+            else:
+                time.sleep(0)  # 다른 스레드가 따라올 수 있게 양보
+
+
+class AudioOutputDevice(ABC):
+    """
+    오디오 출력 장치 인터페이스
+
+    output_stream()은 write(pcm)/start/stop/close와 with 문을 지원하는 스트림을 반환합니다.
+    write()는 장치 버퍼가 찰 때까지만 기다리므로 조각이 도착하는 대로 이어서 재생되고,
+    stop()은 남은 오디오가 모두 재생된 뒤 반환합니다 (sounddevice.OutputStream과 같음).
+    """
+
+    @abstractmethod
+    def output_stream(self, samplerate: int, channels: int = 1, dtype: str = "int16"):
+        """write()로 PCM을 재생하는 출력 스트림 생성"""
+
+
+class SoundDeviceOutput(AudioOutputDevice):
+    """실제 스피커 (sounddevice / PortAudio)"""
+
+    def __init__(self, device=None, latency="low"):
+        """
+        Args:
+            device: sounddevice 장치 번호 또는 이름 (None이면 시스템 기본 장치)
+            latency: 출력 지연 ("low", "high" 또는 초)
+        """
+        self.device = device
+        self.latency = latency
+
+    def output_stream(self, samplerate, channels=1, dtype="int16"):
+        return SoundDeviceInput._sd().OutputStream(
+            samplerate=samplerate,
+            channels=channels,
+            dtype=dtype,
+            device=self.device,
+            latency=self.latency
+        )
+
+
+class SimulatedOutputDevice(AudioOutputDevice):
+    """
+    가상 스피커: write()된 PCM을 모아 두고, speed에 맞춰 재생 시간만큼 대기
+    (speed=1.0이면 실제 시간, 0이면 기다리지 않음)
+    """
+
+    def __init__(self, speed: float = 0.0):
+        """
+        Args:
+            speed: 재생 배속 (0 이하면 대기 없음)
+        """
+        self.speed = speed
+        self.chunks = []              # (sample_rate, int16 (samples, channels))
+        self.streams_opened = 0
+        self.first_write: Optional[float] = None  # 첫 write() 시각 (time.monotonic)
+
+    @property
+    def audio(self) -> np.ndarray:
+        """지금까지 재생한 오디오 (samples,) int16 - 첫 채널"""
+        if not self.chunks:
+            return np.zeros(0, dtype=np.int16)
+        return np.concatenate([chunk[:, 0] for _, chunk in self.chunks])
+
+    def output_stream(self, samplerate, channels=1, dtype="int16"):
+        self.streams_opened += 1
+        return SimulatedOutputStream(self, samplerate, channels, dtype)
+
+
+class SimulatedOutputStream:
+    """SimulatedOutputDevice의 스트림 (write()를 호출한 스레드에서 바로 처리)"""
+
+    def __init__(self, device: SimulatedOutputDevice, samplerate: int, channels: int, dtype: str):
+        self.device = device
+        self.samplerate = samplerate
+        self.channels = channels
+        self.dtype = dtype
+        self.active = False
+
+    def start(self):
+        self.active = True
+
+    def write(self, data: np.ndarray):
+        pcm = to_int16(np.asarray(data))
+        if pcm.ndim == 1:
+            pcm = pcm.reshape(-1, 1)
+        device = self.device
+        if device.first_write is None:
+            device.first_write = time.monotonic()
+        device.chunks.append((self.samplerate, pcm))
+        if device.speed > 0:
+            time.sleep(len(pcm) / self.samplerate / device.speed)
+
+    def stop(self):
+        self.active = False
+
+    def close(self):
+        self.stop()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
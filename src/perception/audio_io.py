@@ -0,0 +1,76 @@
+"""
+오디오 인코딩 모듈
+NumPy 오디오 버퍼 ↔ WAV 바이트 (디스크를 거치지 않음)
+"""
+
+import io
+import wave
+from typing import Tuple, Union
+
+import numpy as np
+
+
+def to_int16(audio: np.ndarray) -> np.ndarray:
+    """
+    오디오 버퍼를 int16 PCM으로 변환
+
+    Args:
+        audio: int16 또는 [-1, 1] 범위 float 배열 (samples,) 또는 (samples, channels)
+
+    Returns:
+        np.ndarray: int16 배열
+    """
+    if audio.dtype == np.int16:
+        return audio
+    if np.issubdtype(audio.dtype, np.floating):
+        return (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+    return np.clip(audio, -32768, 32767).astype(np.int16)
+
+
+def encode_wav(audio: np.ndarray, sample_rate: int = 16000) -> bytes:
+    """
+    NumPy 오디오 버퍼를 메모리에서 WAV 바이트로 인코딩
+
+    Args:
+        audio: 오디오 배열 (samples,) 또는 (samples, channels)
+        sample_rate: 샘플링 레이트 (Hz)
+
+    Returns:
+        bytes: WAV 파일 바이트
+    """
+    pcm = to_int16(np.asarray(audio))
+    channels = 1 if pcm.ndim == 1 else pcm.shape[1]
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)  # 16-bit
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(np.ascontiguousarray(pcm).tobytes())
+    return buffer.getvalue()
+
+
+def decode_wav(source: Union[str, bytes]) -> Tuple[np.ndarray, int]:
+    """
+    WAV 파일/바이트를 int16 배열로 디코딩
+
+    Args:
+        source: 파일 경로 또는 WAV 바이트
+
+    Returns:
+        (audio, sample_rate): audio는 (samples,) 또는 (samples, channels)
+    """
+    handle = io.BytesIO(source) if isinstance(source, bytes) else source
+    with wave.open(handle, "rb") as wav_file:
+        channels = wav_file.getnchannels()
+        sample_width = wav_file.getsampwidth()
+        sample_rate = wav_file.getframerate()
+        frames = wav_file.readframes(wav_file.getnframes())
+
+    if sample_width != 2:
+        raise ValueError(f"16-bit PCM WAV만 지원합니다 (sample width: {sample_width})")
+
+    audio = np.frombuffer(frames, dtype=np.int16)
+    if channels > 1:
+        audio = audio.reshape(-1, channels)
+    return audio, sample_rate
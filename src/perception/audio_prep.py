@@ -0,0 +1,232 @@
+"""
+음성 인식 업로드 전처리 모듈
+앞뒤 무음 제거 → (선택) 모노 다운믹스 / 리샘플링 → 압축 인코딩 (FLAC / Opus)
+
+record(duration=5.0)처럼 고정 길이로 녹음하면 말이 끝난 뒤의 무음까지
+16kHz int16 PCM 그대로 올라갑니다. 업로드가 느린 회선에서는 이 바이트 수가
+음성 인식 지연의 큰 부분을 차지하므로, 보내기 전에 필요한 부분만 작게 만듭니다.
+
+압축 인코딩은 soundfile(libsndfile)이 있을 때만 사용하고, 없으면 WAV로 보냅니다.
+"""
+
+import io
+import threading
+from dataclasses import dataclass
+from math import gcd
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.perception.audio_io import decode_wav, encode_wav, to_int16
+from src.perception.vad import VoiceActivityDetector
+
+try:
+    import soundfile as sf
+except (ImportError, OSError):  # 패키지 또는 libsndfile 없음
+    sf = None
+
+
+# 코덱 → (soundfile format, subtype, 업로드 파일 확장자)
+CODECS = {
+    "flac": ("FLAC", "PCM_16", "flac"),
+    "opus": ("OGG", "OPUS", "ogg"),
+}
+OPUS_RATES = (8000, 12000, 16000, 24000, 48000)
+
+
+@dataclass
+class PreparedAudio:
+    """업로드 준비가 끝난 오디오"""
+
+    data: bytes
+    format: str             # 업로드 파일 확장자 (wav, flac, ogg)
+    sample_rate: int
+    duration: float         # 전처리 후 길이 (초)
+    original_duration: float
+    original_bytes: int     # 원본을 WAV로 보냈을 때 크기
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.original_bytes - len(self.data)
+
+    @property
+    def ratio(self) -> float:
+        """업로드 크기 / 원본 크기"""
+        return len(self.data) / self.original_bytes if self.original_bytes else 1.0
+
+
+class UploadPreprocessor:
+    """
+    음성 인식 업로드 전처리기
+
+    사용 예:
+        prep = UploadPreprocessor(codec="flac")
+        prepared = prep.prepare(audio, 16000)
+        recognizer.transcribe_bytes(prepared.data, format=prepared.format)
+    """
+
+    def __init__(self, codec: str = "flac", target_rate: Optional[int] = 16000,
+                 trim: bool = True, pad: float = 0.2, downmix: bool = True):
+        """
+        Args:
+            codec: "flac" | "opus" | "wav" (soundfile이 없으면 wav로 대체)
+            target_rate: 이 샘플링 레이트로 리샘플링 (None이면 그대로, Whisper는 16kHz면 충분)
+            trim: VAD로 앞뒤 무음 제거
+            pad: 무음 제거 후 앞뒤에 남길 여유 (초)
+            downmix: 다채널이면 모노로 합침
+        """
+        if codec not in CODECS and codec != "wav":
+            raise ValueError(f"지원하지 않는 코덱: {codec} (flac, opus, wav)")
+
+        if codec != "wav" and sf is None:
+            print(f"⚠ soundfile이 없어 {codec} 대신 WAV로 업로드합니다 (pip install soundfile)")
+            codec = "wav"
+
+        self.codec = codec
+        self.target_rate = target_rate
+        self.trim = trim
+        self.pad = pad
+        self.downmix = downmix
+
+        # 누적 통계 (transcribe_many의 작업 스레드에서도 갱신)
+        self._lock = threading.Lock()
+        self.uploads = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.seconds_in = 0.0
+        self.seconds_out = 0.0
+
+    @property
+    def cache_id(self) -> str:
+        """인식 결과에 영향을 주는 설정 (음성 인식 캐시 키에 포함)"""
+        return f"{self.codec}:{self.target_rate}:trim={self.trim}:pad={self.pad}:downmix={self.downmix}"
+
+    # ------------------------------------------------------------------
+    # 단계별 처리
+    # ------------------------------------------------------------------
+
+    def trim_silence(self, audio: np.ndarray, sample_rate: int) -> np.ndarray:
+        """
+        앞뒤 무음 제거 (말소리가 없으면 원본 유지)
+
+        Args:
+            audio: (samples,) 또는 (samples, channels)
+            sample_rate: 샘플링 레이트
+
+        Returns:
+            np.ndarray: 잘라낸 뷰
+        """
+        segments = VoiceActivityDetector(sample_rate).segments(audio)
+        if not segments:
+            return audio
+
+        pad = int(self.pad * sample_rate)
+        start = max(segments[0][0] - pad, 0)
+        end = min(segments[-1][1] + pad, len(audio))
+        return audio[start:end]
+
+    @staticmethod
+    def resample(audio: np.ndarray, sample_rate: int, target_rate: int) -> np.ndarray:
+        """
+        다상(polyphase) 리샘플링 (안티에일리어싱 필터 포함)
+
+        Args:
+            audio: int16 (samples,) 또는 (samples, channels)
+
+        Returns:
+            np.ndarray: int16 오디오
+        """
+        if sample_rate == target_rate or len(audio) == 0:
+            return audio
+
+        from scipy.signal import resample_poly
+
+        factor = gcd(sample_rate, target_rate)
+        resampled = resample_poly(audio.astype(np.float32), target_rate // factor, sample_rate // factor, axis=0)
+        return np.clip(np.round(resampled), -32768, 32767).astype(np.int16)
+
+    def encode(self, audio: np.ndarray, sample_rate: int):
+        """
+        설정한 코덱으로 인코딩
+
+        Returns:
+            (bytes, 파일 확장자)
+        """
+        if self.codec == "wav":
+            return encode_wav(audio, sample_rate), "wav"
+
+        file_format, subtype, extension = CODECS[self.codec]
+        if self.codec == "opus" and sample_rate not in OPUS_RATES:
+            # Opus가 받지 않는 레이트면 FLAC으로
+            file_format, subtype, extension = CODECS["flac"]
+
+        buffer = io.BytesIO()
+        sf.write(buffer, audio, sample_rate, format=file_format, subtype=subtype)
+        return buffer.getvalue(), extension
+
+    # ------------------------------------------------------------------
+    # 전체 파이프라인
+    # ------------------------------------------------------------------
+
+    def prepare(self, audio: np.ndarray, sample_rate: int) -> PreparedAudio:
+        """
+        오디오 버퍼를 업로드용으로 준비
+
+        Args:
+            audio: int16/float 오디오 (samples,) 또는 (samples, channels)
+            sample_rate: 샘플링 레이트
+
+        Returns:
+            PreparedAudio
+        """
+        pcm = to_int16(np.asarray(audio))
+        channels = 1 if pcm.ndim == 1 else pcm.shape[1]
+        original_bytes = 44 + pcm.size * 2  # WAV 헤더 + PCM
+        original_duration = len(pcm) / sample_rate
+
+        if self.downmix and channels > 1:
+            pcm = pcm.mean(axis=1).astype(np.int16)
+        elif pcm.ndim == 2 and channels == 1:
+            pcm = pcm[:, 0]
+
+        if self.trim:
+            pcm = self.trim_silence(pcm, sample_rate)
+
+        if self.target_rate:
+            pcm = self.resample(pcm, sample_rate, self.target_rate)
+            sample_rate = self.target_rate
+
+        data, extension = self.encode(np.ascontiguousarray(pcm), sample_rate)
+        prepared = PreparedAudio(
+            data=data,
+            format=extension,
+            sample_rate=sample_rate,
+            duration=len(pcm) / sample_rate,
+            original_duration=original_duration,
+            original_bytes=original_bytes,
+        )
+
+        with self._lock:
+            self.uploads += 1
+            self.bytes_in += original_bytes
+            self.bytes_out += len(data)
+            self.seconds_in += original_duration
+            self.seconds_out += prepared.duration
+        return prepared
+
+    def prepare_wav(self, source) -> PreparedAudio:
+        """WAV 파일 경로 또는 바이트를 업로드용으로 준비"""
+        audio, sample_rate = decode_wav(source)
+        return self.prepare(audio, sample_rate)
+
+    def summary(self) -> Dict[str, float]:
+        """누적 절감량"""
+        with self._lock:
+            return {
+                "uploads": self.uploads,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "bytes_saved": self.bytes_in - self.bytes_out,
+                "seconds_in": round(self.seconds_in, 2),
+                "seconds_out": round(self.seconds_out, 2),
+            }
@@ -0,0 +1,211 @@
+"""
+상시 오디오 캡처 서비스
+마이크 스트림을 한 번만 열어 두고 여러 소비자가 공유
+
+웨이크워드 감지와 명령 녹음이 각자 스트림을 열고 닫으면
+장치를 다시 여는 동안 명령의 첫 음절이 잘립니다.
+이 서비스는 하나의 InputStream을 계속 열어 두고 링 버퍼에 최근 오디오를 보관하므로,
+명령 녹음을 웨이크워드가 확인되기 전 시점(pre-roll)부터 시작할 수 있습니다.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.perception.audio_device import AudioCallback, AudioInputDevice, SoundDeviceInput
+from src.perception.echo import EchoSuppressor
+from src.perception.ring_buffer import AudioRingBuffer
+
+
+class AudioCaptureService:
+    """
+    상시 오디오 캡처 서비스
+
+    - 스트림 하나를 열어 두고 모든 블록을 링 버퍼에 기록
+    - subscribe()로 등록한 콜백에 같은 블록을 전달 (sounddevice 콜백 형식)
+    - record()는 과거 위치부터 pre-roll을 포함해 오디오를 잘라냄
+    """
+
+    def __init__(self, sample_rate: int = 16000, channels: int = 1, blocksize: int = 1600,
+                 buffer_seconds: float = 30.0, device: Optional[AudioInputDevice] = None,
+                 echo_suppression: bool = True):
+        """
+        Args:
+            sample_rate: 샘플링 레이트 (Hz)
+            channels: 채널 수
+            blocksize: 콜백 블록 크기 (기본 1600 = 0.1초)
+            buffer_seconds: 링 버퍼에 보관할 최근 오디오 길이 (초)
+            device: 입력 장치 (기본: 실제 마이크, SimulatedInputDevice로 파일 재생 가능)
+            echo_suppression: TTS 재생 중/직후 자기 목소리 억제 (self.echo를 TTS에 연결)
+        """
+        self.device = device if device is not None else SoundDeviceInput()
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.blocksize = blocksize
+        self.ring = AudioRingBuffer.for_duration(buffer_seconds, sample_rate, channels)
+        self.echo = EchoSuppressor(sample_rate) if echo_suppression else None
+
+        self._subscribers: Dict[int, AudioCallback] = {}
+        self._next_token = 0
+        self._lock = threading.Lock()
+        self._data_ready = threading.Condition()
+        self._stream = None
+        self.overflows = 0
+
+    # ------------------------------------------------------------------
+    # 스트림 관리
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """스트림 시작 (이미 실행 중이면 무시)"""
+        if self._stream is not None:
+            return
+
+        self._stream = self.device.input_stream(
+            samplerate=self.sample_rate,
+            channels=self.channels,
+            callback=self._callback,
+            dtype='int16',
+            blocksize=self.blocksize
+        )
+        self._stream.start()
+
+    def stop(self):
+        """스트림 종료"""
+        if self._stream is None:
+            return
+
+        self._stream.stop()
+        self._stream.close()
+        self._stream = None
+
+    @property
+    def running(self) -> bool:
+        return self._stream is not None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _callback(self, indata, frames, time_info, status):
+        """오디오 스레드 콜백: 에코 억제 → 링 버퍼 기록 → 구독자 전달"""
+        if status and status.input_overflow:
+            self.overflows += 1
+
+        if self.echo is not None:
+            indata = self.echo.process(indata)
+
+        self.ring.write(indata)
+
+        for callback in list(self._subscribers.values()):
+            try:
+                callback(indata, frames, time_info, status)
+            except Exception as e:
+                print(f"\n⚠ 오디오 구독자 오류: {e}")
+
+        with self._data_ready:
+            self._data_ready.notify_all()
+
+    # ------------------------------------------------------------------
+    # 구독
+    # ------------------------------------------------------------------
+
+    def subscribe(self, callback: AudioCallback) -> int:
+        """
+        블록 콜백 등록 (오디오 스레드에서 호출되므로 가볍게 유지할 것)
+
+        Args:
+            callback: callback(indata, frames, time_info, status)
+
+        Returns:
+            int: 구독 해제용 토큰
+        """
+        with self._lock:
+            token = self._next_token
+            self._next_token += 1
+            self._subscribers[token] = callback
+        return token
+
+    def unsubscribe(self, token: int):
+        """콜백 등록 해제"""
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+    @contextmanager
+    def listen(self, callback: AudioCallback):
+        """
+        with 블록 동안만 콜백 등록 (전용 입력 스트림 대신 사용)
+
+        Args:
+            callback: callback(indata, frames, time_info, status)
+        """
+        self.start()
+        token = self.subscribe(callback)
+        try:
+            yield self
+        finally:
+            self.unsubscribe(token)
+
+    # ------------------------------------------------------------------
+    # 오디오 읽기
+    # ------------------------------------------------------------------
+
+    @property
+    def position(self) -> int:
+        """지금까지 캡처한 총 샘플 수 (링 버퍼 절대 위치)"""
+        return self.ring.written
+
+    def wait_for(self, position: int, timeout: Optional[float] = None) -> bool:
+        """
+        position까지 캡처될 때까지 대기
+
+        Args:
+            position: 기다릴 절대 위치
+            timeout: 최대 대기 시간 (초)
+
+        Returns:
+            bool: 도달 여부
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._data_ready:
+            while self.ring.written < position:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._data_ready.wait(remaining if remaining is not None else 0.5)
+        return True
+
+    def snapshot(self, seconds: float) -> np.ndarray:
+        """최근 seconds초 오디오 복사본"""
+        return self.ring.latest_seconds(seconds, self.sample_rate, copy=True)
+
+    def record(self, duration: float, start: Optional[int] = None, pre_roll: float = 0.0) -> np.ndarray:
+        """
+        지금부터 duration초 동안 녹음 (start - pre_roll 이후의 과거 오디오 포함)
+
+        Args:
+            duration: 지금부터 추가로 녹음할 시간 (초)
+            start: 녹음 시작 기준 위치 (기본: 현재 위치)
+            pre_roll: start보다 앞서 포함할 시간 (초)
+
+        Returns:
+            np.ndarray: int16 오디오 (samples, channels)
+        """
+        self.start()
+
+        now = self.position
+        start = now if start is None else start
+        start = max(start - int(pre_roll * self.sample_rate), self.ring.oldest)
+        end = now + int(duration * self.sample_rate)
+
+        if not self.wait_for(end, timeout=duration + 2.0):
+            print("\n⚠ 오디오 캡처 지연 (스트림 확인 필요)")
+
+        end = min(end, self.position)
+        return self.ring.read(max(start, self.ring.oldest), end, copy=True)
@@ -0,0 +1,312 @@
+"""
+에코 억제 모듈
+로봇이 말하는 동안(과 직후) 마이크로 다시 들어오는 자기 목소리를 캡처 스트림에서 지웁니다.
+
+스피커로 나간 소리(참조 신호)를 알고 있으므로 마이크 스펙트럼에서 그만큼을 빼냅니다
+(스펙트럼 차감, spectral subtraction).
+- 지연: 재생 시작 후 마이크/참조 신호의 에너지 포락선 상관으로 한 번 추정
+  (추정 전에는 0 ~ max_delay 범위의 참조 스펙트럼 최댓값을 써서 놓치지 않음)
+- 에코 경로 크기: 주파수 빈별 |Y||R| / |R|² 를 지수 평균으로 추정
+- 잔향: 재생이 끝나도 에코 추정치가 reverb_time에 맞춰 천천히 감소
+- 잔여 게이트: 차감 후에도 에코 추정치보다 약한 프레임은 배경 잡음 수준으로 (말 끊기(barge-in)는 통과)
+- 지운 자리는 0이 아니라 추정한 배경 잡음 크기로 채움(comfort noise)
+  → 재생이 끝나고 잡음이 돌아올 때 VAD가 이를 발화 시작으로 오인하지 않음
+
+참조 신호가 없으면(재생 파일을 모를 때) 재생 중 + tail 동안 캡처를 배경 잡음 수준으로 누르는
+반이중(half-duplex) 게이트로 동작합니다.
+
+처리는 50% 겹침 sqrt-Hann WOLA로 블록 단위 스트리밍이며, 동작 중에는 n_fft 샘플(기본 32ms) 지연됩니다.
+블록 길이는 그대로 유지되므로 캡처 위치 계산은 바뀌지 않습니다.
+"""
+
+import threading
+from typing import Optional
+
+import numpy as np
+
+from src.perception.features import frame_signal, to_float
+
+
+class EchoSuppressor:
+    """
+    참조 신호 기반 에코 억제 + 재생 구간 게이트
+
+    사용 예:
+        echo = EchoSuppressor(16000)
+        capture 콜백:  indata = echo.process(indata)
+        TTS 재생:      echo.begin(pcm, 24000); play(); echo.end()
+    """
+
+    def __init__(self, sample_rate: int = 16000, n_fft: int = 512, over_subtraction: float = 2.0,
+                 gate_ratio: float = 1.0, reverb_time: float = 0.4, tail: float = 0.4,
+                 max_delay: float = 0.4, smoothing: float = 0.9):
+        """
+        Args:
+            sample_rate: 캡처 샘플링 레이트
+            n_fft: 분석 프레임 길이 (hop은 절반)
+            over_subtraction: 에코 추정치를 이만큼 더 크게 빼서 잔여 에코를 줄임
+            gate_ratio: 차감 후 에너지가 에코 추정치 × 이 값보다 작으면 프레임 전체 감쇠
+            reverb_time: 잔향 시간 RT60 (초) - 재생 후 에코 추정치 감소 속도
+            tail: 재생이 끝난 뒤에도 억제를 유지할 시간 (초)
+            max_delay: 재생 명령 → 마이크 도달까지 최대 지연 (초)
+            smoothing: 에코 경로 추정 지수 평균 계수
+        """
+        self.sample_rate = sample_rate
+        self.n_fft = n_fft
+        self.hop = n_fft // 2
+        self.over_subtraction = over_subtraction
+        self.gate_ratio = gate_ratio
+        self.tail_samples = int(tail * sample_rate)
+        self.max_delay_frames = int(np.ceil(max_delay * sample_rate / self.hop))
+        self.smoothing = smoothing
+        # 배경 잡음 추정: 평활 스펙트럼의 최솟값 추적, 초당 최대 +6dB까지만 상승
+        self.noise_rise = 10.0 ** (6.0 / 20.0 * self.hop / sample_rate)
+        # 프레임(hop)당 잔향 감소율: RT60 동안 60dB
+        self.decay = 10.0 ** (-3.0 * self.hop / (sample_rate * reverb_time)) if reverb_time > 0 else 0.0
+
+        n = np.arange(n_fft)
+        self.window = np.sqrt(0.5 - 0.5 * np.cos(2 * np.pi * n / n_fft)).astype(np.float32)
+
+        self._lock = threading.Lock()
+        self.position = 0          # 지금까지 process()에 들어온 샘플 수
+        self.frames_processed = 0
+        self.frames_gated = 0
+        self.playbacks = 0
+        self.last_delay: Optional[float] = None  # 마지막으로 추정한 지연 (초)
+        self._reset_playback()
+
+    # ------------------------------------------------------------------
+    # 재생 알림 (TTS 쪽에서 호출)
+    # ------------------------------------------------------------------
+
+    def _reset_playback(self):
+        """재생 상태 + 스트리밍 버퍼 초기화 (억제가 완전히 끝났을 때)"""
+        self._playing = False
+        self._has_reference = False
+        self._start = 0               # 재생 시작 위치 (캡처 기준)
+        self._delay_frames: Optional[int] = None
+        self._num = None
+        self._den = None
+        self._echo = np.zeros(self.n_fft // 2 + 1, dtype=np.float32)
+        self._smoothed = None
+        self._noise = None
+        self._in = np.zeros(0, dtype=np.float32)
+        self._out = np.zeros(self.n_fft, dtype=np.float32)
+        self._fifo = np.zeros(0, dtype=np.float32)
+        self._reset_reference()
+
+    def _reset_reference(self):
+        """참조 신호만 초기화 (억제 중에 다음 재생이 이어질 때는 지연/경로/버퍼를 유지)"""
+        self._end: Optional[int] = None
+        self._ref_open = False        # add_reference()로 참조 신호가 더 들어올 예정인지
+        self._ref_pending = np.zeros(0, dtype=np.float32)
+        self._ref_frames = np.zeros((0, self.n_fft // 2 + 1), dtype=np.float32)
+        self._ref_samples = 0
+        self._history = []            # 지연 추정용 원본 캡처 (재생 초반만)
+
+    @property
+    def active(self) -> bool:
+        """에코 억제 / 게이트 동작 중인지 (재생 중 + tail)"""
+        if not self._playing:
+            return False
+        end = self._end
+        if end is None and self._has_reference and not self._ref_open:
+            end = self._start + self._ref_samples + (self._delay_frames or self.max_delay_frames) * self.hop
+        return end is None or self.position < end + self.tail_samples
+
+    def begin(self, reference: Optional[np.ndarray] = None, sample_rate: Optional[int] = None,
+              streaming: bool = False):
+        """
+        재생 시작 알림 (스피커로 소리가 나가기 직전에 호출)
+
+        Args:
+            reference: 재생할 오디오 (int16/float, None이면 반이중 게이트)
+            sample_rate: reference의 샘플링 레이트 (기본: 캡처 레이트)
+            streaming: True면 이후 add_reference()로 참조 신호가 이어서 들어옴
+        """
+        with self._lock:
+            if self.active:
+                self._reset_reference()
+            else:
+                self._reset_playback()
+            self._playing = True
+            self._start = self.position
+            self._ref_open = streaming
+            self._has_reference = reference is not None or streaming
+            self.playbacks += 1
+        if reference is not None:
+            self.add_reference(reference, sample_rate)
+
+    def add_reference(self, chunk: np.ndarray, sample_rate: Optional[int] = None):
+        """재생 중인 오디오 조각 추가 (스트리밍 재생용, 재생 순서대로)"""
+        signal = to_float(chunk)
+        if sample_rate and sample_rate != self.sample_rate and len(signal):
+            from src.perception.audio_prep import UploadPreprocessor
+
+            pcm = np.clip(signal * 32768.0, -32768, 32767).astype(np.int16)
+            signal = UploadPreprocessor.resample(pcm, sample_rate, self.sample_rate).astype(np.float32) / 32768.0
+
+        with self._lock:
+            self._has_reference = True
+            pending = np.concatenate([self._ref_pending, signal])
+            frames = frame_signal(pending, self.n_fft, self.hop)
+            if len(frames):
+                spectra = np.abs(np.fft.rfft(frames * self.window, axis=1)).astype(np.float32)
+                self._ref_frames = np.concatenate([self._ref_frames, spectra])
+                pending = pending[len(frames) * self.hop:]
+            self._ref_pending = pending
+            self._ref_samples += len(signal)
+
+    def end(self):
+        """재생 종료 알림 (재생이 실제로 끝난 뒤 호출) - 이후 tail 동안 억제 유지"""
+        with self._lock:
+            if self._playing:
+                self._end = self.position
+                self._ref_open = False
+
+    # ------------------------------------------------------------------
+    # 캡처 처리 (오디오 콜백에서 호출)
+    # ------------------------------------------------------------------
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """
+        캡처 블록 처리
+
+        Args:
+            block: int16 (frames,) 또는 (frames, channels)
+
+        Returns:
+            np.ndarray: 같은 모양의 int16 블록 (재생 중이 아니면 입력 그대로)
+        """
+        with self._lock:
+            n = len(block)
+            if not self.active:
+                if self._playing:
+                    self._reset_playback()
+                self.position += n
+                return block
+
+            mono = to_float(block)
+            if self._delay_frames is None and self._has_reference:
+                self._history.append(mono)
+                self._estimate_delay()
+
+            if self._noise is None and len(self._fifo) == 0:
+                # 동작 시작: WOLA 지연만큼 원본 앞부분으로 채움 (재생 소리가 마이크에 닿기 전 구간)
+                self._fifo = mono[:self.n_fft].copy()
+
+            self._in = np.concatenate([self._in, mono])
+            frames = frame_signal(self._in, self.n_fft, self.hop)
+            if len(frames):
+                first = self.position - (len(self._in) - n)  # _in[0]의 캡처 위치
+                self._fifo = np.concatenate([self._fifo, self._suppress(frames, first)])
+                self._in = self._in[len(frames) * self.hop:]
+
+            out, self._fifo = self._fifo[:n], self._fifo[n:]
+            self.position += n
+
+        pcm = np.clip(out * 32768.0, -32768, 32767).astype(np.int16)
+        if block.ndim == 2:
+            pcm = np.repeat(pcm[:, None], block.shape[1], axis=1)
+        return pcm
+
+    def _reference_magnitude(self, frame_start: int) -> np.ndarray:
+        """캡처 프레임에 대응하는 참조 스펙트럼 크기 (지연 불확실 범위의 최댓값)"""
+        offset = (frame_start - self._start) / self.hop
+        if self._delay_frames is None:
+            low, high = offset - self.max_delay_frames, offset
+        else:
+            low, high = offset - self._delay_frames - 1, offset - self._delay_frames + 1
+        low, high = max(int(np.floor(low)), 0), min(int(np.ceil(high)), len(self._ref_frames) - 1)
+        if high < low:
+            return np.zeros(self.n_fft // 2 + 1, dtype=np.float32)
+        return self._ref_frames[low:high + 1].max(axis=0)
+
+    def _suppress(self, frames: np.ndarray, first: int) -> np.ndarray:
+        """프레임들의 에코를 빼고 overlap-add 결과(프레임당 hop 샘플) 반환"""
+        spectra = np.fft.rfft(frames * self.window, axis=1)
+        magnitudes = np.abs(spectra)
+        output = np.empty(len(frames) * self.hop, dtype=np.float32)
+
+        for i, (spectrum, magnitude) in enumerate(zip(spectra, magnitudes)):
+            self.frames_processed += 1
+            if self._noise is None:
+                self._smoothed, self._noise = magnitude.copy(), magnitude.copy()
+            else:
+                self._smoothed = 0.8 * self._smoothed + 0.2 * magnitude
+                self._noise = np.minimum(self._noise * self.noise_rise, self._smoothed)
+            comfort = np.minimum(self._noise / (magnitude + 1e-8), 1.0)
+
+            if self._has_reference:
+                reference = self._reference_magnitude(first + i * self.hop)
+                if reference.sum() > 1e-3:
+                    num, den = magnitude * reference, reference * reference
+                    if self._num is None:
+                        self._num, self._den = num, den
+                    else:
+                        self._num = self.smoothing * self._num + (1 - self.smoothing) * num
+                        self._den = self.smoothing * self._den + (1 - self.smoothing) * den
+                path = self._echo_path() if self._num is not None else 0.0
+                # 잔향: 새 에코와 감소 중인 이전 에코 중 큰 쪽
+                self._echo = np.maximum(path * reference, self.decay * self._echo)
+
+                gain = np.maximum(1.0 - self.over_subtraction * self._echo / (magnitude + 1e-8), comfort)
+                residual = np.sum((gain * magnitude) ** 2) - np.sum(self._noise ** 2)
+                if residual < self.gate_ratio * np.sum(self._echo ** 2):
+                    gain = comfort
+                    self.frames_gated += 1
+            else:
+                # 참조 없음: 재생 중에는 통째로 배경 잡음 수준으로
+                gain = comfort
+                self.frames_gated += 1
+
+            frame = np.fft.irfft(gain * spectrum, n=self.n_fft).astype(np.float32) * self.window
+            self._out += frame
+            output[i * self.hop:(i + 1) * self.hop] = self._out[:self.hop]
+            self._out = np.concatenate([self._out[self.hop:], np.zeros(self.hop, dtype=np.float32)])
+
+        return output
+
+    def _echo_path(self) -> np.ndarray:
+        """
+        빈별 에코 경로 크기 |H|
+
+        말 끊기(double talk) 중에는 가까운 목소리가 |Y|에 섞여 그 빈의 |H|가 부풀어 오르므로,
+        참조 에너지가 충분한 빈들의 중앙값의 3배로 제한합니다.
+        """
+        path = self._num / (self._den + 1e-8)
+        strong = self._den >= 0.01 * self._den.max()
+        return np.minimum(path, 3.0 * np.median(path[strong]))
+
+    def _estimate_delay(self):
+        """재생 초반 캡처와 참조 신호의 에너지 포락선 상관으로 지연 추정"""
+        captured = sum(len(chunk) for chunk in self._history)
+        window_frames = int(0.5 * self.sample_rate / self.hop)
+        needed = (window_frames + self.max_delay_frames + 1) * self.hop
+        if captured < needed or len(self._ref_frames) < window_frames:
+            return
+
+        capture = np.concatenate(self._history)[:needed]
+        envelope = np.sqrt(np.mean(frame_signal(capture, self.hop, self.hop) ** 2, axis=1))
+        reference = np.sqrt(np.mean(self._ref_frames[:window_frames] ** 2, axis=1))
+        self._history = []
+
+        if reference.std() < 1e-6 or envelope.std() < 1e-6:
+            self._delay_frames = 0
+            self.last_delay = 0.0
+            return
+
+        envelope = (envelope - envelope.mean()) / envelope.std()
+        reference = (reference - reference.mean()) / reference.std()
+        correlation = np.correlate(envelope, reference, mode="valid")[:self.max_delay_frames + 1]
+        self._delay_frames = int(np.argmax(correlation))
+        self.last_delay = self._delay_frames * self.hop / self.sample_rate
+
+    def summary(self):
+        """누적 통계"""
+        return {
+            "playbacks": self.playbacks,
+            "frames_processed": self.frames_processed,
+            "frames_gated": self.frames_gated,
+            "delay": self.last_delay,
+        }
@@ -0,0 +1,141 @@
+"""
+오디오 특징 추출 모듈
+벡터화된 프레이밍 / 윈도우 / FFT / log-mel / MFCC
+
+모든 연산은 프레임 축으로 한 번에 계산합니다 (프레임별 Python 루프 없음).
+필터뱅크와 DCT 행렬은 설정별로 한 번만 만들어 캐시합니다.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+
+def to_float(audio: np.ndarray) -> np.ndarray:
+    """int16/float 오디오 → [-1, 1] float32 모노"""
+    audio = np.asarray(audio)
+    if audio.dtype == np.int16:
+        # 채널 평균 전에 정규화 ((frames, 1) 콜백 블록도 같은 스케일)
+        audio = audio.astype(np.float32) / 32768.0
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    return audio.astype(np.float32, copy=False)
+
+
+def frame_signal(signal: np.ndarray, frame_length: int, hop_length: int) -> np.ndarray:
+    """
+    신호를 겹치는 프레임으로 분할 (복사 없는 strided view)
+
+    Args:
+        signal: 1차원 신호
+        frame_length: 프레임 길이 (샘플)
+        hop_length: 프레임 간격 (샘플)
+
+    Returns:
+        np.ndarray: (frames, frame_length) - 신호가 짧으면 0개 프레임
+    """
+    if len(signal) < frame_length:
+        return np.zeros((0, frame_length), dtype=signal.dtype)
+    windows = np.lib.stride_tricks.sliding_window_view(signal, frame_length)
+    return windows[::hop_length]
+
+
+@lru_cache(maxsize=8)
+def hann_window(length: int) -> np.ndarray:
+    return np.hanning(length).astype(np.float32)
+
+
+def _hz_to_mel(hz):
+    return 2595.0 * np.log10(1.0 + np.asarray(hz) / 700.0)
+
+
+def _mel_to_hz(mel):
+    return 700.0 * (10.0 ** (np.asarray(mel) / 2595.0) - 1.0)
+
+
+@lru_cache(maxsize=8)
+def mel_filterbank(sample_rate: int, n_fft: int, n_mels: int = 40,
+                   fmin: float = 20.0, fmax: float = None) -> np.ndarray:
+    """
+    삼각 mel 필터뱅크
+
+    Returns:
+        np.ndarray: (n_mels, n_fft // 2 + 1)
+    """
+    fmax = fmax or sample_rate / 2
+    mel_points = np.linspace(_hz_to_mel(fmin), _hz_to_mel(fmax), n_mels + 2)
+    bins = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    hz_points = _mel_to_hz(mel_points)
+
+    lower = hz_points[:-2, None]
+    center = hz_points[1:-1, None]
+    upper = hz_points[2:, None]
+    rising = (bins[None, :] - lower) / (center - lower)
+    falling = (upper - bins[None, :]) / (upper - center)
+    return np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32)
+
+
+@lru_cache(maxsize=8)
+def dct_matrix(n_mfcc: int, n_mels: int) -> np.ndarray:
+    """DCT-II (ortho) 행렬 (n_mfcc, n_mels)"""
+    n = np.arange(n_mels)
+    k = np.arange(n_mfcc)[:, None]
+    basis = np.cos(np.pi / n_mels * (n + 0.5) * k) * np.sqrt(2.0 / n_mels)
+    basis[0] /= np.sqrt(2.0)
+    return basis.astype(np.float32)
+
+
+def power_spectrum(frames: np.ndarray, n_fft: int) -> np.ndarray:
+    """윈도우 적용 후 파워 스펙트럼 (frames, n_fft // 2 + 1)"""
+    windowed = frames * hann_window(frames.shape[1])
+    return (np.abs(np.fft.rfft(windowed, n=n_fft, axis=1)) ** 2).astype(np.float32)
+
+
+def log_mel_spectrogram(audio: np.ndarray, sample_rate: int = 16000, n_fft: int = 512,
+                        win_length: int = 400, hop_length: int = 160, n_mels: int = 40) -> np.ndarray:
+    """
+    log-mel 스펙트로그램
+
+    Args:
+        audio: 오디오 (int16 또는 float)
+        sample_rate: 샘플링 레이트
+        n_fft: FFT 크기
+        win_length: 윈도우 길이 (기본 25ms)
+        hop_length: 프레임 간격 (기본 10ms)
+        n_mels: mel 밴드 수
+
+    Returns:
+        np.ndarray: (frames, n_mels)
+    """
+    frames = frame_signal(to_float(audio), win_length, hop_length)
+    power = power_spectrum(frames, n_fft)
+    mel = power @ mel_filterbank(sample_rate, n_fft, n_mels).T
+    return np.log(mel + 1e-10)
+
+
+def mfcc(audio: np.ndarray, sample_rate: int = 16000, n_mfcc: int = 13, n_mels: int = 40,
+         normalize: bool = True, **kwargs) -> np.ndarray:
+    """
+    MFCC (+ 선택적 켑스트럴 평균 정규화)
+
+    Args:
+        audio: 오디오 (int16 또는 float)
+        sample_rate: 샘플링 레이트
+        n_mfcc: 계수 개수
+        n_mels: mel 밴드 수
+        normalize: 프레임 평균을 빼서 채널/마이크 차이 제거 (CMN)
+
+    Returns:
+        np.ndarray: (frames, n_mfcc)
+    """
+    log_mel = log_mel_spectrogram(audio, sample_rate, n_mels=n_mels, **kwargs)
+    coefficients = log_mel @ dct_matrix(n_mfcc, n_mels).T
+    if normalize and len(coefficients):
+        coefficients = coefficients - coefficients.mean(axis=0, keepdims=True)
+    return coefficients
+
+
+def frame_energy(audio: np.ndarray, frame_length: int = 400, hop_length: int = 160) -> np.ndarray:
+    """프레임별 RMS 에너지 (frames,)"""
+    frames = frame_signal(to_float(audio), frame_length, hop_length)
+    return np.sqrt(np.mean(frames ** 2, axis=1) + 1e-12)
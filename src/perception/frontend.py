@@ -0,0 +1,157 @@
+"""
+스트리밍 오디오 특징 프론트엔드
+블록마다 프레이밍 / 윈도우 / FFT / log-mel / MFCC / 에너지를 한 번만 계산해 여러 소비자에게 나눠 줍니다.
+
+예전에는 같은 블록을 VAD(20ms 프레임 FFT)와 키워드 스포터(창마다 MFCC 전체 재계산)가
+따로 처리했습니다. 프론트엔드는 25ms 창 / 10ms 간격의 한 격자에서 프레임을 딱 한 번 만들고,
+완성된 프레임의 특징(FeatureBlock)을 구독자(VAD, 웨이크워드 스포터, 레벨 미터)에 전달합니다.
+모든 감지기가 같은 프레임 격자와 같은 특징을 보므로 판단 위치도 서로 맞습니다.
+
+사용 예:
+    frontend = FeatureFrontEnd(16000)
+    frontend.subscribe(vad.process_features)
+    frontend.subscribe(spotter_stream.write_features)
+    callback: frontend.process(indata)
+"""
+
+from dataclasses import dataclass
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from src.perception.features import dct_matrix, frame_signal, hann_window, mel_filterbank, power_spectrum, to_float
+
+
+@dataclass
+class FeatureBlock:
+    """한 블록에서 새로 완성된 프레임들의 특징 (프레임 i는 샘플 [i*hop, i*hop + win) 구간)"""
+
+    start_frame: int          # 첫 프레임 번호 (프론트엔드 기준 누적)
+    energy_db: np.ndarray     # (frames,) 전체 에너지 dBFS
+    zcr: np.ndarray           # (frames,) 영교차율
+    band_db: np.ndarray       # (frames,) 음성 대역 에너지 dBFS
+    mfcc: np.ndarray          # (frames, n_mfcc) CMN 없음
+    samples: int              # 이 블록의 입력 샘플 수
+    level_db: float           # 이 블록의 RMS 레벨 dBFS (레벨 미터용)
+
+    @property
+    def frames(self) -> int:
+        return len(self.energy_db)
+
+
+class FeatureFrontEnd:
+    """
+    블록 단위 스트리밍 특징 추출기
+
+    - process(block): 블록 경계에 걸친 프레임은 다음 블록과 이어서 계산 (누락/중복 없음)
+    - extract(audio): 녹음 전체를 같은 격자로 한 번에 계산 (오프라인)
+    """
+
+    def __init__(self, sample_rate: int = 16000, win_length: int = 400, hop_length: int = 160,
+                 n_fft: int = 512, n_mels: int = 40, n_mfcc: int = 13,
+                 band: Tuple[float, float] = (250.0, 3800.0)):
+        """
+        Args:
+            sample_rate: 샘플링 레이트
+            win_length: 프레임 길이 (기본 25ms)
+            hop_length: 프레임 간격 (기본 10ms)
+            n_fft: FFT 크기
+            n_mels: mel 밴드 수
+            n_mfcc: MFCC 계수 개수
+            band: 음성 대역 (Hz) - VAD용 대역 에너지
+        """
+        self.sample_rate = sample_rate
+        self.win_length = win_length
+        self.hop_length = hop_length
+        self.n_fft = n_fft
+        self.n_mfcc = n_mfcc
+
+        freqs = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+        self._band_mask = (freqs >= band[0]) & (freqs <= band[1])
+        self._band_scale = 2.0 / (win_length * float(np.sum(hann_window(win_length) ** 2)))
+        self._mel = mel_filterbank(sample_rate, n_fft, n_mels).T
+        self._dct = dct_matrix(n_mfcc, n_mels).T
+
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._consumers: List[Callable[[FeatureBlock], object]] = []
+        self.frames = 0
+        self.level_db = -120.0
+
+    @property
+    def hop_seconds(self) -> float:
+        return self.hop_length / self.sample_rate
+
+    def subscribe(self, consumer: Callable[[FeatureBlock], object]):
+        """특징 소비자 등록 (process()를 호출한 스레드에서 블록마다 호출)"""
+        self._consumers.append(consumer)
+
+    def reset(self):
+        """블록 경계 상태와 프레임 번호 초기화 (구독자는 유지)"""
+        self._pending = np.zeros(0, dtype=np.float32)
+        self.frames = 0
+
+    def compute(self, frames: np.ndarray):
+        """
+        프레임 → (energy_db, zcr, band_db, mfcc) 벡터화 계산 (FFT는 프레임당 한 번)
+
+        Args:
+            frames: (n, win_length) float 프레임
+        """
+        energy_db = 10.0 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+        signs = np.signbit(frames)
+        zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+
+        power = power_spectrum(frames, self.n_fft)
+        # 음성 대역만 합산 → 전체 에너지와 같은 척도로 환산 (Parseval)
+        band_db = 10.0 * np.log10(power[:, self._band_mask].sum(axis=1) * self._band_scale + 1e-10)
+        mfcc = np.log(power @ self._mel + 1e-10) @ self._dct
+        return energy_db, zcr, band_db, mfcc
+
+    def _block(self, signal: np.ndarray, samples: int) -> FeatureBlock:
+        frames = frame_signal(signal, self.win_length, self.hop_length)
+        if len(frames):
+            energy_db, zcr, band_db, mfcc = self.compute(frames)
+        else:
+            energy_db = zcr = band_db = np.zeros(0, dtype=np.float32)
+            mfcc = np.zeros((0, self.n_mfcc), dtype=np.float32)
+        return FeatureBlock(
+            start_frame=self.frames,
+            energy_db=energy_db,
+            zcr=zcr,
+            band_db=band_db,
+            mfcc=mfcc,
+            samples=samples,
+            level_db=self.level_db,
+        )
+
+    def process(self, block: np.ndarray) -> FeatureBlock:
+        """
+        블록 하나 처리 후 구독자에게 전달
+
+        Args:
+            block: int16/float 오디오 (frames,) 또는 (frames, channels)
+
+        Returns:
+            FeatureBlock: 이번 블록에서 완성된 프레임들
+        """
+        signal = to_float(block)
+        if len(signal):
+            self.level_db = float(10.0 * np.log10(np.mean(signal ** 2) + 1e-10))
+
+        buffered = np.concatenate([self._pending, signal]) if len(self._pending) else signal
+        features = self._block(buffered, len(signal))
+        self._pending = buffered[features.frames * self.hop_length:].copy()
+        self.frames += features.frames
+
+        for consumer in self._consumers:
+            consumer(features)
+        return features
+
+    def extract(self, audio: np.ndarray) -> FeatureBlock:
+        """녹음 전체 특징 (스트리밍 상태와 무관, 구독자에게 전달하지 않음)"""
+        signal = to_float(audio)
+        features = self._block(signal, len(signal))
+        features.start_frame = 0
+        if len(signal):
+            features.level_db = float(10.0 * np.log10(np.mean(signal ** 2) + 1e-10))
+        return features
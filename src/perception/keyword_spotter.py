@@ -0,0 +1,368 @@
+"""
+온디바이스 키워드 스포터
+MFCC + 부분구간(subsequence) DTW 템플릿 매칭
+
+웨이크워드("Jarvis", "Atreides")를 몇 번 녹음해 등록(enroll)해 두면,
+오디오 구간에 웨이크워드가 있는지 클라우드 음성 인식 없이 로컬에서 판단합니다.
+DTW는 반대각선(anti-diagonal) 단위로 벡터화되어 CPU 코어 하나로 실시간 처리됩니다.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.perception.audio_io import decode_wav
+from src.perception.features import frame_energy, mfcc, to_float
+from src.perception.frontend import FeatureBlock, FeatureFrontEnd
+from src.perception.ring_buffer import AudioRingBuffer
+
+
+HOP_SECONDS = 0.01  # MFCC 프레임 간격 (10ms)
+
+
+@dataclass
+class SpotResult:
+    """키워드 스포팅 결과"""
+
+    word: Optional[str]
+    cost: float  # 템플릿 프레임당 평균 코사인 거리 (낮을수록 유사)
+    detected: bool
+    end_frame: int = -1  # 최적 정렬이 끝난 프레임 (창 기준)
+
+
+def _normalize_rows(features: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(features, axis=1, keepdims=True)
+    return features / np.maximum(norms, 1e-8)
+
+
+def subsequence_dtw(template: np.ndarray, query: np.ndarray) -> Tuple[float, int]:
+    """
+    부분구간 DTW: query 안의 어느 위치에서든 template과 가장 잘 맞는 정렬 비용
+
+    Args:
+        template: (n, d) L2 정규화된 특징
+        query: (m, d) L2 정규화된 특징
+
+    Returns:
+        (template 프레임당 평균 비용, 정렬이 끝난 query 프레임)
+    """
+    n, m = len(template), len(query)
+    if n == 0 or m == 0:
+        return float("inf"), -1
+
+    # 코사인 거리 행렬 한 번에 계산
+    cost = 1.0 - template @ query.T
+    acc = np.full((n, m), np.inf, dtype=np.float64)
+
+    # 반대각선 k = i + j 단위로 갱신 (같은 대각선의 셀은 서로 독립)
+    for k in range(n + m - 1):
+        i = np.arange(max(0, k - m + 1), min(n - 1, k) + 1)
+        j = k - i
+
+        best = np.full(len(i), np.inf)
+        top = i > 0
+        left = j > 0
+        diag = top & left
+
+        best[top] = acc[i[top] - 1, j[top]]
+        best[left] = np.minimum(best[left], acc[i[left], j[left] - 1])
+        best[diag] = np.minimum(best[diag], acc[i[diag] - 1, j[diag] - 1])
+        # 첫 템플릿 프레임은 query의 어디서든 시작 가능
+        best[i == 0] = 0.0
+
+        acc[i, j] = cost[i, j] + best
+
+    end = int(np.argmin(acc[-1]))
+    return float(acc[-1, end] / n), end
+
+
+class KeywordSpotter:
+    """
+    템플릿 기반 키워드 스포터
+
+    사용 예:
+        spotter = KeywordSpotter()
+        spotter.enroll_file("jarvis", "wake/jarvis_1.wav")
+        spotter.enroll_file("jarvis", "wake/jarvis_2.wav")
+        result = spotter.score(audio)
+    """
+
+    def __init__(self, sample_rate: int = 16000, threshold: float = 0.35, min_rms: float = 0.005):
+        """
+        Args:
+            sample_rate: 샘플링 레이트
+            threshold: 감지 임계값 (프레임당 평균 코사인 거리)
+            min_rms: 이보다 조용한 구간은 매칭하지 않음 (float 기준 RMS)
+        """
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.min_rms = min_rms
+        self.templates: Dict[str, List[np.ndarray]] = {}
+
+    # ------------------------------------------------------------------
+    # 등록
+    # ------------------------------------------------------------------
+
+    def features(self, audio: np.ndarray) -> np.ndarray:
+        """
+        오디오 → 정규화된 MFCC (frames, 12)
+
+        c0(에너지)는 버려 음량 차이에 둔감하게 하고, 창마다 평균이 달라지는
+        CMN은 쓰지 않습니다 (창에 섞인 무음이 템플릿과의 거리를 바꾸지 않도록).
+        """
+        return self.normalize_mfcc(mfcc(audio, self.sample_rate, normalize=False))
+
+    @staticmethod
+    def normalize_mfcc(coefficients: np.ndarray) -> np.ndarray:
+        """CMN 없는 MFCC (frames, 13) → 매칭용 특징 (c0 제외, 프레임별 L2 정규화)"""
+        return _normalize_rows(coefficients[:, 1:])
+
+    def _trim(self, audio: np.ndarray) -> np.ndarray:
+        """등록 녹음의 앞뒤 무음 제거 (에너지 기준)"""
+        signal = to_float(audio)
+        energy = frame_energy(signal)
+        if len(energy) == 0:
+            return signal
+
+        active = np.flatnonzero(energy > max(self.min_rms, energy.max() * 0.1))
+        if len(active) == 0:
+            return signal
+        hop = int(HOP_SECONDS * self.sample_rate)
+        start = max(active[0] * hop - hop * 5, 0)
+        end = min((active[-1] + 1) * hop + 400 + hop * 5, len(signal))
+        return signal[start:end]
+
+    def enroll(self, word: str, audio: np.ndarray):
+        """
+        웨이크워드 샘플 등록
+
+        Args:
+            word: 웨이크워드 이름
+            audio: 웨이크워드 하나만 녹음된 오디오
+        """
+        template = self.features(self._trim(audio))
+        if len(template) < 10:
+            raise ValueError("등록 오디오가 너무 짧습니다 (0.1초 이상 필요)")
+        self.templates.setdefault(word, []).append(template)
+
+    def enroll_file(self, word: str, path: str):
+        """WAV 파일로 웨이크워드 등록"""
+        audio, sample_rate = decode_wav(path)
+        if sample_rate != self.sample_rate:
+            raise ValueError(f"샘플링 레이트 불일치: {sample_rate} (필요: {self.sample_rate})")
+        self.enroll(word, audio)
+
+    def calibrate(self, margin: float = 1.3) -> float:
+        """
+        같은 단어 템플릿끼리의 거리로 임계값 자동 설정
+
+        Args:
+            margin: 최대 템플릿 간 거리에 곱할 여유 배수
+
+        Returns:
+            float: 새 임계값 (템플릿이 단어당 2개 미만이면 기존 값 유지)
+        """
+        distances = []
+        for templates in self.templates.values():
+            for a in range(len(templates)):
+                for b in range(len(templates)):
+                    if a != b:
+                        distances.append(subsequence_dtw(templates[a], templates[b])[0])
+        if distances:
+            self.threshold = float(max(distances) * margin)
+        return self.threshold
+
+    @property
+    def max_template_seconds(self) -> float:
+        """가장 긴 템플릿 길이 (초)"""
+        lengths = [len(t) for ts in self.templates.values() for t in ts]
+        return max(lengths, default=0) * HOP_SECONDS
+
+    # ------------------------------------------------------------------
+    # 감지
+    # ------------------------------------------------------------------
+
+    def score_features(self, query: np.ndarray) -> SpotResult:
+        """미리 계산된 (정규화된) MFCC로 점수 계산"""
+        best = SpotResult(word=None, cost=float("inf"), detected=False)
+        for word, templates in self.templates.items():
+            for template in templates:
+                cost, end = subsequence_dtw(template, query)
+                if cost < best.cost:
+                    best = SpotResult(word=word, cost=cost, detected=False, end_frame=end)
+
+        best.detected = best.cost <= self.threshold
+        return best
+
+    def score(self, audio: np.ndarray) -> SpotResult:
+        """
+        오디오 구간에 웨이크워드가 있는지 점수 계산
+
+        Args:
+            audio: int16 또는 float 오디오
+
+        Returns:
+            SpotResult: 가장 잘 맞는 단어와 비용
+        """
+        if not self.templates:
+            raise RuntimeError("등록된 웨이크워드가 없습니다 (enroll 먼저 호출)")
+
+        signal = to_float(audio)
+        if len(signal) == 0 or np.sqrt(np.mean(signal ** 2)) < self.min_rms:
+            return SpotResult(word=None, cost=float("inf"), detected=False)
+
+        return self.score_features(self.features(signal))
+
+    def detect(self, audio: np.ndarray) -> Optional[str]:
+        """웨이크워드가 있으면 단어 이름, 없으면 None"""
+        result = self.score(audio)
+        return result.word if result.detected else None
+
+    # ------------------------------------------------------------------
+    # 저장
+    # ------------------------------------------------------------------
+
+    def save(self, path: str):
+        """템플릿을 .npz 파일로 저장"""
+        arrays = {}
+        for word, templates in self.templates.items():
+            for i, template in enumerate(templates):
+                arrays[f"{word}::{i}"] = template
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez(path, threshold=np.array(self.threshold), **arrays)
+
+    @classmethod
+    def load(cls, path: str, sample_rate: int = 16000) -> "KeywordSpotter":
+        """저장된 템플릿 로드"""
+        spotter = cls(sample_rate=sample_rate)
+        with np.load(path) as data:
+            for key in data.files:
+                if key == "threshold":
+                    spotter.threshold = float(data[key])
+                else:
+                    word = key.rsplit("::", 1)[0]
+                    spotter.templates.setdefault(word, []).append(data[key])
+        return spotter
+
+
+class SlidingWindowSpotter:
+    """
+    연속 오디오 위의 겹치는 창(sliding window) 웨이크워드 감지
+
+    오디오 블록을 write()로 넣으면 프레임 특징(MFCC)이 한 번만 계산되어 특징 링 버퍼에 쌓이고,
+    poll()이 hop 간격마다 최근 window초의 특징을 점수 매깁니다 (겹치는 창끼리 MFCC를 다시 계산하지 않음).
+    캡처는 멈추지 않으므로 창 경계나 점수 계산 중에 말한 단어도 놓치지 않습니다.
+
+    사용 예:
+        stream = SlidingWindowSpotter(spotter, hop=0.2)
+        callback: stream.write(indata)
+        loop:     result = stream.poll()
+
+    공유 프론트엔드를 쓸 때는 write() 대신 frontend.subscribe(stream.write_features)
+    """
+
+    def __init__(self, spotter: KeywordSpotter, window: Optional[float] = None,
+                 hop: float = 0.2, cooldown: float = 1.0, threshold: Optional[float] = None,
+                 frontend: Optional[FeatureFrontEnd] = None):
+        """
+        Args:
+            spotter: 등록된 KeywordSpotter
+            window: 창 길이 (초, 기본: 가장 긴 템플릿 + 0.5초)
+            hop: 창 간격 (초) - 작을수록 빨리 감지하지만 CPU를 더 씀
+            cooldown: 감지 후 같은 발화를 다시 감지하지 않을 시간 (초)
+            threshold: 감지 임계값 (기본: spotter.threshold)
+            frontend: write()에 쓸 특징 프론트엔드 (기본: 새로 생성, 공유하면 reset()이 초기화하지 않음)
+        """
+        self.spotter = spotter
+        self.threshold = threshold if threshold is not None else spotter.threshold
+        self.sample_rate = spotter.sample_rate
+        self.window = window or spotter.max_template_seconds + 0.5
+        self.hop = hop
+
+        self.window_samples = int(self.window * self.sample_rate)
+        self.hop_samples = max(int(hop * self.sample_rate), 1)
+        self.cooldown_samples = int(cooldown * self.sample_rate)
+
+        self._own_frontend = frontend is None
+        self.frontend = frontend if frontend is not None else FeatureFrontEnd(self.sample_rate)
+        frame_hop = self.frontend.hop_length
+        self.window_frames = max((self.window_samples - self.frontend.win_length) // frame_hop + 1, 1)
+        capacity = self.window_frames + 4 * self.sample_rate // frame_hop
+        self.features = AudioRingBuffer(capacity, channels=self.frontend.n_mfcc - 1, dtype=np.float32)
+        self.power = AudioRingBuffer(capacity, dtype=np.float32)
+        self.written = 0  # 지금까지 받은 샘플 수
+
+        self._next_hop = self.hop_samples
+        self._suppress_until = 0
+        self.windows_scored = 0
+
+    def write(self, block: np.ndarray):
+        """오디오 블록 추가 (오디오 콜백에서 호출)"""
+        self.write_features(self.frontend.process(block))
+
+    def write_features(self, features: FeatureBlock):
+        """프론트엔드가 계산한 특징 추가 (공유 프론트엔드 구독자)"""
+        if features.frames:
+            self.features.write(self.spotter.normalize_mfcc(features.mfcc).astype(np.float32))
+            self.power.write((10.0 ** (features.energy_db / 10.0)).astype(np.float32))
+        self.written += features.samples
+
+    def poll(self) -> Optional[SpotResult]:
+        """
+        밀린 hop이 있으면 최근 창 하나를 점수 매김
+
+        처리가 밀리면 중간 창은 건너뛰고 가장 최근 창만 봅니다
+        (창이 hop보다 훨씬 길어 인접 창끼리 대부분 겹침).
+
+        Returns:
+            SpotResult 또는 None (이번 호출에서 감지 없음)
+        """
+        written = self.written
+        if written < self._next_hop:
+            return None
+        self._next_hop = written - written % self.hop_samples + self.hop_samples
+
+        frames = min(self.window_frames, self.features.written)
+        if written < self._suppress_until or frames == 0:
+            return None
+
+        self.windows_scored += 1
+        # 조용한 창은 매칭하지 않음 (KeywordSpotter.score와 같은 기준)
+        if np.sqrt(self.power.latest(frames).mean()) < self.spotter.min_rms:
+            return None
+        result = self.spotter.score_features(self.features.latest(frames))
+        result.detected = result.cost <= self.threshold
+        if not result.detected:
+            return None
+
+        self._suppress_until = written + self.cooldown_samples
+        return result
+
+    def process(self, audio: np.ndarray) -> List[Tuple[float, SpotResult]]:
+        """
+        녹음 전체를 hop 단위로 흘려 보내며 감지 (오프라인 평가용)
+
+        Returns:
+            [(감지 시각(초), SpotResult), ...]
+        """
+        detections = []
+        for start in range(0, len(audio), self.hop_samples):
+            self.write(audio[start:start + self.hop_samples])
+            result = self.poll()
+            if result is not None:
+                detections.append((self.written / self.sample_rate, result))
+        return detections
+
+    def reset(self):
+        """버퍼와 감지 상태 초기화"""
+        self.features.clear()
+        self.power.clear()
+        if self._own_frontend:
+            self.frontend.reset()
+        self.written = 0
+        self._next_hop = self.hop_samples
+        self._suppress_until = 0
@@ -0,0 +1,232 @@
+"""
+저전력 대기 모듈
+조용할 때는 아주 가벼운 에너지 검사만 하고, 소리가 나면 웨이크워드 감지(스포터/VAD/음성 인식)를 깨웁니다.
+
+배터리로 움직이는 카트에서 웨이크워드 루프는 조용한 방에서도 계속 창을 점수 매기고
+(음성 인식 경로는 몇 초마다 깨어나) CPU를 씁니다.
+- idle: 블록(0.1초)마다 몇 샘플 간격으로 건너뛴 RMS 한 번 + 적응형 바닥 비교
+        감지기 콜백은 호출되지 않고, 감지 루프는 Event에서 잠들어 있음
+- active: 모든 블록을 감지기에 전달. 소리가 hold초 동안 없으면 다시 idle
+- idle → active 전환 시 캡처 링 버퍼의 최근 pre_roll초를 먼저 전달하므로
+  웨이크워드 첫 음절을 잃지 않고, 감지 지연도 거의 늘지 않습니다.
+
+모드별 경과 시간과 CPU 시간(프로세스 전체, time.process_time)을 집계합니다.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.perception.audio_device import AudioCallback
+from src.perception.vad import MIN_SPEECH_DB
+
+
+IDLE = "idle"
+ACTIVE = "active"
+
+
+class EnergyActivityDetector:
+    """
+    블록 단위 에너지 검사 (idle 모드용)
+
+    FFT 없이 stride 간격으로 뽑은 샘플의 RMS만 계산하고,
+    천천히 따라가는 배경 소음 바닥보다 margin_db 이상 크면 활동으로 봅니다.
+    """
+
+    def __init__(self, margin_db: float = 6.0, stride: int = 4, min_db: float = MIN_SPEECH_DB,
+                 floor_up: float = 0.05, floor_down: float = 0.5):
+        """
+        Args:
+            margin_db: 배경 소음보다 이만큼 크면 활동
+            stride: 이 간격으로 샘플을 건너뛰며 RMS 계산 (1이면 전체)
+            min_db: 활동으로 볼 절대 최소 레벨 (dBFS)
+            floor_up: 더 시끄러워질 때 바닥이 따라가는 비율 (블록당)
+            floor_down: 더 조용해질 때 바닥이 따라가는 비율 (블록당)
+        """
+        self.margin_db = margin_db
+        self.stride = stride
+        self.min_db = min_db
+        self.floor_up = floor_up
+        self.floor_down = floor_down
+        self.floor_db: Optional[float] = None
+        self.level_db = -120.0
+
+    def process(self, block: np.ndarray) -> bool:
+        """
+        블록 하나 검사
+
+        Args:
+            block: int16 (frames,) 또는 (frames, channels)
+
+        Returns:
+            bool: 활동 여부
+        """
+        samples = np.asarray(block).reshape(-1)[::self.stride].astype(np.float32)
+        power = float(np.dot(samples, samples)) / max(len(samples), 1)
+        self.level_db = level = 10.0 * np.log10(max(power, 1e-4) / (32768.0 ** 2))
+
+        if self.floor_db is None:
+            self.floor_db = level
+            return False
+
+        active = level > max(self.floor_db + self.margin_db, self.min_db)
+        # 활동 중에는 바닥을 올리지 않음 (긴 발화가 배경 소음으로 흡수되지 않도록)
+        if level < self.floor_db:
+            self.floor_db += self.floor_down * (level - self.floor_db)
+        elif not active:
+            self.floor_db += self.floor_up * (level - self.floor_db)
+        return active
+
+
+class ModeUsage:
+    """모드별 경과 시간 / CPU 시간 집계"""
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {IDLE: 0.0, ACTIVE: 0.0}
+        self.cpu_seconds: Dict[str, float] = {IDLE: 0.0, ACTIVE: 0.0}
+        self.mode: Optional[str] = None
+        self._since = 0.0
+        self._cpu_since = 0.0
+        self._lock = threading.Lock()
+
+    def switch(self, mode: Optional[str]):
+        """모드 전환 (None이면 집계 중지)"""
+        with self._lock:
+            now, cpu = time.perf_counter(), time.process_time()
+            if self.mode is not None:
+                self.seconds[self.mode] += now - self._since
+                self.cpu_seconds[self.mode] += cpu - self._cpu_since
+            self.mode, self._since, self._cpu_since = mode, now, cpu
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """모드별 {seconds, cpu_seconds, cpu_percent} (진행 중인 구간 포함)"""
+        self.switch(self.mode)
+        return {
+            mode: {
+                "seconds": round(self.seconds[mode], 3),
+                "cpu_seconds": round(self.cpu_seconds[mode], 3),
+                "cpu_percent": round(100.0 * self.cpu_seconds[mode] / self.seconds[mode], 1)
+                if self.seconds[mode] else 0.0,
+            }
+            for mode in (IDLE, ACTIVE)
+        }
+
+
+class LowPowerListener:
+    """
+    공유 캡처 서비스 위의 듀티 사이클 구독
+
+    capture.listen(callback) 대신 사용하면 idle 동안 callback이 호출되지 않습니다.
+
+    사용 예:
+        low_power = LowPowerListener(capture)
+        with low_power.listen(cascade_callback):
+            while ...:
+                low_power.wait_active(1.0)   # idle이면 여기서 잠듦
+                decision = cascade.step()
+    """
+
+    def __init__(self, capture, hold: float = 1.5, pre_roll: float = 1.0,
+                 detector: Optional[EnergyActivityDetector] = None):
+        """
+        Args:
+            capture: AudioCaptureService
+            hold: 마지막 활동 후 active를 유지할 시간 (초)
+            pre_roll: idle → active 전환 시 먼저 전달할 과거 오디오 (초)
+            detector: idle 모드 에너지 검사기 (기본: 새로 생성)
+        """
+        self.capture = capture
+        self.hold_samples = int(hold * capture.sample_rate)
+        self.pre_roll_samples = int(pre_roll * capture.sample_rate)
+        self.detector = detector if detector is not None else EnergyActivityDetector()
+        self.usage = ModeUsage()
+
+        self.mode = ACTIVE
+        self.escalations = 0
+        self.blocks_skipped = 0
+        self.blocks_forwarded = 0
+        self._callback: Optional[AudioCallback] = None
+        self._active = threading.Event()
+        self._last_activity = 0
+        self._forwarded_until = 0
+
+    @property
+    def active(self) -> bool:
+        return self.mode == ACTIVE
+
+    def _switch(self, mode: str):
+        self.mode = mode
+        self.usage.switch(mode)
+        if mode == ACTIVE:
+            self._active.set()
+        else:
+            self._active.clear()
+
+    def touch(self):
+        """active 유지 시간 연장 (웨이크워드 후보 확인 중 등)"""
+        self._last_activity = self.capture.position
+
+    def wait_active(self, timeout: Optional[float] = None) -> bool:
+        """active가 될 때까지 대기 (감지 루프가 idle 동안 잠들 수 있게)"""
+        return self._active.wait(timeout)
+
+    @contextmanager
+    def listen(self, callback: AudioCallback):
+        """
+        with 블록 동안 듀티 사이클 구독 (active로 시작, 조용하면 hold초 뒤 idle)
+
+        Args:
+            callback: callback(indata, frames, time_info, status) - active 동안만 호출
+        """
+        self._callback = callback
+        self._last_activity = self._forwarded_until = self.capture.position
+        self._switch(ACTIVE)
+        try:
+            with self.capture.listen(self._on_block):
+                yield self
+        finally:
+            self._callback = None
+            self.usage.switch(None)
+            self._active.set()  # 남은 대기를 깨움
+
+    def _on_block(self, indata, frames, time_info, status):
+        """오디오 스레드: 에너지 검사 → idle이면 건너뜀, active면 전달"""
+        callback = self._callback
+        if callback is None:
+            return
+
+        position = self.capture.position
+        if self.detector.process(indata):
+            self._last_activity = position
+
+        if self.mode == IDLE:
+            if self._last_activity != position:
+                self.blocks_skipped += 1
+                return
+
+            # 깨어남: 놓친 최근 오디오부터 (현재 블록 포함) 한 번에 전달
+            self.escalations += 1
+            self._switch(ACTIVE)
+            ring = self.capture.ring
+            start = max(position - self.pre_roll_samples, self._forwarded_until, ring.oldest)
+            indata = ring.read(start, position, copy=True)
+            frames = len(indata)
+
+        callback(indata, frames, time_info, status)
+        self.blocks_forwarded += 1
+        self._forwarded_until = position
+
+        if position - self._last_activity > self.hold_samples:
+            self._switch(IDLE)
+
+    def summary(self) -> Dict[str, object]:
+        """모드별 시간/CPU + 전환 횟수"""
+        return {
+            **self.usage.summary(),
+            "escalations": self.escalations,
+            "blocks_skipped": self.blocks_skipped,
+            "blocks_forwarded": self.blocks_forwarded,
+        }
@@ -1,53 +1,96 @@
 """
 실시간 마이크 입력 모듈
-sounddevice를 사용한 실시간 음성 녹음
+sounddevice(또는 가상 입력 장치)를 사용한 실시간 음성 녹음
 """
 
-import sounddevice as sd
 import numpy as np
 from scipy.io.wavfile import write
 import tempfile
 import time
 
+from src.perception.audio_device import SoundDeviceInput
+from src.perception.audio_io import encode_wav
+from src.perception.ring_buffer import AudioRingBuffer
+from src.perception.vad import VoiceActivityDetector
+
 
 class MicrophoneRecorder:
     """
     실시간 마이크 녹음 클래스
     """
 
-    def __init__(self, sample_rate=16000, channels=1):
+    def __init__(self, sample_rate=16000, channels=1, capture=None, device=None):
         """
         Args:
             sample_rate: 샘플링 레이트 (Hz)
             channels: 채널 수 (1: 모노, 2: 스테레오)
+            capture: 공유 AudioCaptureService (있으면 스트림을 새로 열지 않음)
+            device: 입력 장치 (기본: 실제 마이크, capture가 있으면 capture의 장치)
         """
+        self.capture = capture
+        if capture is not None:
+            sample_rate, channels = capture.sample_rate, capture.channels
+            device = capture.device
+        self.device = device if device is not None else SoundDeviceInput()
         self.sample_rate = sample_rate
         self.channels = channels
         self.recording = []
+        self._ring = None  # 녹음용 링 버퍼 (필요한 크기로 한 번만 할당 후 재사용)
+        self.vad = VoiceActivityDetector(sample_rate)  # 노이즈 플로어는 녹음 사이에도 유지
+
+    def _get_ring(self, seconds: float) -> AudioRingBuffer:
+        """seconds초를 담을 수 있는 링 버퍼 반환 (부족할 때만 새로 할당)"""
+        capacity = int(seconds * self.sample_rate)
+        if self._ring is None or self._ring.capacity < capacity or self._ring.channels != self.channels:
+            self._ring = AudioRingBuffer(capacity, self.channels)
+        self._ring.clear()
+        return self._ring
 
     def list_devices(self):
         """사용 가능한 오디오 장치 목록"""
         print("=" * 60)
         print("사용 가능한 오디오 장치:")
         print("=" * 60)
-        print(sd.query_devices())
+        print(self.device.query_devices())
         print("=" * 60)
 
     def record(self, duration=5.0) -> str:
         """
         음성 녹음 및 WAV 파일로 저장
 
+        파일이 꼭 필요한 경우에만 사용하세요. 음성 인식에는 record_audio()로 받은 버퍼를
+        SpeechRecognizer.transcribe_audio()에 바로 넘기면 임시 파일이 남지 않습니다.
+
+        Args:
+            duration: 녹음 시간 (초)
+
+        Returns:
+            str: 임시 WAV 파일 경로 (호출자가 삭제해야 함)
+        """
+        return self._save_temp_wav(self.record_audio(duration))
+
+    def record_audio(self, duration=5.0, start=None, pre_roll=0.0) -> np.ndarray:
+        """
+        음성 녹음 (메모리)
+
         Args:
             duration: 녹음 시간 (초)
+            start: 캡처 서비스 기준 시작 위치 (capture 사용 시에만)
+            pre_roll: start보다 앞서 포함할 시간 (초, capture 사용 시에만)
 
         Returns:
-            str: 임시 WAV 파일 경로
+            np.ndarray: int16 오디오 (samples, channels)
         """
         print(f"\n🎤 Recording for {duration} seconds...")
         print("(Speak now!)")
 
+        if self.capture is not None:
+            audio_data = self.capture.record(duration, start=start, pre_roll=pre_roll)
+            print(f"✓ Recording complete!")
+            return audio_data
+
         # Record
-        audio_data = sd.rec(
+        audio_data = self.device.rec(
             int(duration * self.sample_rate),
             samplerate=self.sample_rate,
             channels=self.channels,
@@ -55,106 +98,174 @@ class MicrophoneRecorder:
         )
 
         # Progress indicator
-        for i in range(int(duration)):
-            time.sleep(1)
-            print(f"  {i+1}s...", end="\r")
+        if self.device.realtime:
+            for i in range(int(duration)):
+                time.sleep(1)
+                print(f"  {i+1}s...", end="\r")
 
-        sd.wait()  # Wait for recording to complete
+        self.device.wait()  # Wait for recording to complete
         print(f"\n✓ Recording complete!")
 
-        # 임시 파일로 저장
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-        write(temp_file.name, self.sample_rate, audio_data)
-
-        return temp_file.name
+        return audio_data
 
-    def record_until_silence(self, max_duration=10.0, silence_threshold=500, silence_duration=1.5):
+    def record_bytes(self, duration=5.0) -> bytes:
         """
-        소리가 멈출 때까지 녹음 (고급 기능)
+        음성 녹음 후 메모리에서 WAV 바이트로 인코딩
 
         Args:
-            max_duration: 최대 녹음 시간 (초)
-            silence_threshold: 침묵 판단 임계값
-            silence_duration: 침묵 지속 시간 (초)
+            duration: 녹음 시간 (초)
 
         Returns:
-            str: 임시 WAV 파일 경로
+            bytes: WAV 바이트
         """
-        print(f"\n🎤 녹음 시작 (침묵 감지 모드)")
-        print("(말씀하세요. 말이 끝나면 자동으로 멈춥니다)")
-
-        recording = []
-        silence_frames = 0
-        silence_threshold_frames = int(silence_duration * self.sample_rate / 1024)
+        return encode_wav(self.record_audio(duration), self.sample_rate)
 
-        def callback(indata, frames, time_info, status):
-            nonlocal silence_frames
-            recording.append(indata.copy())
+    def _save_temp_wav(self, audio_data: np.ndarray) -> str:
+        """오디오를 임시 WAV 파일로 저장 (파일 경로가 필요한 호출자용)"""
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
+            write(temp_file.name, self.sample_rate, audio_data)
+        return temp_file.name
 
-            # 볼륨 레벨 확인
-            volume = np.abs(indata).mean()
+    def stream_until_silence(self, consumer, max_duration=10.0, silence_duration=1.0, start_timeout=5.0,
+                             start=None, pre_roll=0.0) -> int:
+        """
+        말이 끝날 때까지 녹음하면서 블록을 바로 consumer에 전달 (스트리밍 음성 인식용)
 
-            if volume < silence_threshold:
-                silence_frames += 1
-            else:
-                silence_frames = 0
+        Args:
+            consumer: consumer(block) - 예: StreamingRecognizer.feed
+            max_duration: 최대 녹음 시간 (초)
+            silence_duration: 발화 후 침묵 지속 시간 (초)
+            start_timeout: 이 시간 안에 말을 시작하지 않으면 종료 (초)
+            start: 공유 캡처 서비스의 시작 위치 (기본: 현재 위치)
+            pre_roll: start보다 앞서 포함할 시간 (초)
 
-        # 스트리밍 녹음
-        with sd.InputStream(
-            samplerate=self.sample_rate,
-            channels=self.channels,
-            callback=callback,
-            dtype='int16',
-            blocksize=1024
-        ):
-            start_time = time.time()
+        Returns:
+            int: 전달한 샘플 수
+        """
+        vad = self.vad
+        vad.reset()
+        delivered = 0
+
+        def deliver(block):
+            nonlocal delivered
+            consumer(block)
+            vad.process(block)
+            delivered += len(block)
+
+        def done(elapsed):
+            if vad.endpoint(silence_duration):
+                return True
+            return not vad.speech_started and elapsed >= start_timeout
+
+        start_time = time.time()
+
+        if self.capture is not None:
+            # 캡처 서비스 링 버퍼를 위치 기준으로 따라가며 읽음 (pre-roll 포함, 누락/중복 없음)
+            capture = self.capture
+            capture.start()
+            position = capture.position if start is None else start
+            position = max(position - int(pre_roll * self.sample_rate), capture.ring.oldest)
             while time.time() - start_time < max_duration:
-                time.sleep(0.1)
-
-                # 침묵이 지속되면 종료
-                if silence_frames > silence_threshold_frames and len(recording) > 10:
-                    print("\n✓ 침묵 감지, 녹음 종료")
+                block, position = capture.ring.read_since(position, copy=True)
+                if len(block):
+                    deliver(block)
+                if done(time.time() - start_time):
                     break
+                time.sleep(0.05)
+            return delivered
 
-        print(f"✓ 녹음 완료! ({len(recording)} 프레임)")
-
-        # 오디오 데이터 결합
-        if recording:
-            audio_data = np.concatenate(recording, axis=0)
-
-            # 임시 파일로 저장
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-            write(temp_file.name, self.sample_rate, audio_data)
+        def callback(indata, frames, time_info, status):
+            deliver(indata.copy())
 
-            return temp_file.name
-        else:
-            raise Exception("녹음된 데이터가 없습니다")
+        with self.device.input_stream(samplerate=self.sample_rate, channels=self.channels,
+                                      callback=callback, dtype='int16', blocksize=1024):
+            while time.time() - start_time < max_duration:
+                time.sleep(0.05)
+                if done(time.time() - start_time):
+                    break
+        return delivered
 
+    def record_until_silence(self, max_duration=10.0, *, silence_duration=1.5, start_timeout=5.0):
+        """
+        소리가 멈출 때까지 녹음 (고급 기능)
 
-class VoiceActivityDetector:
-    """
-    음성 활동 감지 (VAD)
-    간단한 볼륨 기반 감지
-    """
+        예전 두 번째 위치 인자(silence_threshold)와 헷갈리지 않도록 옵션은 키워드로만 받습니다.
 
-    def __init__(self, sample_rate=16000, threshold=500):
-        """
         Args:
-            sample_rate: 샘플링 레이트
-            threshold: 음성 감지 임계값
+            max_duration: 최대 녹음 시간 (초)
+            silence_duration: 발화 후 침묵 지속 시간 (초)
+            start_timeout: 이 시간 안에 말을 시작하지 않으면 종료 (초)
+
+        Returns:
+            str: 임시 WAV 파일 경로 (호출자가 삭제해야 함)
         """
-        self.sample_rate = sample_rate
-        self.threshold = threshold
+        return self._save_temp_wav(
+            self.record_until_silence_audio(max_duration, silence_duration=silence_duration,
+                                            start_timeout=start_timeout)
+        )
 
-    def is_speech(self, audio_data):
+    def record_until_silence_audio(self, max_duration=10.0, *, silence_duration=1.5,
+                                   start_timeout=5.0) -> np.ndarray:
         """
-        오디오 데이터에 음성이 포함되어 있는지 확인
+        소리가 멈출 때까지 녹음 (메모리)
+
+        고정 볼륨 임계값 대신 적응형 VAD로 발화 끝을 찾으므로
+        선풍기/에어컨 소음이 있어도 말이 끝나면 바로 멈춥니다.
 
         Args:
-            audio_data: numpy array
+            max_duration: 최대 녹음 시간 (초)
+            silence_duration: 발화 후 침묵 지속 시간 (초)
+            start_timeout: 이 시간 안에 말을 시작하지 않으면 종료 (초)
 
         Returns:
-            bool: 음성 포함 여부
+            np.ndarray: int16 오디오 (samples, channels)
         """
-        volume = np.abs(audio_data).mean()
-        return volume > self.threshold
+        print(f"\n🎤 녹음 시작 (침묵 감지 모드)")
+        print("(말씀하세요. 말이 끝나면 자동으로 멈춥니다)")
+
+        blocksize = self.capture.blocksize if self.capture is not None else 1024
+        poll_interval = 0.1
+        # 최대 녹음 시간 + 확인 간격 + 여유 블록 두 개만큼 미리 할당 (콜백에서 할당 없음)
+        ring = self._get_ring(max_duration + poll_interval + 2 * blocksize / self.sample_rate)
+        vad = self.vad
+        vad.reset()
+
+        def callback(indata, frames, time_info, status):
+            # 버퍼가 차면 더 쓰지 않음 (덮어쓰면 발화 앞부분이 사라짐)
+            room = ring.capacity - ring.written
+            if room > 0:
+                ring.write(indata[:room])
+            vad.process(indata)
+
+        # 스트리밍 녹음 (공유 캡처 서비스가 있으면 구독만 함)
+        if self.capture is not None:
+            stream = self.capture.listen(callback)
+        else:
+            stream = self.device.input_stream(
+                samplerate=self.sample_rate,
+                channels=self.channels,
+                callback=callback,
+                dtype='int16',
+                blocksize=blocksize
+            )
+
+        with stream:
+            start_time = time.time()
+            while time.time() - start_time < max_duration:
+                time.sleep(poll_interval)
+
+                # 발화 후 침묵이 지속되면 종료
+                if vad.endpoint(silence_duration):
+                    print("\n✓ 침묵 감지, 녹음 종료")
+                    break
+
+                if not vad.speech_started and time.time() - start_time >= start_timeout:
+                    print("\n✓ 음성 없음, 녹음 종료")
+                    break
+
+        print(f"✓ 녹음 완료! ({ring.written // blocksize} 프레임)")
+
+        if ring.written:
+            return ring.latest(ring.written, copy=True)
+        else:
+            raise Exception("녹음된 데이터가 없습니다")
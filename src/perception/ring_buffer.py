@@ -0,0 +1,153 @@
+"""
+오디오 링 버퍼 모듈
+미리 할당된 고정 크기 int16 링 버퍼 (오디오 콜백 전용 단일 writer)
+
+오디오 콜백에서 리스트에 indata.copy()를 쌓고 나중에 np.concatenate 하면
+블록마다 메모리 할당이 생기고 스트림이 열려 있는 동안 계속 커집니다.
+이 버퍼는 처음에 한 번만 할당하고, 콜백은 미리 잡아둔 영역에 복사만 합니다.
+
+내부적으로 데이터를 두 번 저장(미러링)하므로 최근 N개 샘플은 항상
+연속된 메모리 구간이며, 복사 없이 뷰(view)로 읽을 수 있습니다.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    고정 크기 오디오 링 버퍼
+
+    - writer: 오디오 콜백 하나 (write)
+    - readers: 락 없이 latest / read / read_since 사용
+      (written 카운터는 데이터 복사가 끝난 뒤에 갱신됨)
+
+    반환되는 뷰는 writer가 capacity 샘플을 더 쓰기 전까지만 유효합니다.
+    오래 보관하려면 copy=True를 사용하세요.
+    """
+
+    def __init__(self, capacity: int, channels: int = 1, dtype=np.int16):
+        """
+        Args:
+            capacity: 보관할 샘플(프레임) 수
+            channels: 채널 수
+            dtype: 샘플 타입
+        """
+        if capacity <= 0:
+            raise ValueError("capacity는 0보다 커야 합니다")
+
+        self.capacity = capacity
+        self.channels = channels
+        self._data = np.zeros((2 * capacity, channels), dtype=dtype)
+        self.written = 0  # 지금까지 쓴 총 샘플 수 (단조 증가)
+
+    @classmethod
+    def for_duration(cls, seconds: float, sample_rate: int = 16000, channels: int = 1) -> "AudioRingBuffer":
+        """초 단위 용량으로 생성"""
+        return cls(int(seconds * sample_rate), channels)
+
+    def write(self, block: np.ndarray):
+        """
+        블록 쓰기 (오디오 콜백에서 호출, 메모리 할당 없음)
+
+        Args:
+            block: (frames, channels) 또는 (frames,) 배열
+        """
+        if block.ndim == 1:
+            block = block.reshape(-1, 1)
+
+        n = len(block)
+        if n >= self.capacity:
+            block = block[-self.capacity:]
+            start = self.written + n - self.capacity
+            n = self.capacity
+        else:
+            start = self.written
+
+        cap = self.capacity
+        pos = start % cap
+        first = min(n, cap - pos)
+
+        # 원본 구간과 미러 구간에 모두 기록
+        self._data[pos:pos + first] = block[:first]
+        self._data[pos + cap:pos + cap + first] = block[:first]
+        if first < n:
+            rest = n - first
+            self._data[:rest] = block[first:]
+            self._data[cap:cap + rest] = block[first:]
+
+        self.written = start + n
+
+    @property
+    def available(self) -> int:
+        """현재 읽을 수 있는 샘플 수"""
+        return min(self.written, self.capacity)
+
+    @property
+    def oldest(self) -> int:
+        """버퍼에 남아 있는 가장 오래된 샘플의 절대 위치"""
+        return self.written - self.available
+
+    def read(self, start: int, end: Optional[int] = None, copy: bool = False) -> np.ndarray:
+        """
+        절대 위치 [start, end) 구간 읽기
+
+        Args:
+            start: 시작 위치 (written 기준 절대 샘플 번호)
+            end: 끝 위치 (기본: 현재 written)
+            copy: True면 복사본 반환
+
+        Returns:
+            np.ndarray: (samples, channels) 뷰 또는 복사본
+
+        Raises:
+            ValueError: 이미 덮어써진 구간을 요청한 경우
+        """
+        written = self.written
+        end = written if end is None else min(end, written)
+        if start < written - self.capacity:
+            raise ValueError(f"덮어써진 구간입니다 (start={start}, oldest={written - self.capacity})")
+        if end <= start:
+            return self._data[:0].copy() if copy else self._data[:0]
+
+        # 미러링 덕분에 (end-1) 위치를 뒤쪽 사본에 두면 [start, end)는 항상 연속 구간
+        end_index = (end - 1) % self.capacity + self.capacity + 1
+        view = self._data[end_index - (end - start):end_index]
+        return view.copy() if copy else view
+
+    def latest(self, n: int, copy: bool = False) -> np.ndarray:
+        """
+        최근 n개 샘플 (복사 없는 뷰)
+
+        Args:
+            n: 샘플 수 (available보다 크면 available로 제한)
+            copy: True면 복사본 반환
+        """
+        written = self.written
+        n = min(n, written, self.capacity)
+        return self.read(written - n, written, copy=copy)
+
+    def latest_seconds(self, seconds: float, sample_rate: int = 16000, copy: bool = False) -> np.ndarray:
+        """최근 seconds초 오디오"""
+        return self.latest(int(seconds * sample_rate), copy=copy)
+
+    def read_since(self, position: int, copy: bool = True) -> Tuple[np.ndarray, int]:
+        """
+        position 이후에 쓰인 샘플 읽기 (스트리밍 소비자용)
+
+        덮어써진 부분은 건너뛰고 남아 있는 구간부터 반환합니다.
+
+        Args:
+            position: 마지막으로 읽은 위치
+
+        Returns:
+            (samples, 새 position)
+        """
+        written = self.written
+        start = max(position, written - self.capacity)
+        return self.read(start, written, copy=copy), written
+
+    def clear(self):
+        """버퍼 비우기 (writer가 멈춘 상태에서만 호출)"""
+        self.written = 0
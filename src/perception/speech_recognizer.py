@@ -1,13 +1,44 @@
 """
 Speech Recognition Module
-음성 인식 모듈 - OpenAI Whisper API 사용
+음성 인식 모듈 - OpenAI Whisper API (기본) 또는 로컬 백엔드 사용
 """
 
 import io
+import os
+import time
 import wave
-from typing import Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Optional, Tuple, Union
+import numpy as np
 from openai import OpenAI
 
+from src.perception.audio_io import decode_wav, encode_wav
+from src.perception.audio_prep import PreparedAudio, UploadPreprocessor
+from src.perception.streaming_stt import ChunkedStreamingAdapter
+from src.perception.stt_backends import OpenAIWhisperBackend, STTBackend
+from src.perception.stt_cache import TranscriptionCache
+
+
+# transcribe_many()가 받는 항목: 파일 경로 | 인코딩된 바이트(WAV) | int16 버퍼 | (버퍼, 샘플링 레이트)
+AudioSource = Union[str, os.PathLike, bytes, np.ndarray, Tuple[np.ndarray, int]]
+
+
+@dataclass
+class TranscriptionResult:
+    """transcribe_many() 항목별 결과"""
+
+    index: int                # 입력 순서
+    source: str               # 파일 경로 또는 항목 종류
+    text: Optional[str]       # 인식 결과 (실패 시 None)
+    error: Optional[str]      # 실패 사유
+    seconds: float            # 이 항목 처리 시간 (대기 제외)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
 
 class SpeechRecognizer:
     """
@@ -15,14 +46,36 @@ class SpeechRecognizer:
     마이크 입력 또는 오디오 파일을 받아 텍스트로 변환
     """
 
-    def __init__(self, api_key: str, model: str = "whisper-1"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "whisper-1",
+                 preprocessor: Optional[UploadPreprocessor] = None, backend: Optional[STTBackend] = None,
+                 cache: Optional[TranscriptionCache] = None, cache_audio: bool = False):
         """
         Args:
-            api_key: OpenAI API 키
+            api_key: OpenAI API 키 (backend를 주면 사용 안 함)
             model: Whisper 모델 (기본: whisper-1)
+            preprocessor: 업로드 전처리기 (무음 제거 + 압축, 없으면 원본 그대로 업로드)
+            backend: 인식 엔진 (기본: OpenAI Whisper API, stt_backends.create_backend 참고)
+            cache: 인식 결과 캐시 (같은 오디오는 다시 인식하지 않음, 없으면 캐시 안 함)
+            cache_audio: transcribe_audio()의 버퍼도 캐시 (실시간 마이크 입력은 다시 나오지 않으므로
+                기본은 파일/바이트 입력만 캐시)
         """
-        self.client = OpenAI(api_key=api_key)
+        if backend is None:
+            backend = OpenAIWhisperBackend(OpenAI(api_key=api_key), model)
+        self.backend = backend
         self.model = model
+        self.preprocessor = preprocessor
+        self.cache = cache
+        self.cache_audio = cache_audio
+        self.last_upload: Optional[PreparedAudio] = None
+
+    @property
+    def client(self):
+        """OpenAI 클라이언트 (OpenAI 백엔드일 때만)"""
+        return getattr(self.backend, "client", None)
+
+    @client.setter
+    def client(self, client):
+        self.backend.client = client
 
     def transcribe_file(self, audio_file_path: str, language: str = "en") -> str:
         """
@@ -37,16 +90,13 @@ class SpeechRecognizer:
         """
         try:
             with open(audio_file_path, "rb") as audio_file:
-                transcript = self.client.audio.transcriptions.create(
-                    model=self.model,
-                    file=audio_file,
-                    language=language,
-                    response_format="text"
-                )
-            return transcript.strip()
-        except Exception as e:
+                data = audio_file.read()
+        except OSError as e:
             raise Exception(f"음성 인식 실패: {str(e)}")
 
+        extension = os.path.splitext(audio_file_path)[1].lstrip(".").lower() or "wav"
+        return self._cached(data, language, lambda: self._transcribe_encoded(data, extension, language))
+
     def transcribe_bytes(self, audio_data: bytes, format: str = "wav", language: str = "en") -> str:
         """
         바이트 데이터를 텍스트로 변환
@@ -59,18 +109,150 @@ class SpeechRecognizer:
         Returns:
             str: 변환된 텍스트
         """
+        return self._cached(audio_data, language, lambda: self._upload(audio_data, format, language))
+
+    def transcribe_audio(self, audio: np.ndarray, sample_rate: int = 16000, language: str = "en") -> str:
+        """
+        NumPy 오디오 버퍼를 텍스트로 변환 (메모리에서 WAV 인코딩, 임시 파일 없음)
+
+        로컬 백엔드는 인코딩 없이 버퍼를 그대로 받습니다 (무음 제거만 적용).
+
+        Args:
+            audio: int16 오디오 배열 (samples,) 또는 (samples, channels)
+            sample_rate: 샘플링 레이트 (Hz)
+            language: 언어 코드
+
+        Returns:
+            str: 변환된 텍스트
+        """
+        def transcribe():
+            if self.backend.accepts_arrays:
+                return self._transcribe_array(audio, sample_rate, language)
+            if self.preprocessor is not None:
+                return self._transcribe_prepared(self.preprocessor.prepare(audio, sample_rate), language)
+            return self._upload(encode_wav(audio, sample_rate), "wav", language)
+
+        if self.cache is None or not self.cache_audio:
+            return transcribe()
+        buffer = np.ascontiguousarray(audio)
+        header = f"{sample_rate}:{buffer.dtype.str}:{buffer.shape}".encode("ascii")
+        return self._cached(header + buffer.tobytes(), language, transcribe)
+
+    def transcribe_many(self, sources: Iterable[AudioSource], language: str = "en", max_workers: int = 4,
+                        sample_rate: int = 16000) -> List[TranscriptionResult]:
+        """
+        여러 오디오를 동시에 인식 (입력 순서대로 반환)
+
+        요청은 대부분 네트워크 대기이므로 스레드 풀로 겹쳐 보냅니다. 동시에 진행하는
+        요청은 max_workers개, 미리 꺼내 두는 입력은 그 두 배까지로 제한합니다.
+        한 항목이 실패해도 나머지는 계속 처리하고 결과에 오류를 기록합니다.
+
+        Args:
+            sources: 파일 경로 / WAV 바이트 / int16 버퍼 / (버퍼, 샘플링 레이트)
+            language: 언어 코드
+            max_workers: 동시에 진행할 인식 요청 수
+            sample_rate: 버퍼 항목의 기본 샘플링 레이트
+
+        Returns:
+            List[TranscriptionResult]: 입력 순서대로
+        """
+        def run(index: int, source: AudioSource) -> TranscriptionResult:
+            started = time.perf_counter()
+            text, error = None, None
+            is_path = isinstance(source, (str, os.PathLike))
+            is_bytes = isinstance(source, (bytes, bytearray))
+            label = os.fspath(source) if is_path else "<bytes>" if is_bytes else "<audio>"
+            try:
+                if is_path:
+                    text = self.transcribe_file(label, language=language)
+                elif is_bytes:
+                    text = self.transcribe_bytes(bytes(source), language=language)
+                elif isinstance(source, tuple):
+                    text = self.transcribe_audio(source[0], source[1], language=language)
+                else:
+                    text = self.transcribe_audio(source, sample_rate, language=language)
+            except Exception as e:
+                error = str(e)
+            return TranscriptionResult(index, label, text, error, time.perf_counter() - started)
+
+        results: List[TranscriptionResult] = []
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stt-batch") as executor:
+            pending = deque()
+            for index, source in enumerate(sources):
+                if len(pending) >= 2 * max_workers:
+                    results.append(pending.popleft().result())
+                pending.append(executor.submit(run, index, source))
+            while pending:
+                results.append(pending.popleft().result())
+        return results
+
+    def stream(self, sample_rate: int = 16000, language: str = "en", **kwargs) -> ChunkedStreamingAdapter:
+        """
+        스트리밍 인식기 생성 (말하는 동안 겹치는 구간을 미리 인식)
+
+        Args:
+            sample_rate: 샘플링 레이트 (Hz)
+            language: 언어 코드
+            **kwargs: ChunkedStreamingAdapter 옵션 (segment, overlap, partial_interval, on_transcript 등)
+
+        Returns:
+            ChunkedStreamingAdapter: feed()로 블록을 넣고 finish()로 최종 결과를 받음
+        """
+        return ChunkedStreamingAdapter(self, sample_rate=sample_rate, language=language, **kwargs)
+
+    def _cached(self, audio: bytes, language: str, transcribe: Callable[[], str]) -> str:
+        """캐시에 있으면 반환, 없으면 인식 후 저장 (실패는 저장하지 않음)"""
+        if self.cache is None:
+            return transcribe()
+
+        # 전처리 설정(무음 제거, 코덱 등)이 바뀌면 결과도 달라질 수 있으므로 키에 포함
+        model_id = self.backend.model_id
+        if self.preprocessor is not None:
+            model_id = f"{model_id}|{self.preprocessor.cache_id}"
+        key = self.cache.key(audio, model_id, language)
+        text = self.cache.get(key)
+        if text is None:
+            text = transcribe()
+            self.cache.put(key, text, model=model_id, language=language)
+        return text
+
+    def _transcribe_encoded(self, data: bytes, format: str, language: str) -> str:
+        """인코딩된 파일 내용 인식 (WAV는 전처리 / 로컬 백엔드 경로 사용)"""
+        if format == "wav" and (self.backend.accepts_arrays or self.preprocessor is not None):
+            try:
+                audio, sample_rate = decode_wav(data)
+            except (ValueError, EOFError, wave.Error):
+                # 16-bit PCM이 아닌 WAV(24-bit, float 등)는 전처리 없이 원본 그대로
+                return self._upload(data, format, language)
+            if self.backend.accepts_arrays:
+                return self._transcribe_array(audio, sample_rate, language)
+            return self._transcribe_prepared(self.preprocessor.prepare(audio, sample_rate), language)
+        return self._upload(data, format, language)
+
+    def _upload(self, data: bytes, format: str, language: str) -> str:
+        """바이트를 파일처럼 백엔드에 전달"""
         try:
             # 바이트 데이터를 파일처럼 다루기
-            audio_file = io.BytesIO(audio_data)
+            audio_file = io.BytesIO(data)
             audio_file.name = f"audio.{format}"
+            return self.backend.transcribe(audio_file, language=language)
+        except Exception as e:
+            raise Exception(f"음성 인식 실패: {str(e)}")
+
+    def _transcribe_prepared(self, prepared: PreparedAudio, language: str) -> str:
+        """전처리된 오디오 업로드"""
+        self.last_upload = prepared
+        return self._upload(prepared.data, prepared.format, language)
 
-            transcript = self.client.audio.transcriptions.create(
-                model=self.model,
-                file=audio_file,
-                language=language,
-                response_format="text"
-            )
-            return transcript.strip()
+    def _transcribe_array(self, audio: np.ndarray, sample_rate: int, language: str) -> str:
+        """버퍼를 그대로 로컬 백엔드에 전달"""
+        audio = np.asarray(audio)
+        if audio.ndim == 2:
+            audio = audio.mean(axis=1)
+        if self.preprocessor is not None and self.preprocessor.trim:
+            audio = self.preprocessor.trim_silence(audio, sample_rate)
+        try:
+            return self.backend.transcribe_array(audio, sample_rate, language=language)
         except Exception as e:
             raise Exception(f"음성 인식 실패: {str(e)}")
 
@@ -129,12 +311,13 @@ class VoiceCommandListener:
     음성 입력을 받아 텍스트로 변환하고 Brain에 전달
     """
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, cache: Optional[TranscriptionCache] = None):
         """
         Args:
             api_key: OpenAI API 키
+            cache: 인식 결과 캐시 (같은 파일을 다시 재생하면 음성 인식 생략)
         """
-        self.recognizer = SpeechRecognizer(api_key=api_key)
+        self.recognizer = SpeechRecognizer(api_key=api_key, cache=cache)
         self.recorder = AudioRecorder()
 
     def listen_from_file(self, audio_file_path: str) -> str:
@@ -152,6 +335,25 @@ class VoiceCommandListener:
         print(f"📝 인식 결과: {text}")
         return text
 
+    def listen_from_files(self, audio_file_paths: Iterable[str], max_workers: int = 4) -> List[TranscriptionResult]:
+        """
+        여러 오디오 파일에서 명령을 동시에 추출
+
+        Args:
+            audio_file_paths: 오디오 파일 경로들
+            max_workers: 동시에 진행할 인식 요청 수
+
+        Returns:
+            List[TranscriptionResult]: 입력 순서대로 (실패 항목은 error 포함)
+        """
+        results = self.recognizer.transcribe_many(audio_file_paths, max_workers=max_workers)
+        for result in results:
+            if result.ok:
+                print(f"📝 {result.source} ({result.seconds:.2f}s): {result.text}")
+            else:
+                print(f"✗ {result.source}: {result.error}")
+        return results
+
     def listen_from_microphone(self, duration: float = 5.0) -> str:
         """
         마이크에서 음성 녹음 및 인식
@@ -0,0 +1,315 @@
+"""
+스트리밍 음성 인식 모듈
+녹음되는 대로 오디오 블록을 받아 중간(partial) / 최종(final) 인식 결과를 냅니다.
+
+지금까지는 말이 끝난 뒤에 녹음 전체를 올려 인식했기 때문에
+인식 시간이 발화 길이만큼 뒤로 밀렸습니다. 여기서는 말하는 동안
+겹치는 구간을 백그라운드에서 미리 인식해 두고, 말이 끝나면 마지막 구간만 인식합니다.
+
+- StreamingRecognizer: 인터페이스 (feed / finish / stream)
+- ChunkedStreamingAdapter: 전체 파일만 받는 백엔드(Whisper API 등)를 스트리밍으로 감싸는 어댑터
+- ToneVocabularyBackend: 네트워크 없이 동작하는 로컬 대역 백엔드 (테스트용)
+"""
+
+import re
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from src.perception.features import frame_signal, to_float
+from src.perception.ring_buffer import AudioRingBuffer
+
+
+@dataclass
+class Transcript:
+    """스트리밍 인식 결과"""
+
+    text: str
+    is_final: bool
+    audio_seconds: float  # 이 결과가 반영한 오디오 길이 (초)
+
+
+def merge_words(committed: List[str], new: Sequence[str], max_overlap: int = 8) -> List[str]:
+    """
+    겹치는 구간에서 중복 인식된 단어를 제거하고 이어 붙임
+
+    committed의 끝과 new의 앞이 (대소문자/구두점 무시) 가장 길게 겹치는 만큼 new에서 버립니다.
+
+    Args:
+        committed: 이미 확정된 단어들
+        new: 다음 구간의 단어들
+        max_overlap: 비교할 최대 단어 수
+
+    Returns:
+        List[str]: 합쳐진 단어 목록 (새 리스트)
+    """
+    def norm(word):
+        return re.sub(r"[^\w']", "", word.lower())
+
+    tail = [norm(w) for w in committed[-max_overlap:]]
+    head = [norm(w) for w in new[:max_overlap]]
+    for k in range(min(len(tail), len(head)), 0, -1):
+        if tail[-k:] == head[:k]:
+            return committed + list(new[k:])
+    return committed + list(new)
+
+
+class StreamingRecognizer(ABC):
+    """
+    스트리밍 음성 인식 인터페이스
+
+    사용 예:
+        for transcript in recognizer.stream(blocks):
+            print(transcript.text, transcript.is_final)
+    """
+
+    @abstractmethod
+    def feed(self, block: np.ndarray) -> List[Transcript]:
+        """
+        오디오 블록 추가 (녹음 콜백에서 호출 가능, 막히지 않음)
+
+        Returns:
+            List[Transcript]: 그 사이 준비된 중간 결과
+        """
+
+    @abstractmethod
+    def finish(self) -> List[Transcript]:
+        """
+        입력 종료: 남은 오디오를 인식하고 최종 결과까지 반환 (마지막 항목이 is_final)
+
+        Raises:
+            Exception: 일부 구간을 인식하지 못한 경우 (잘린 명령을 최종 결과로 내지 않음)
+        """
+
+    @abstractmethod
+    def reset(self):
+        """새 발화를 위해 상태 초기화"""
+
+    def stream(self, blocks: Iterable[np.ndarray]) -> Iterator[Transcript]:
+        """블록 이터러블을 흘려 보내며 결과를 차례로 반환"""
+        for block in blocks:
+            yield from self.feed(block)
+        yield from self.finish()
+
+
+class ChunkedStreamingAdapter(StreamingRecognizer):
+    """
+    배치 백엔드용 스트리밍 어댑터
+
+    오디오를 segment초 구간으로 나누고 앞 구간과 overlap초 겹치게 잘라 인식합니다.
+    - 구간이 찰 때마다 그 구간을 백그라운드에서 인식해 확정 (겹친 단어는 merge_words로 제거)
+    - partial_interval을 주면 그 간격마다 아직 덜 찬 현재 구간을 인식해 중간 결과 제공
+      (겹친 오디오를 다시 올리므로 기본은 끔 - 표시용일 뿐 최종 지연은 줄지 않음)
+    - finish()에서는 마지막 구간만 인식하면 되므로 발화가 끝난 뒤 지연이 짧음
+      (구간이 짧은 명령보다 길면 말하는 동안 확정되는 구간이 없으므로 기본 구간은 2초)
+    - 확정 구간 인식이 하나라도 실패하면 finish()가 그 예외를 다시 냄 (중간 결과 실패는 무시)
+
+    backend는 transcribe_audio(audio, sample_rate, language) -> str 만 있으면 됩니다
+    (SpeechRecognizer, 로컬 백엔드 등).
+    """
+
+    def __init__(
+        self,
+        backend,
+        sample_rate: int = 16000,
+        language: str = "en",
+        segment: float = 2.0,
+        overlap: float = 0.5,
+        partial_interval: Optional[float] = None,
+        max_seconds: float = 60.0,
+        on_transcript: Optional[Callable[[Transcript], None]] = None,
+        max_workers: int = 2,
+    ):
+        """
+        Args:
+            backend: transcribe_audio()를 가진 배치 인식기
+            sample_rate: 샘플링 레이트
+            language: 언어 코드
+            segment: 구간 길이 (초)
+            overlap: 앞 구간과 겹치는 길이 (초, 경계에서 잘린 단어를 다시 인식)
+            partial_interval: 중간 결과 간격 (초, None이면 중간 결과 없음)
+            max_seconds: 한 발화의 최대 길이 (링 버퍼 크기)
+            on_transcript: 결과가 나올 때마다 호출할 콜백 (선택)
+            max_workers: 동시에 진행할 인식 요청 수
+        """
+        if overlap >= segment:
+            raise ValueError("overlap은 segment보다 짧아야 합니다")
+
+        self.backend = backend
+        self.sample_rate = sample_rate
+        self.language = language
+        self.segment_samples = int(segment * sample_rate)
+        self.overlap_samples = int(overlap * sample_rate)
+        self.partial_samples = int(partial_interval * sample_rate) if partial_interval else None
+        self.on_transcript = on_transcript
+
+        self.ring = AudioRingBuffer(int(max_seconds * sample_rate))
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stt-stream")
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.ring.clear()
+            self._segment_start = 0
+            self._next_partial = self.partial_samples or 0
+            self._partial_in_flight = False
+            self._pending: List[Dict] = []  # 제출 순서대로 (kind, future, end)
+            self._committed: List[str] = []
+            self._committed_end = 0
+            self._error: Optional[Exception] = None  # 처음 실패한 확정 구간의 예외
+
+    # ------------------------------------------------------------------
+    # 요청
+    # ------------------------------------------------------------------
+
+    def _submit(self, kind: str, start: int, end: int):
+        """[start, end) 구간 인식 요청 (self._lock 보유 상태에서 호출)"""
+        audio = self.ring.read(max(start, self.ring.oldest), end, copy=True)
+        future: Future = self._executor.submit(
+            self.backend.transcribe_audio, audio, self.sample_rate, language=self.language
+        )
+        self._pending.append({"kind": kind, "future": future, "end": end})
+        self.requests += 1
+        if kind == "partial":
+            self._partial_in_flight = True
+
+    def _collect(self, wait: bool = False) -> List[Transcript]:
+        """완료된 요청을 제출 순서대로 반영 (self._lock 보유 상태에서 호출)"""
+        results = []
+        while self._pending and (wait or self._pending[0]["future"].done()):
+            item = self._pending.pop(0)
+            try:
+                words = item["future"].result().split()
+            except Exception as e:
+                print(f"\n⚠ 스트리밍 인식 실패: {e}")
+                if item["kind"] == "segment" and self._error is None:
+                    self._error = e
+                words = []
+
+            if item["kind"] == "segment":
+                self._committed = merge_words(self._committed, words)
+                self._committed_end = item["end"]
+                text = " ".join(self._committed)
+            else:
+                self._partial_in_flight = False
+                # 이미 더 뒤까지 확정됐으면 오래된 중간 결과는 버림
+                if item["end"] <= self._committed_end:
+                    continue
+                text = " ".join(merge_words(self._committed, words))
+
+            transcript = Transcript(text=text, is_final=False, audio_seconds=item["end"] / self.sample_rate)
+            results.append(transcript)
+            if self.on_transcript is not None:
+                self.on_transcript(transcript)
+        return results
+
+    # ------------------------------------------------------------------
+    # 인터페이스
+    # ------------------------------------------------------------------
+
+    def feed(self, block: np.ndarray) -> List[Transcript]:
+        with self._lock:
+            self.ring.write(block)
+            written = self.ring.written
+
+            # 다 찬 구간은 확정 요청, 다음 구간은 overlap만큼 앞에서 시작
+            while written - self._segment_start >= self.segment_samples:
+                end = self._segment_start + self.segment_samples
+                self._submit("segment", self._segment_start, end)
+                self._segment_start = end - self.overlap_samples
+
+            # 중간 결과 (한 번에 하나만 진행)
+            if (self.partial_samples and not self._partial_in_flight
+                    and written >= self._next_partial and written > self._segment_start):
+                self._submit("partial", self._segment_start, written)
+                self._next_partial = written + self.partial_samples
+
+            return self._collect()
+
+    def finish(self) -> List[Transcript]:
+        with self._lock:
+            written = self.ring.written
+            # 앞 구간과 겹친 부분 말고 새 오디오가 남아 있으면 마지막 구간 인식
+            already_heard = self._segment_start + (self.overlap_samples if self._segment_start else 0)
+            if written > already_heard:
+                self._submit("segment", self._segment_start, written)
+
+            results = self._collect(wait=True)
+            if self._error is not None:
+                # 빠진 구간이 있는 텍스트는 최종 결과가 아님 (명령 일부만 실행되지 않도록)
+                raise self._error
+            final = Transcript(text=" ".join(self._committed), is_final=True,
+                               audio_seconds=written / self.sample_rate)
+            results.append(final)
+            if self.on_transcript is not None:
+                self.on_transcript(final)
+            return results
+
+    def close(self):
+        """백그라운드 스레드 종료"""
+        self._executor.shutdown(wait=False)
+
+
+class ToneVocabularyBackend:
+    """
+    로컬 대역 인식기 (네트워크 없음, 테스트/데모용)
+
+    각 단어를 고유한 주파수의 톤으로 표현한 합성 오디오를 "인식"합니다.
+    20ms 프레임마다 가장 강한 주파수를 찾아 어휘의 가장 가까운 톤에 대응시키고,
+    min_duration 이상 이어진 톤만 단어로 냅니다.
+    """
+
+    def __init__(self, vocabulary: Dict[str, float], min_duration: float = 0.08, min_rms: float = 0.02):
+        """
+        Args:
+            vocabulary: 단어 → 톤 주파수 (Hz)
+            min_duration: 단어로 인정할 최소 톤 길이 (초)
+            min_rms: 이보다 조용한 프레임은 무음
+        """
+        self.words = list(vocabulary)
+        self.freqs = np.array([vocabulary[w] for w in self.words])
+        self.min_duration = min_duration
+        self.min_rms = min_rms
+        self.calls = 0
+
+    def synthesize(self, text: str, sample_rate: int = 16000, word_seconds: float = 0.25,
+                   gap_seconds: float = 0.05, amplitude: int = 8000) -> np.ndarray:
+        """텍스트 → 단어별 톤 오디오 (int16)"""
+        pieces = []
+        gap = np.zeros(int(gap_seconds * sample_rate))
+        t = np.arange(int(word_seconds * sample_rate)) / sample_rate
+        for word in text.split():
+            freq = self.freqs[self.words.index(word)]
+            pieces += [amplitude * np.sin(2 * np.pi * freq * t), gap]
+        return np.concatenate(pieces).astype(np.int16) if pieces else np.zeros(0, dtype=np.int16)
+
+    def transcribe_audio(self, audio: np.ndarray, sample_rate: int = 16000, language: str = "en") -> str:
+        self.calls += 1
+        frame_length = int(0.02 * sample_rate)
+        frames = frame_signal(to_float(audio), frame_length, frame_length)
+        if len(frames) == 0:
+            return ""
+
+        spectrum = np.abs(np.fft.rfft(frames, axis=1))
+        peak = np.fft.rfftfreq(frame_length, 1.0 / sample_rate)[spectrum.argmax(axis=1)]
+        rms = np.sqrt(np.mean(frames ** 2, axis=1))
+        labels = np.abs(peak[:, None] - self.freqs[None, :]).argmin(axis=1)
+        labels[rms < self.min_rms] = -1
+
+        # 같은 라벨이 이어지는 구간 → 단어
+        min_frames = max(int(self.min_duration * sample_rate / frame_length), 1)
+        words, run_label, run_length = [], -1, 0
+        for label in list(labels) + [-1]:
+            if label == run_label:
+                run_length += 1
+                continue
+            if run_label >= 0 and run_length >= min_frames:
+                words.append(self.words[run_label])
+            run_label, run_length = label, 1
+        return " ".join(words)
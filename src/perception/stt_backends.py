@@ -0,0 +1,169 @@
+"""
+음성 인식 백엔드 모듈
+SpeechRecognizer가 실제 인식을 맡기는 엔진
+
+- OpenAIWhisperBackend: OpenAI Whisper API (네트워크 필요, 기본값)
+- FasterWhisperBackend: faster-whisper 로컬 CPU 추론 (오프라인, 양자화 모델을 한 번만 로드)
+
+설정: config/settings.py의 stt_backend ("openai" | "faster-whisper")
+"""
+
+import io
+import threading
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Dict, Optional, Tuple
+
+import numpy as np
+
+from src.perception.audio_io import encode_wav
+from src.perception.features import to_float
+
+
+class STTBackend(ABC):
+    """
+    음성 인식 백엔드 인터페이스
+
+    transcribe()는 이름(.name)이 있는 파일 객체를 받습니다 (확장자로 포맷 판단).
+    NumPy 버퍼를 바로 받을 수 있는 백엔드는 transcribe_array()도 구현합니다.
+    """
+
+    #: 캐시 키 등에 쓰는 엔진/모델 식별자
+    model_id = "unknown"
+
+    #: transcribe_array() 지원 여부 (인코딩/업로드 없이 버퍼 전달)
+    accepts_arrays = False
+
+    @abstractmethod
+    def transcribe(self, audio_file: BinaryIO, language: str = "en") -> str:
+        """파일 객체 인식"""
+
+    @abstractmethod
+    def transcribe_array(self, audio: np.ndarray, sample_rate: int = 16000, language: str = "en") -> str:
+        """int16/float 버퍼 인식"""
+
+
+class OpenAIWhisperBackend(STTBackend):
+    """OpenAI Whisper API 백엔드"""
+
+    def __init__(self, client, model: str = "whisper-1"):
+        """
+        Args:
+            client: OpenAI 클라이언트
+            model: Whisper 모델 (기본: whisper-1)
+        """
+        self.client = client
+        self.model = model
+        self.model_id = f"openai:{model}"
+
+    def transcribe(self, audio_file: BinaryIO, language: str = "en") -> str:
+        transcript = self.client.audio.transcriptions.create(
+            model=self.model,
+            file=audio_file,
+            language=language,
+            response_format="text"
+        )
+        return transcript.strip()
+
+    def transcribe_array(self, audio: np.ndarray, sample_rate: int = 16000, language: str = "en") -> str:
+        # API는 파일만 받으므로 메모리에서 WAV로 인코딩 (SpeechRecognizer는 전처리 경로를 사용)
+        audio_file = io.BytesIO(encode_wav(audio, sample_rate))
+        audio_file.name = "audio.wav"
+        return self.transcribe(audio_file, language=language)
+
+
+# 프로세스 안에서 모델은 한 번만 로드 (설정별로 공유)
+_LOCAL_MODELS: Dict[Tuple[str, str, str, int], object] = {}
+_LOCAL_MODELS_LOCK = threading.Lock()
+
+
+class FasterWhisperBackend(STTBackend):
+    """
+    faster-whisper 로컬 CPU 백엔드 (pip install faster-whisper)
+
+    CTranslate2 int8 양자화 모델을 처음 사용할 때 한 번 로드해 상주시키고,
+    같은 설정의 인스턴스끼리 공유합니다. 네트워크 없이 동작하며 업로드 시간이 없습니다.
+    """
+
+    accepts_arrays = True
+
+    def __init__(self, model_size: str = "base.en", device: str = "cpu", compute_type: str = "int8",
+                 cpu_threads: int = 0, beam_size: int = 1, preload: bool = False):
+        """
+        Args:
+            model_size: 모델 이름 또는 로컬 경로 (tiny.en, base.en, small.en, ...)
+            device: "cpu" (또는 "cuda")
+            compute_type: 양자화 타입 (int8, int8_float32, float32)
+            cpu_threads: 추론 스레드 수 (0이면 기본값)
+            beam_size: 빔 크기 (1 = greedy, 가장 빠름)
+            preload: True면 생성 시 바로 모델 로드 (첫 발화 지연 제거)
+        """
+        self.model_size = model_size
+        self.device = device
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.beam_size = beam_size
+        # 빔 크기가 다르면 결과도 다르므로 캐시 키에 포함
+        self.model_id = f"faster-whisper:{model_size}:{compute_type}:beam{beam_size}"
+        if preload:
+            self.model
+
+    @property
+    def model(self):
+        """상주 모델 (없으면 로드)"""
+        key = (self.model_size, self.device, self.compute_type, self.cpu_threads)
+        with _LOCAL_MODELS_LOCK:
+            model = _LOCAL_MODELS.get(key)
+            if model is None:
+                try:
+                    from faster_whisper import WhisperModel
+                except ImportError as e:
+                    raise ImportError(
+                        "로컬 음성 인식에는 faster-whisper가 필요합니다 (pip install faster-whisper)"
+                    ) from e
+
+                print(f"⏳ 로컬 음성 인식 모델 로드 중: {self.model_size} ({self.compute_type})")
+                model = WhisperModel(
+                    self.model_size,
+                    device=self.device,
+                    compute_type=self.compute_type,
+                    cpu_threads=self.cpu_threads,
+                )
+                _LOCAL_MODELS[key] = model
+        return model
+
+    def _run(self, audio, language: str) -> str:
+        segments, _ = self.model.transcribe(audio, language=language, beam_size=self.beam_size)
+        return " ".join(segment.text.strip() for segment in segments).strip()
+
+    def transcribe(self, audio_file: BinaryIO, language: str = "en") -> str:
+        return self._run(audio_file, language)
+
+    def transcribe_array(self, audio: np.ndarray, sample_rate: int = 16000, language: str = "en") -> str:
+        if sample_rate != 16000:
+            from src.perception.audio_prep import UploadPreprocessor
+
+            audio = UploadPreprocessor.resample(np.asarray(audio), sample_rate, 16000)
+        return self._run(to_float(audio), language)
+
+
+def create_backend(name: str = "openai", api_key: Optional[str] = None, model: Optional[str] = None,
+                   **kwargs) -> STTBackend:
+    """
+    설정 이름으로 백엔드 생성
+
+    Args:
+        name: "openai" | "faster-whisper"
+        api_key: OpenAI API 키 (openai 백엔드)
+        model: 모델 이름 (openai: whisper-1, faster-whisper: base.en 등)
+        **kwargs: 백엔드별 옵션
+
+    Returns:
+        STTBackend
+    """
+    if name == "openai":
+        from openai import OpenAI
+
+        return OpenAIWhisperBackend(OpenAI(api_key=api_key), model or "whisper-1")
+    if name in ("faster-whisper", "local"):
+        return FasterWhisperBackend(model or "base.en", **kwargs)
+    raise ValueError(f"알 수 없는 음성 인식 백엔드: {name} (openai, faster-whisper)")
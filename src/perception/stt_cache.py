@@ -0,0 +1,155 @@
+"""
+음성 인식 결과 캐시 모듈
+같은 오디오를 같은 모델/언어로 다시 인식하면 API/모델을 호출하지 않고 저장된 결과를 반환합니다.
+
+키는 오디오 바이트 + 모델 + 언어의 해시(content-addressed)라서 파일 이름이 바뀌어도
+내용이 같으면 적중하고, 내용이 조금이라도 다르면 적중하지 않습니다.
+
+- 메모리 계층: 최근 결과 LRU (max_entries개)
+- 디스크 계층: path/<키 앞 2자리>/<키>.json (선택, 프로세스를 다시 시작해도 유지)
+
+test_audio/*.wav를 반복 재생하는 데모(main.py, demo_screenshot.py)에서 두 번째 실행부터
+음성 인식을 건너뜁니다.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class TranscriptionCache:
+    """
+    2계층(메모리 LRU + 디스크) 음성 인식 결과 캐시
+
+    사용 예:
+        cache = TranscriptionCache(path=".cache/stt")
+        recognizer = SpeechRecognizer(api_key, cache=cache)
+    """
+
+    def __init__(self, max_entries: int = 256, path: Optional[str] = None, max_disk_entries: int = 10000):
+        """
+        Args:
+            max_entries: 메모리에 둘 최대 결과 수
+            path: 디스크 캐시 디렉토리 (None이면 메모리만 사용)
+            max_disk_entries: 디스크에 둘 최대 결과 수 (넘으면 오래된 것부터 삭제)
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_writes = 0
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def key(audio: bytes, model: str, language: str) -> str:
+        """오디오 바이트 + 모델 + 언어 → 캐시 키 (hex)"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{model}\0{language}\0".encode("utf-8"))
+        digest.update(audio)
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], f"{key}.json")
+
+    def _remember_locked(self, key: str, text: str):
+        """메모리 계층에 추가 (self._lock 보유 상태에서 호출)"""
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        저장된 결과 조회 (메모리 → 디스크 순)
+
+        Returns:
+            str 또는 None (없음)
+        """
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return text
+
+            if self.path:
+                try:
+                    with open(self._entry_path(key), "r", encoding="utf-8") as f:
+                        text = json.load(f)["text"]
+                except (OSError, ValueError, KeyError):
+                    text = None
+                if text is not None:
+                    self._remember_locked(key, text)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return text
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, text: str, **info):
+        """
+        결과 저장
+
+        Args:
+            key: key()로 만든 키
+            text: 인식 결과
+            **info: 디스크에 함께 기록할 정보 (모델, 언어 등)
+        """
+        with self._lock:
+            self._remember_locked(key, text)
+            if not self.path:
+                return
+
+            entry_path = self._entry_path(key)
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            # 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록 임시 파일 → rename
+            temp_path = f"{entry_path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"text": text, "created": time.time(), **info}, f, ensure_ascii=False)
+            os.replace(temp_path, entry_path)
+
+            self._disk_writes += 1
+            if self._disk_writes % 64 == 0:
+                self._prune_disk_locked()
+
+    def _prune_disk_locked(self):
+        """디스크 항목 수 제한 (오래된 것부터 삭제)"""
+        entries = []
+        for shard in os.listdir(self.path):
+            shard_path = os.path.join(self.path, shard)
+            if os.path.isdir(shard_path):
+                entries += [os.path.join(shard_path, name) for name in os.listdir(shard_path)]
+
+        excess = len(entries) - self.max_disk_entries
+        if excess > 0:
+            for entry in sorted(entries, key=os.path.getmtime)[:excess]:
+                os.remove(entry)
+
+    def clear(self):
+        """메모리 계층 비우기 (디스크는 유지)"""
+        with self._lock:
+            self._memory.clear()
+
+    def summary(self) -> Dict[str, float]:
+        """적중률 통계"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._memory),
+        }
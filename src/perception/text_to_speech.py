@@ -1,27 +1,208 @@
 """
 Text-to-Speech 모듈
 OpenAI TTS API를 사용한 음성 합성
+
+기본은 스트리밍 재생입니다: PCM(24kHz 16-bit)으로 요청해 첫 바이트가 도착하는 대로
+출력 장치(sounddevice)로 바로 재생하므로, 답변 전체가 합성될 때까지 기다리지 않습니다.
+여러 문장이면 문장별로 동시에 합성(최대 max_workers개)하고 문장 순서대로 재생하므로,
+뒤 문장이 합성되는 동안 첫 문장이 먼저 나옵니다.
+스트리밍 응답을 받을 수 없으면 한 번에 합성한 PCM을 메모리에서 재생하고(임시 파일 없음),
+출력 장치를 쓸 수 없을 때만 예전처럼 파일로 저장해 afplay로 재생합니다.
+
+echo(EchoSuppressor)를 넘기면 재생 직전/직후에 알려서, 캡처 중인 마이크가
+로봇 자신의 목소리(이름 포함)로 웨이크워드를 다시 감지하지 않게 합니다.
+이때는 재생하는 오디오를 참조 신호로 함께 넘깁니다 (스트리밍이면 조각마다).
 """
 
+import queue
+import re
 import subprocess
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional
+
+import numpy as np
 from openai import OpenAI
 import os
 
+from src.perception.audio_device import AudioOutputDevice, SoundDeviceOutput
+from src.perception.audio_io import decode_wav
+
+
+PCM_SAMPLE_RATE = 24000  # OpenAI TTS response_format="pcm": 24kHz 16-bit mono little-endian
+
+# 문장 끝: 마침표/물음표/느낌표 뒤 공백, 또는 줄바꿈 ("1.5m" 같은 숫자는 나누지 않음)
+_SENTENCE_END = re.compile(r"(?<=[.!?…。！？])\s+|\n+")
+
+
+def split_sentences(text: str, min_chars: int = 12) -> List[str]:
+    """
+    문장 단위로 나누기 (문장별 병렬 합성용)
+
+    너무 짧은 문장("네.")은 다음 문장과 합쳐서 요청 수와 문장 사이 끊김을 줄입니다.
+
+    Args:
+        text: 말할 텍스트
+        min_chars: 이보다 짧은 조각은 다음 문장과 합침
+
+    Returns:
+        List[str]: 순서대로 나눈 문장들
+    """
+    sentences: List[str] = []
+    pending = ""
+    for part in _SENTENCE_END.split(text.strip()):
+        part = part.strip()
+        if not part:
+            continue
+        pending = f"{pending} {part}" if pending else part
+        if len(pending) >= min_chars:
+            sentences.append(pending)
+            pending = ""
+    if pending:
+        if sentences:
+            sentences[-1] = f"{sentences[-1]} {pending}"
+        else:
+            sentences.append(pending)
+    return sentences
+
+
+def _play_file(audio_file: str, echo=None):
+    """
+    오디오 파일 재생 (macOS afplay), echo가 있으면 재생 구간을 알림
+
+    Args:
+        audio_file: 재생할 오디오 파일 경로
+        echo: EchoSuppressor (선택) - WAV 파일이면 참조 신호로 사용
+    """
+    if echo is not None:
+        try:
+            reference, sample_rate = decode_wav(audio_file)
+        except Exception:
+            reference, sample_rate = None, None  # 참조 없이 재생 구간만 감쇠
+        echo.begin(reference, sample_rate)
+
+    try:
+        # macOS에서 afplay 사용
+        subprocess.run(["afplay", audio_file], check=True)
+    except FileNotFoundError:
+        print("  ⚠ 오디오 재생 실패 (afplay 없음)")
+    except Exception as e:
+        print(f"  ⚠ 오디오 재생 오류: {e}")
+    finally:
+        if echo is not None:
+            echo.end()
+
+
+class PCMPlayer:
+    """
+    PCM 바이트 조각을 도착하는 대로 출력 장치로 재생
+
+    조각 경계가 샘플 중간(홀수 바이트)이어도 다음 조각과 이어 붙입니다.
+    열려 있는 동안 play()를 여러 번 호출하면 끊김 없이 이어서 재생합니다.
+
+    사용 예:
+        with PCMPlayer(SoundDeviceOutput(), echo=echo) as player:
+            player.play(response.iter_bytes())
+    """
+
+    def __init__(self, output: AudioOutputDevice, sample_rate: int = PCM_SAMPLE_RATE, echo=None):
+        """
+        Args:
+            output: 출력 장치
+            sample_rate: PCM 샘플링 레이트
+            echo: EchoSuppressor (선택) - 재생하는 조각을 참조 신호로 전달
+        """
+        self.output = output
+        self.sample_rate = sample_rate
+        self.echo = echo
+        self.samples = 0                                # 재생한 샘플 수
+        self.first_audio_latency: Optional[float] = None  # open() → 첫 소리까지 (초)
+        self._stream = None
+        self._opened = 0.0
+        self._remainder = b""
+
+    def open(self) -> "PCMPlayer":
+        """출력 스트림 열기 (합성 요청 전에 열어 두면 장치 준비가 네트워크 대기와 겹침)"""
+        self._stream = self.output.output_stream(self.sample_rate, channels=1, dtype="int16")
+        self._stream.start()
+        self._opened = time.perf_counter()
+        return self
+
+    def play(self, chunks: Iterable[bytes]) -> int:
+        """
+        바이트 조각을 순서대로 재생 (장치 버퍼가 차면 그만큼만 대기)
+
+        Args:
+            chunks: 16-bit little-endian mono PCM 바이트 조각
+
+        Returns:
+            int: 이번에 재생한 샘플 수
+        """
+        played = 0
+        for chunk in chunks:
+            data = self._remainder + chunk
+            usable = len(data) - len(data) % 2
+            self._remainder = data[usable:]
+            if not usable:
+                continue
+
+            pcm = np.frombuffer(data[:usable], dtype="<i2")
+            if self.samples == 0:
+                self.first_audio_latency = time.perf_counter() - self._opened
+                if self.echo is not None:
+                    self.echo.begin(sample_rate=self.sample_rate, streaming=True)
+            if self.echo is not None:
+                self.echo.add_reference(pcm, self.sample_rate)
+            self._stream.write(pcm.reshape(-1, 1))
+            self.samples += len(pcm)
+            played += len(pcm)
+        return played
+
+    def close(self):
+        """남은 오디오가 모두 재생될 때까지 기다린 뒤 닫기"""
+        if self._stream is None:
+            return
+        try:
+            self._stream.stop()
+            self._stream.close()
+        finally:
+            self._stream = None
+            if self.echo is not None and self.samples:
+                self.echo.end()
+
+    def __enter__(self):
+        if self._stream is None:
+            self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
 
 class TextToSpeech:
     """
     텍스트를 음성으로 변환
     """
 
-    def __init__(self, api_key: str, voice: str = "alloy"):
+    def __init__(self, api_key: str, voice: str = "alloy", echo=None,
+                 output: Optional[AudioOutputDevice] = None, streaming: bool = True, max_workers: int = 3):
         """
         Args:
             api_key: OpenAI API 키
             voice: 음성 종류 (alloy, echo, fable, onyx, nova, shimmer)
+            echo: EchoSuppressor (선택) - 재생 중 캡처에서 자기 목소리 억제
+            output: 스트리밍 재생에 쓸 출력 장치 (기본: 시스템 기본 스피커)
+            streaming: 첫 바이트부터 바로 재생 (False면 파일로 저장 후 afplay)
+            max_workers: 스트리밍 재생 시 동시에 합성할 문장 수 (1이면 한 번에 합성)
         """
         self.client = OpenAI(api_key=api_key)
         self.voice = voice
+        self.echo = echo
+        self.output = output if output is not None else SoundDeviceOutput()
+        self.streaming = streaming
+        self.max_workers = max_workers
+        self.first_audio_latency: Optional[float] = None  # 마지막 발화의 요청 → 첫 소리 (초)
 
     def speak(self, text: str, play_audio: bool = True) -> str:
         """
@@ -32,20 +213,28 @@ class TextToSpeech:
             play_audio: 자동 재생 여부
 
         Returns:
-            str: 생성된 오디오 파일 경로
+            str: 생성된 오디오 파일 경로 (스트리밍 재생이면 "")
         """
         print(f"\n🔊 로봇: {text}")
 
+        if play_audio and self.streaming:
+            player = self._open_player()
+            if player is not None:
+                return self._speak_streaming(text, player)
+
         try:
             # OpenAI TTS API 호출
+            # 에코 억제에 참조 신호가 필요하면 바로 디코딩할 수 있는 WAV로 요청
+            audio_format = "wav" if self.echo is not None else "mp3"
             response = self.client.audio.speech.create(
                 model="tts-1",
                 voice=self.voice,
-                input=text
+                input=text,
+                response_format=audio_format
             )
 
             # 임시 파일로 저장
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
+            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=f'.{audio_format}')
             response.stream_to_file(temp_file.name)
 
             # 재생
@@ -58,9 +247,112 @@ class TextToSpeech:
             print(f"✗ TTS 오류: {e}")
             # 폴백: macOS say 명령 사용
             print("  → macOS 내장 음성 사용")
-            subprocess.run(["say", text], check=False)
+            MacOSTTS(voice=None, echo=self.echo).speak(text, announce=False)
             return ""
 
+    def _open_player(self) -> Optional[PCMPlayer]:
+        """출력 장치 열기 (쓸 수 없으면 이후로는 파일 재생 경로 사용)"""
+        try:
+            return PCMPlayer(self.output, PCM_SAMPLE_RATE, echo=self.echo).open()
+        except Exception as e:
+            # sounddevice 미설치, PortAudio/출력 장치 없음
+            print(f"  ⚠ 오디오 출력 장치 사용 불가 ({e}) → 파일로 재생")
+            self.streaming = False
+            return None
+
+    def _speak_streaming(self, text: str, player: PCMPlayer) -> str:
+        """PCM을 받는 대로 재생 (여러 문장이면 문장별로 동시에 합성해 순서대로 재생)"""
+        sentences = split_sentences(text) if self.max_workers > 1 else [text]
+        error = None
+        with player:
+            try:
+                if len(sentences) > 1:
+                    error = self._play_sentences(sentences, player)
+                else:
+                    player.play(self._pcm_chunks(text))
+            except Exception as e:
+                print(f"✗ TTS 오류: {e}")
+                error = e
+
+        self.first_audio_latency = player.first_audio_latency
+        if error is not None and not player.samples:
+            # 폴백: macOS say 명령 사용
+            print("  → macOS 내장 음성 사용")
+            MacOSTTS(voice=None, echo=self.echo).speak(text, announce=False)
+        return ""
+
+    def _pcm_chunks(self, text: str) -> Iterator[bytes]:
+        """PCM 조각 (스트리밍 응답이 안 되면 한 번에 받아 메모리에서 전달, 임시 파일 없음)"""
+        received = False
+        try:
+            with self.client.audio.speech.with_streaming_response.create(
+                model="tts-1",
+                voice=self.voice,
+                input=text,
+                response_format="pcm"
+            ) as response:
+                for chunk in response.iter_bytes(4096):
+                    received = True
+                    yield chunk
+            return
+        except Exception as e:
+            if received:
+                raise  # 이미 말하기 시작했으면 처음부터 다시 말하지 않음
+            print(f"  ⚠ 스트리밍 합성 실패 ({e}) → 한 번에 합성")
+
+        response = self.client.audio.speech.create(
+            model="tts-1",
+            voice=self.voice,
+            input=text,
+            response_format="pcm"
+        )
+        yield response.content
+
+    def _play_sentences(self, sentences: List[str], player: PCMPlayer) -> Optional[Exception]:
+        """
+        문장별 동시 합성 (최대 max_workers개) + 문장 순서대로 재생
+
+        각 문장의 PCM 조각은 받는 대로 문장별 큐에 쌓이고, 재생은 앞 문장이 끝나야 다음 문장으로 넘어갑니다.
+        첫 문장은 도착하는 대로 재생되고, 그동안 뒤 문장들은 미리 합성됩니다.
+        한 문장의 합성이 실패하면 그 문장만 건너뜁니다. 출력 장치 오류는 그대로 전달합니다.
+
+        Returns:
+            Exception: 마지막 문장 합성 오류 (없으면 None)
+        """
+        queues = [queue.Queue() for _ in sentences]
+        error = None
+
+        def synthesize(sentence: str, chunks: queue.Queue):
+            try:
+                for chunk in self._pcm_chunks(sentence):
+                    chunks.put(chunk)
+            except Exception as e:
+                chunks.put(e)
+            chunks.put(None)
+
+        def drain(index: int, chunks: queue.Queue) -> Iterator[bytes]:
+            nonlocal error
+            while True:
+                item = chunks.get()
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    print(f"  ⚠ {index + 1}번째 문장 합성 실패, 건너뜀: {item}")
+                    error = item
+                    return
+                yield item
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tts")
+        try:
+            for sentence, chunks in zip(sentences, queues):
+                executor.submit(synthesize, sentence, chunks)
+            for index, chunks in enumerate(queues):
+                player.play(drain(index, chunks))
+        finally:
+            # 중단(Ctrl+C, 출력 장치 오류 등)되면 시작하지 않은 문장은 취소
+            executor.shutdown(wait=False, cancel_futures=True)
+        return error
+
     def _play_audio(self, audio_file: str):
         """
         오디오 파일 재생 (macOS)
@@ -68,13 +360,7 @@ class TextToSpeech:
         Args:
             audio_file: 재생할 오디오 파일 경로
         """
-        try:
-            # macOS에서 afplay 사용
-            subprocess.run(["afplay", audio_file], check=True)
-        except FileNotFoundError:
-            print("  ⚠ 오디오 재생 실패 (afplay 없음)")
-        except Exception as e:
-            print(f"  ⚠ 오디오 재생 오류: {e}")
+        _play_file(audio_file, self.echo)
 
 
 class MacOSTTS:
@@ -82,32 +368,46 @@ class MacOSTTS:
     macOS 내장 TTS 사용 (폴백용, 무료)
     """
 
-    def __init__(self, voice: str = "Yuna"):
+    def __init__(self, voice: str = "Yuna", echo=None):
         """
         Args:
-            voice: macOS 음성 (Yuna: 한국어, Samantha: 영어 등)
+            voice: macOS 음성 (Yuna: 한국어, Samantha: 영어 등, None이면 시스템 기본)
+            echo: EchoSuppressor (선택) - 재생 중 캡처에서 자기 목소리 억제
         """
         self.voice = voice
+        self.echo = echo
 
-    def speak(self, text: str, play_audio: bool = True):
+    def speak(self, text: str, play_audio: bool = True, announce: bool = True):
         """
         텍스트를 음성으로 변환 및 재생
 
         Args:
             text: 말할 텍스트
             play_audio: 재생 여부
+            announce: 말할 텍스트 출력 여부
         """
-        print(f"\n🔊 로봇: {text}")
+        if announce:
+            print(f"\n🔊 로봇: {text}")
 
+        voice = ["-v", self.voice] if self.voice else []
         try:
-            if play_audio:
+            if play_audio and self.echo is None:
                 # 직접 재생
-                subprocess.run(["say", "-v", self.voice, text], check=True)
+                subprocess.run(["say", *voice, text], check=True)
+            elif play_audio:
+                # 참조 신호를 알 수 있게 16-bit WAV로 만든 뒤 재생
+                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
+                subprocess.run(
+                    ["say", *voice, "-o", temp_file.name, "--data-format=LEI16@16000", text],
+                    check=True
+                )
+                _play_file(temp_file.name, self.echo)
+                os.unlink(temp_file.name)
             else:
                 # 파일로 저장
                 temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.aiff')
                 subprocess.run(
-                    ["say", "-v", self.voice, "-o", temp_file.name, text],
+                    ["say", *voice, "-o", temp_file.name, text],
                     check=True
                 )
                 return temp_file.name
@@ -116,23 +416,27 @@ class MacOSTTS:
             return ""
 
 
-def create_tts(api_key: str = None, use_openai: bool = True):
+def create_tts(api_key: str = None, use_openai: bool = True, echo=None, streaming: bool = True,
+               max_workers: int = 3):
     """
     TTS 인스턴스 생성 (자동 선택)
 
     Args:
         api_key: OpenAI API 키 (선택사항)
         use_openai: OpenAI TTS 사용 여부
+        echo: EchoSuppressor (선택) - 보통 AudioCaptureService.echo
+        streaming: OpenAI TTS를 첫 바이트부터 바로 재생
+        max_workers: 동시에 합성할 문장 수
 
     Returns:
         TextToSpeech 또는 MacOSTTS 인스턴스
     """
     if use_openai and api_key:
         try:
-            return TextToSpeech(api_key=api_key)
+            return TextToSpeech(api_key=api_key, echo=echo, streaming=streaming, max_workers=max_workers)
         except Exception as e:
             print(f"⚠ OpenAI TTS 초기화 실패: {e}")
             print("→ macOS 내장 TTS로 전환")
 
     # 폴백: macOS 내장 TTS
-    return MacOSTTS()
+    return MacOSTTS(echo=echo)
@@ -0,0 +1,267 @@
+"""
+음성 활동 감지 (VAD) 모듈
+프레임 단위 스펙트럼 VAD + 적응형 노이즈 플로어 + onset/hangover + 끝점 검출
+
+고정 볼륨 임계값(np.abs(x).mean() > 500)은 선풍기나 에어컨 소음이 있으면
+녹음이 끝나지 않고, 조용한 방에서는 작은 목소리를 놓칩니다.
+이 VAD는 프레임(25ms 창, 10ms 간격)마다
+  - 에너지 (dBFS)
+  - 영교차율 (ZCR)
+  - 음성 대역(250~3800Hz) 에너지
+를 보고, 배경 소음 수준을 계속 추정해 그보다 충분히 큰 소리만 말소리로 봅니다.
+
+특징은 FeatureFrontEnd가 계산합니다. 웨이크워드 스포터와 같은 프론트엔드를 공유하면
+process_features()로 이미 계산된 특징을 받아 FFT를 다시 하지 않습니다.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.perception.frontend import FeatureBlock, FeatureFrontEnd
+
+
+MIN_SPEECH_DB = -50.0  # 말소리로 볼 절대 최소 레벨 (dBFS)
+
+
+def volume_to_db(mean_abs: float) -> float:
+    """
+    int16 평균 절댓값 볼륨(예전 고정 임계값 300/400/500) → 대략적인 RMS dBFS
+
+    사인파 기준 RMS ≈ 1.11 × 평균 절댓값
+    """
+    return float(20.0 * np.log10(max(mean_abs * 1.11, 1e-3) / 32768.0))
+
+
+class VoiceActivityDetector:
+    """
+    스트리밍 음성 활동 감지기
+
+    오디오 콜백에서 process(block)을 호출하면 프레임별 판단을 반환하고,
+    메인 스레드는 speech_started / silence_duration / endpoint()로 발화 끝을 판단합니다.
+
+    사용 예:
+        vad = VoiceActivityDetector()
+        callback: vad.process(indata)
+        loop:     if vad.endpoint(1.5): break
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        snr_db: float = 9.0,
+        onset: float = 0.06,
+        hangover: float = 0.3,
+        fricative_zcr: float = 0.3,
+        min_speech_db: float = MIN_SPEECH_DB,
+        min_floor_db: float = -75.0,
+        frontend: Optional[FeatureFrontEnd] = None,
+    ):
+        """
+        Args:
+            sample_rate: 샘플링 레이트
+            snr_db: 노이즈 플로어보다 이만큼(dB) 커야 말소리 후보
+            onset: 이 시간 이상 연속으로 후보여야 발화 시작 (초, 짧은 잡음 무시)
+            hangover: 마지막 말소리 후 이 시간까지는 발화로 유지 (초, 단어 사이 쉼 허용)
+            fricative_zcr: ZCR이 이 이상이면 대역 비율과 무관하게 후보 ('s', 'f' 같은 마찰음)
+            min_speech_db: 절대 최소 레벨 (dBFS)
+            min_floor_db: 노이즈 플로어 하한 (dBFS, 디지털 무음에서 과민해지지 않도록)
+            frontend: process()에 쓸 특징 프론트엔드 (기본: 새로 생성, 공유하면 reset()이 초기화하지 않음)
+        """
+        self.sample_rate = sample_rate
+        self._own_frontend = frontend is None
+        self.frontend = frontend if frontend is not None else FeatureFrontEnd(sample_rate)
+        self.hop_length = self.frontend.hop_length  # 프레임 간격 (샘플, 위치 계산 단위)
+        frame_seconds = self.frontend.hop_seconds
+        self.snr_db = snr_db
+        self.onset_frames = max(int(round(onset / frame_seconds)), 1)
+        self.hangover_frames = int(round(hangover / frame_seconds))
+        self.fricative_zcr = fricative_zcr
+        self.min_speech_db = min_speech_db
+        self.min_floor_db = min_floor_db
+
+        # 노이즈 플로어 적응 속도 (20ms 기준 값을 프레임 간격에 맞춰 환산)
+        scale = frame_seconds / 0.02
+        self.floor_down = 1.0 - (1.0 - 0.3) ** scale     # 더 조용해지면 빠르게 따라감
+        self.floor_up = 1.0 - (1.0 - 0.02) ** scale      # 비음성 프레임에서 천천히 올라감 (~1초)
+        self.floor_drift = 1.0 - (1.0 - 0.001) ** scale  # 말하는 중에도 아주 천천히 (소음이 계속 커지는 경우 대비)
+
+        self.noise_floor_db: Optional[float] = None  # 음성 대역 노이즈 플로어 (dBFS)
+        self.energy_floor_db: Optional[float] = None  # 전체 대역 노이즈 플로어 (dBFS)
+        self.reset()
+
+    # ------------------------------------------------------------------
+    # 상태
+    # ------------------------------------------------------------------
+
+    def reset(self, keep_floor: bool = True):
+        """
+        발화 상태 초기화 (새 녹음 시작 시)
+
+        Args:
+            keep_floor: 추정한 노이즈 플로어 유지 (같은 마이크/방이면 True)
+        """
+        self.frames = 0                  # 처리한 프레임 수
+        self.in_speech = False
+        self.utterance_start: Optional[int] = None  # 첫 발화 시작 프레임
+        self.last_speech: Optional[int] = None      # 마지막 말소리 프레임
+        self._run = 0
+        if self._own_frontend:
+            self.frontend.reset()
+        if not keep_floor:
+            self.noise_floor_db = None
+            self.energy_floor_db = None
+
+    @property
+    def position(self) -> int:
+        """지금까지 판단한 샘플 수"""
+        return self.frames * self.hop_length
+
+    @property
+    def speech_started(self) -> bool:
+        """reset 이후 발화가 시작되었는지"""
+        return self.utterance_start is not None
+
+    @property
+    def utterance_start_sample(self) -> Optional[int]:
+        return None if self.utterance_start is None else self.utterance_start * self.hop_length
+
+    @property
+    def last_speech_sample(self) -> Optional[int]:
+        """마지막 말소리 프레임의 끝 위치 (샘플)"""
+        return None if self.last_speech is None else (self.last_speech + 1) * self.hop_length
+
+    @property
+    def silence_duration(self) -> float:
+        """마지막 말소리 이후 지난 시간 (초, 발화 전이면 0)"""
+        if self.last_speech is None:
+            return 0.0
+        return (self.frames - self.last_speech - 1) * self.hop_length / self.sample_rate
+
+    def endpoint(self, silence: float) -> bool:
+        """발화가 시작된 뒤 silence초 이상 조용하면 True (발화 끝)"""
+        return self.speech_started and not self.in_speech and self.silence_duration >= silence
+
+    # ------------------------------------------------------------------
+    # 특징 / 판단
+    # ------------------------------------------------------------------
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """
+        블록 처리 (오디오 콜백에서 호출, 자체 프론트엔드로 특징 계산)
+
+        Args:
+            block: int16/float 오디오 블록
+
+        Returns:
+            np.ndarray: 이번 블록에서 완성된 프레임별 발화 여부 (bool)
+        """
+        return self.process_features(self.frontend.process(block))
+
+    def process_features(self, features: FeatureBlock) -> np.ndarray:
+        """
+        이미 계산된 특징으로 판단 (공유 프론트엔드의 구독자로 사용)
+
+        Returns:
+            np.ndarray: 프레임별 발화 여부 (bool)
+        """
+        if features.frames == 0:
+            return np.zeros(0, dtype=bool)
+        return self._decide(features.energy_db, features.zcr, features.band_db)
+
+    def _track(self, floor: float, level: float, raw: bool) -> float:
+        """노이즈 플로어 한 프레임 갱신"""
+        if level < floor:
+            floor += self.floor_down * (level - floor)
+        elif raw:
+            floor += self.floor_drift * (level - floor)
+        else:
+            floor += self.floor_up * (level - floor)
+        return max(floor, self.min_floor_db)
+
+    def _decide(self, energy_db, zcr, band_db) -> np.ndarray:
+        """
+        프레임별 후보 → onset/hangover 스무딩 + 노이즈 플로어 갱신
+
+        후보 조건 (둘 중 하나):
+          - 음성 대역 에너지가 대역 노이즈 플로어보다 snr_db 이상 큼
+            (선풍기/에어컨의 저주파 웅웅거림은 대역 밖이라 플로어를 올리지 않음)
+          - 마찰음: ZCR이 높고 전체 에너지가 전체 노이즈 플로어보다 snr_db 이상 큼
+        """
+        if self.noise_floor_db is None:
+            self.noise_floor_db = max(float(band_db[0]), self.min_floor_db)
+            self.energy_floor_db = max(float(energy_db[0]), self.min_floor_db)
+
+        voiced = (band_db >= self.min_speech_db)
+        fricative = (zcr >= self.fricative_zcr) & (energy_db >= self.min_speech_db)
+
+        decisions = np.zeros(len(band_db), dtype=bool)
+        band_floor = self.noise_floor_db
+        energy_floor = self.energy_floor_db
+        for i in range(len(band_db)):
+            raw = bool(
+                (voiced[i] and band_db[i] > band_floor + self.snr_db)
+                or (fricative[i] and energy_db[i] > energy_floor + self.snr_db)
+            )
+            self._run = self._run + 1 if raw else 0
+            frame = self.frames + i
+
+            if self.in_speech:
+                if raw:
+                    self.last_speech = frame
+                elif frame - self.last_speech > self.hangover_frames:
+                    self.in_speech = False
+            elif self._run >= self.onset_frames:
+                self.in_speech = True
+                self.last_speech = frame
+                if self.utterance_start is None:
+                    self.utterance_start = frame - self.onset_frames + 1
+
+            band_floor = self._track(band_floor, band_db[i], raw)
+            energy_floor = self._track(energy_floor, energy_db[i], raw)
+            decisions[i] = self.in_speech
+
+        self.noise_floor_db = band_floor
+        self.energy_floor_db = energy_floor
+        self.frames += len(band_db)
+        return decisions
+
+    def is_speech(self, audio_data: np.ndarray) -> bool:
+        """
+        오디오 데이터에 음성이 포함되어 있는지 확인
+
+        Args:
+            audio_data: numpy array
+
+        Returns:
+            bool: 음성 포함 여부
+        """
+        return bool(self.process(audio_data).any())
+
+    # ------------------------------------------------------------------
+    # 오프라인
+    # ------------------------------------------------------------------
+
+    def segments(self, audio: np.ndarray) -> List[Tuple[int, int]]:
+        """
+        녹음 전체의 발화 구간 (샘플 단위 [start, end))
+
+        노이즈 플로어는 유지하고 발화 상태만 새로 시작합니다.
+        """
+        self.reset()
+        features = self.frontend.extract(audio)
+        if features.frames == 0:
+            return []
+
+        energy_db, zcr, band_db = features.energy_db, features.zcr, features.band_db
+        if self.noise_floor_db is None:
+            # 녹음 전체를 볼 수 있으므로 조용한 쪽 분위수로 시작 (첫 프레임이 말소리여도 안전)
+            self.noise_floor_db = max(float(np.percentile(band_db, 10)), self.min_floor_db)
+            self.energy_floor_db = max(float(np.percentile(energy_db, 10)), self.min_floor_db)
+        decisions = self._decide(energy_db, zcr, band_db)
+
+        edges = np.flatnonzero(np.diff(np.concatenate([[False], decisions, [False]]).astype(np.int8)))
+        starts, ends = edges[::2], edges[1::2]
+        # onset 지연만큼 시작을 앞당김
+        starts = np.maximum(starts - self.onset_frames + 1, 0)
+        return [(int(s) * self.hop_length, int(e) * self.hop_length) for s, e in zip(starts, ends)]
@@ -0,0 +1,187 @@
+"""
+2단계 웨이크워드 캐스케이드
+로컬 키워드 스포터(1단계) → 후보 구간만 음성 인식으로 확인(2단계)
+
+1단계는 계속 돌아가지만 CPU만 쓰고, 음성 인식 API는 1단계가 후보를 낸
+짧은 구간에 대해서만 호출됩니다. 웨이크워드 뒤에 명령이 이어지면
+같은 호출로 명령까지 인식합니다.
+
+오디오 장치와 무관하므로 녹음 파일로도 그대로 돌릴 수 있습니다.
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from src.perception.frontend import FeatureFrontEnd
+from src.perception.keyword_spotter import KeywordSpotter, SlidingWindowSpotter, SpotResult
+from src.perception.ring_buffer import AudioRingBuffer
+from src.perception.vad import VoiceActivityDetector
+
+
+@dataclass
+class CascadeStats:
+    """캐스케이드 단계별 카운터"""
+
+    windows_scored: int = 0      # 1단계가 점수 매긴 창 수
+    candidates: int = 0          # 1단계 후보 수
+    auto_accepts: int = 0        # 1단계 확신으로 2단계 생략
+    verification_calls: int = 0  # 2단계 음성 인식 호출 수
+    verified: int = 0            # 2단계에서 확인된 웨이크워드
+    false_accepts: int = 0       # 1단계 후보였지만 2단계에서 거부
+
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class WakeWordCascade:
+    """
+    2단계 웨이크워드 감지 상태 머신
+
+    사용 예:
+        cascade = WakeWordCascade(spotter, recognizer, verify=detector._check_wake_word_flexible)
+        callback: cascade.write(indata)
+        loop:     decision = cascade.step()  # (detected, text) 또는 None
+    """
+
+    def __init__(
+        self,
+        spotter: KeywordSpotter,
+        recognizer,
+        verify: Callable[[str], bool],
+        sample_rate: int = 16000,
+        candidate_threshold: Optional[float] = None,
+        accept_threshold: float = 0.0,
+        hop: float = 0.2,
+        follow_silence: float = 0.8,
+        max_utterance: float = 10.0,
+        vad: Optional[VoiceActivityDetector] = None,
+        stats: Optional[CascadeStats] = None,
+    ):
+        """
+        Args:
+            spotter: 1단계 로컬 키워드 스포터
+            recognizer: 2단계 SpeechRecognizer (transcribe_audio 사용)
+            verify: 인식된 텍스트(소문자)가 웨이크워드인지 판단하는 함수
+            sample_rate: 샘플링 레이트
+            candidate_threshold: 1단계 후보 임계값 (기본: spotter.threshold, 크게 잡을수록 놓침이 줄고 2단계 호출이 늘어남)
+            accept_threshold: 이 거리 이하이면 2단계 없이 수락 (0이면 항상 확인)
+            hop: 1단계 창 간격 (초)
+            follow_silence: 후보 뒤 이만큼 조용하면 발화가 끝난 것으로 판단 (초)
+            max_utterance: 후보부터 녹음할 최대 길이 (초)
+            vad: 후보 뒤 명령이 이어지는지 판단할 VAD (기본: 새로 생성)
+            stats: 공유할 카운터 (기본: 새로 생성)
+        """
+        self.spotter = spotter
+        self.recognizer = recognizer
+        self.verify = verify
+        self.sample_rate = sample_rate
+        self.accept_threshold = accept_threshold
+        self.vad = vad if vad is not None else VoiceActivityDetector(sample_rate)
+        self.stats = stats if stats is not None else CascadeStats()
+
+        # 1단계 스포터와 VAD가 블록당 한 번 계산한 특징을 함께 사용
+        self.frontend = FeatureFrontEnd(sample_rate)
+        self.stage1 = SlidingWindowSpotter(spotter, hop=hop, cooldown=0.0, threshold=candidate_threshold,
+                                           frontend=self.frontend)
+        self.frontend.subscribe(self.stage1.write_features)
+        self.frontend.subscribe(self.vad.process_features)
+        self.follow_samples = int(follow_silence * sample_rate)
+        self.max_samples = int(max_utterance * sample_rate)
+        self.ring = AudioRingBuffer(self.max_samples + self.stage1.window_samples + sample_rate)
+
+        self._candidate: Optional[SpotResult] = None
+        self._candidate_start = 0
+        self._candidate_end = 0
+        # 1단계 초기화 요청 (스포터 버퍼는 오디오 스레드만 수정하므로 write()에서 처리)
+        self._stage1_reset_pending = False
+
+    @property
+    def has_candidate(self) -> bool:
+        """1단계 후보를 확인하는 중인지"""
+        return self._candidate is not None
+
+    def reset(self):
+        """버퍼와 상태 초기화 (새로 듣기 시작할 때)"""
+        self.ring.clear()
+        self.frontend.reset()
+        self.stage1.reset()
+        self.vad.reset()
+        self._candidate = None
+        self._stage1_reset_pending = False
+
+    @property
+    def _last_voice(self) -> int:
+        """마지막 말소리 위치 (ring과 같은 기준)"""
+        return self.vad.last_speech_sample or 0
+
+    def write(self, block: np.ndarray):
+        """오디오 블록 추가 (오디오 콜백에서 호출)"""
+        if self._stage1_reset_pending:
+            self.stage1.reset()
+            self._stage1_reset_pending = False
+        self.ring.write(block)
+        self.frontend.process(block)
+
+    def step(self) -> Optional[Tuple[bool, str]]:
+        """
+        밀린 처리 수행
+
+        Returns:
+            None (아직 판단 없음) 또는 (detected, text)
+        """
+        if self._candidate is None:
+            if self._stage1_reset_pending:  # 이전 후보의 특징이 아직 남아 있음
+                return None
+            scored = self.stage1.windows_scored
+            result = self.stage1.poll()
+            self.stats.windows_scored += self.stage1.windows_scored - scored
+            if result is None:
+                return None
+
+            self.stats.candidates += 1
+            self._candidate = result
+            self._candidate_end = self.ring.written
+            self._candidate_start = max(self._candidate_end - self.stage1.window_samples, self.ring.oldest)
+            return None
+
+        # 후보 뒤에 명령이 이어지는지 발화 끝까지 기다림
+        now = self.ring.written
+        silent = now - max(self._last_voice, self._candidate_end) >= self.follow_samples
+        if not silent and now - self._candidate_start < self.max_samples:
+            return None
+
+        return self._decide()
+
+    def _decide(self) -> Tuple[bool, str]:
+        """2단계: 후보 구간(+이어진 명령)을 음성 인식으로 확인"""
+        result = self._candidate
+        self._candidate = None
+        self._stage1_reset_pending = True
+
+        followed = self._last_voice > self._candidate_end + int(0.3 * self.sample_rate)
+        if not followed and result.cost <= self.accept_threshold:
+            self.stats.auto_accepts += 1
+            return True, result.word
+
+        # 웨이크워드만 말했으면 후보 창만, 명령이 이어졌으면 발화 끝까지
+        end = self.ring.written if followed else self._candidate_end
+        audio = self.ring.read(max(self._candidate_start, self.ring.oldest), end, copy=True)
+
+        self.stats.verification_calls += 1
+        try:
+            text = self.recognizer.transcribe_audio(audio, self.sample_rate, language="en")
+        except Exception as e:
+            # 확인 실패 시 1단계 판단으로 대체
+            print(f" → 확인 실패: {e}")
+            if result.cost <= self.spotter.threshold:
+                return True, result.word
+            return False, ""
+
+        if self.verify(text.lower().strip()):
+            self.stats.verified += 1
+            return True, text
+
+        self.stats.false_accepts += 1
+        return False, text
@@ -0,0 +1,311 @@
+"""
+웨이크워드 평가 모듈
+긴 라벨링 녹음으로 오감지율(FAR) / 미감지율(FRR) 곡선과 감지 지연을 측정합니다.
+
+- 1단계(로컬 키워드 스포터): 창마다 거리를 한 번만 계산해 두고 임계값을 바꿔 가며 곡선을 그립니다.
+  실제 스트림을 기다리지 않으므로 녹음 길이보다 훨씬 빨리 끝납니다.
+- 캐스케이드: WakeWordCascade에 녹음을 블록 단위로 흘려 보내 최종 판단과 음성 인식 호출 수를 셉니다.
+- 텍스트 규칙: 인식된 문장에 대해 _check_wake_word_flexible의 규칙(정확 / 앞 3자 /
+  띄어쓰기 무시 / "man", "tre" 같은 일부 매칭)이 각각 얼마나 오감지를 만드는지 집계합니다.
+
+라벨 파일은 Audacity 라벨 형식(시작\\t끝\\t이름, 초 단위) 또는 [[시작, 끝], ...] JSON입니다.
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.perception.audio_io import decode_wav
+from src.perception.keyword_spotter import KeywordSpotter
+from src.perception.wake_cascade import WakeWordCascade
+from src.perception.wake_word import MATCH_RULES, match_wake_word
+
+
+Event = Tuple[float, float]  # 웨이크워드 발화 (시작, 끝) 초
+
+
+def load_labels(path: str) -> List[Event]:
+    """
+    라벨 파일 읽기
+
+    Args:
+        path: Audacity 라벨 .txt 또는 JSON ([[start, end], ...] 또는 {"events": [...]})
+
+    Returns:
+        List[Event]: 시작 시각 순 (시작, 끝)
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    if path.endswith(".json"):
+        data = json.loads(content)
+        events = data["events"] if isinstance(data, dict) else data
+        return sorted((float(start), float(end)) for start, end in events)
+
+    events = []
+    for line in content.splitlines():
+        fields = line.split("\t")
+        if len(fields) >= 2 and fields[0].strip():
+            events.append((float(fields[0]), float(fields[1])))
+    return sorted(events)
+
+
+@dataclass
+class LabeledRecording:
+    """웨이크워드 위치가 표시된 녹음"""
+
+    audio: np.ndarray
+    sample_rate: int
+    events: List[Event]
+    name: str = "recording"
+
+    @property
+    def duration(self) -> float:
+        return len(self.audio) / self.sample_rate
+
+    @classmethod
+    def load(cls, wav_path: str, labels_path: Optional[str] = None) -> "LabeledRecording":
+        """
+        WAV + 라벨 파일 로드 (라벨 경로가 없으면 같은 이름의 .txt / .json)
+        """
+        if labels_path is None:
+            base = os.path.splitext(wav_path)[0]
+            labels_path = next((base + ext for ext in (".txt", ".json") if os.path.exists(base + ext)), None)
+            if labels_path is None:
+                raise FileNotFoundError(f"라벨 파일이 없습니다: {base}.txt / {base}.json")
+
+        audio, sample_rate = decode_wav(wav_path)
+        if audio.ndim == 2:
+            audio = audio.mean(axis=1).astype(np.int16)
+        return cls(audio, sample_rate, load_labels(labels_path), name=os.path.basename(wav_path))
+
+
+@dataclass
+class OperatingPoint:
+    """임계값 하나에서의 성능"""
+
+    threshold: float
+    detections: int
+    true_accepts: int
+    false_accepts: int
+    misses: int
+    far_per_hour: float             # 시간당 오감지 수
+    frr: float                      # 미감지 비율
+    latency: Dict[str, float] = field(default_factory=dict)  # 발화 끝 → 감지 (초, p50/p90/p99)
+
+
+def latency_percentiles(latencies: Sequence[float]) -> Dict[str, float]:
+    """지연 백분위수 (p50 / p90 / p99)"""
+    if len(latencies) == 0:
+        return {}
+    values = np.percentile(np.asarray(latencies), [50, 90, 99])
+    return {"p50": round(float(values[0]), 3), "p90": round(float(values[1]), 3), "p99": round(float(values[2]), 3)}
+
+
+def match_detections(times: Sequence[float], events: Sequence[Event], tolerance: float = 0.5):
+    """
+    감지 시각을 라벨과 대응
+
+    발화 시작 ~ 끝 + tolerance 사이의 첫 감지를 정답으로 보고, 나머지 감지는 모두 오감지입니다.
+
+    Returns:
+        (정답 감지의 지연 목록, 오감지 수, 미감지 수)
+    """
+    latencies = []
+    false_accepts = 0
+    matched = [False] * len(events)
+    for t in times:
+        for i, (start, end) in enumerate(events):
+            if not matched[i] and start <= t <= end + tolerance:
+                matched[i] = True
+                latencies.append(t - end)
+                break
+        else:
+            false_accepts += 1
+    return latencies, false_accepts, matched.count(False)
+
+
+class WakeWordEvaluator:
+    """
+    웨이크워드 오프라인 평가기
+
+    사용 예:
+        evaluator = WakeWordEvaluator(spotter)
+        times, costs = evaluator.score_windows(recording)
+        for point in evaluator.sweep(recording, times, costs):
+            print(point.threshold, point.far_per_hour, point.frr)
+    """
+
+    def __init__(self, spotter: KeywordSpotter, window: Optional[float] = None, hop: float = 0.2,
+                 cooldown: float = 1.0, tolerance: float = 0.5):
+        """
+        Args:
+            spotter: 평가할 키워드 스포터
+            window: 창 길이 (초, 기본: SlidingWindowSpotter와 같음)
+            hop: 창 간격 (초)
+            cooldown: 감지 후 다시 감지하지 않을 시간 (초)
+            tolerance: 발화 끝 뒤 이 시간 안의 감지까지 정답으로 인정 (초)
+        """
+        self.spotter = spotter
+        self.window = window or spotter.max_template_seconds + 0.5
+        self.hop = hop
+        self.cooldown = cooldown
+        self.tolerance = tolerance
+        self.realtime_factor = None  # 마지막 score_windows()의 (녹음 길이 / 처리 시간)
+
+    def score_windows(self, recording: LabeledRecording) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        모든 창의 거리 계산 (평가에서 가장 비싼 부분, 한 번만 수행)
+
+        Returns:
+            (창 끝 시각 배열 (초), 거리 배열)
+        """
+        sample_rate = recording.sample_rate
+        window = int(self.window * sample_rate)
+        hop = max(int(self.hop * sample_rate), 1)
+        ends = np.arange(hop, len(recording.audio) + 1, hop)
+
+        started = time.perf_counter()
+        costs = np.array([self.spotter.score(recording.audio[max(end - window, 0):end]).cost for end in ends])
+        elapsed = time.perf_counter() - started
+        self.realtime_factor = recording.duration / elapsed if elapsed > 0 else float("inf")
+        return ends / sample_rate, costs
+
+    def detections_at(self, times: np.ndarray, costs: np.ndarray, threshold: float) -> List[float]:
+        """임계값에서의 감지 시각 (SlidingWindowSpotter와 같은 쿨다운 적용)"""
+        detections = []
+        suppress_until = -np.inf
+        for t in times[costs <= threshold]:
+            if t >= suppress_until:
+                detections.append(float(t))
+                suppress_until = t + self.cooldown
+        return detections
+
+    def operating_point(self, recording: LabeledRecording, times: np.ndarray, costs: np.ndarray,
+                        threshold: float) -> OperatingPoint:
+        """임계값 하나의 FAR / FRR / 지연"""
+        detections = self.detections_at(times, costs, threshold)
+        return self._point(threshold, detections, recording)
+
+    def _point(self, threshold: float, detections: Sequence[float], recording: LabeledRecording,
+               tolerance: Optional[float] = None) -> OperatingPoint:
+        tolerance = self.tolerance if tolerance is None else tolerance
+        latencies, false_accepts, misses = match_detections(detections, recording.events, tolerance)
+        hours = recording.duration / 3600
+        return OperatingPoint(
+            threshold=threshold,
+            detections=len(detections),
+            true_accepts=len(latencies),
+            false_accepts=false_accepts,
+            misses=misses,
+            far_per_hour=false_accepts / hours if hours else 0.0,
+            frr=misses / len(recording.events) if recording.events else 0.0,
+            latency=latency_percentiles(latencies),
+        )
+
+    def sweep(self, recording: LabeledRecording, times: Optional[np.ndarray] = None,
+              costs: Optional[np.ndarray] = None, thresholds: Optional[Iterable[float]] = None) -> List[OperatingPoint]:
+        """
+        임계값별 FAR / FRR 곡선
+
+        Args:
+            recording: 라벨링 녹음
+            times, costs: score_windows() 결과 (없으면 계산)
+            thresholds: 평가할 임계값들 (기본: 현재 임계값의 0.5 ~ 2배)
+
+        Returns:
+            List[OperatingPoint]: 임계값 오름차순
+        """
+        if times is None or costs is None:
+            times, costs = self.score_windows(recording)
+        if thresholds is None:
+            thresholds = self.spotter.threshold * np.linspace(0.5, 2.0, 16)
+        return [self.operating_point(recording, times, costs, float(t)) for t in sorted(thresholds)]
+
+    def evaluate_cascade(self, cascade: WakeWordCascade, recording: LabeledRecording,
+                         blocksize: int = 1600) -> Tuple[OperatingPoint, Dict[str, int]]:
+        """
+        2단계 캐스케이드 전체를 녹음에 대해 실행 (음성 인식 포함)
+
+        Returns:
+            (최종 판단 기준 OperatingPoint, 캐스케이드 카운터)
+        """
+        cascade.reset()
+        before = cascade.stats.to_dict()
+        accepts = []
+        for start in range(0, len(recording.audio), blocksize):
+            cascade.write(recording.audio[start:start + blocksize])
+            decision = cascade.step()
+            if decision is not None and decision[0]:
+                accepts.append(cascade.ring.written / recording.sample_rate)
+
+        after = cascade.stats.to_dict()
+        counters = {key: after[key] - before[key] for key in after}
+        # 캐스케이드는 발화 끝 뒤 침묵을 기다리므로 허용 지연을 그만큼 늘림
+        tolerance = self.tolerance + cascade.follow_samples / recording.sample_rate
+        return self._point(float("nan"), accepts, recording, tolerance), counters
+
+
+def evaluate_text_rules(samples: Iterable[Tuple[str, bool]], wake_words: Sequence[str],
+                        endings: Sequence[str] = ()) -> Dict[str, Dict]:
+    """
+    인식된 문장에 대한 텍스트 매칭 규칙별 감지 / 오감지 집계
+
+    Args:
+        samples: (인식된 문장, 웨이크워드가 실제로 있었는지)
+        wake_words: 웨이크워드 리스트
+        endings: 일부 매칭 문자열 (WAKE_WORD_ENDINGS)
+
+    Returns:
+        {
+          "rules": {규칙: {"true_accepts", "false_accepts", "examples"}},
+          "endings": {일부 매칭 문자열: 오감지 수},
+          "cumulative": [{"rules", "far", "frr"}, ...]  # 엄격한 규칙부터 하나씩 추가했을 때
+          "positives", "negatives"
+        }
+    """
+    samples = [(text.lower().strip(), bool(is_wake)) for text, is_wake in samples]
+    positives = sum(1 for _, is_wake in samples if is_wake)
+    negatives = len(samples) - positives
+
+    rules = {rule: {"true_accepts": 0, "false_accepts": 0, "examples": []} for rule in MATCH_RULES}
+    ending_false_accepts = {ending: 0 for ending in endings}
+    first_rule = []
+    for text, is_wake in samples:
+        match = match_wake_word(text, wake_words, endings)
+        first_rule.append(match[0] if match else None)
+        if match is None:
+            continue
+        rule, matched = match
+        if is_wake:
+            rules[rule]["true_accepts"] += 1
+        else:
+            rules[rule]["false_accepts"] += 1
+            rules[rule]["examples"].append(text)
+            if rule == "ending":
+                ending_false_accepts[matched] += 1
+
+    # 규칙을 엄격한 순서로 하나씩 허용했을 때 (앞 규칙이 먼저 적용되므로 누적합과 같음)
+    cumulative = []
+    for i in range(len(MATCH_RULES)):
+        allowed = set(MATCH_RULES[:i + 1])
+        accepted = [rule in allowed for rule in first_rule]
+        false_accepts = sum(1 for ok, (_, is_wake) in zip(accepted, samples) if ok and not is_wake)
+        misses = sum(1 for ok, (_, is_wake) in zip(accepted, samples) if not ok and is_wake)
+        cumulative.append({
+            "rules": "+".join(MATCH_RULES[:i + 1]),
+            "far": round(false_accepts / negatives, 3) if negatives else 0.0,
+            "frr": round(misses / positives, 3) if positives else 0.0,
+        })
+
+    return {
+        "rules": rules,
+        "endings": ending_false_accepts,
+        "cumulative": cumulative,
+        "positives": positives,
+        "negatives": negatives,
+    }
@@ -3,12 +3,69 @@
 "아트레이디스" / "Atreides" 감지
 """
 
-import sounddevice as sd
 import numpy as np
-from scipy.io.wavfile import write
-import tempfile
+import re
 import time
 
+from src.perception.audio_device import SoundDeviceInput
+from src.perception.keyword_spotter import SlidingWindowSpotter
+from src.perception.ring_buffer import AudioRingBuffer
+from src.perception.vad import MIN_SPEECH_DB, VoiceActivityDetector, volume_to_db
+from src.perception.wake_cascade import CascadeStats, WakeWordCascade
+
+
+# 웨이크워드 일부만 인식된 경우 ("비스", "트레" 등) - SmartWakeWordDetector의 가장 느슨한 규칙
+WAKE_WORD_ENDINGS = ["비스", "vis", "트레", "tre", "맨", "man", "자비", "jarv"]
+
+# 매칭 규칙 (엄격한 순서)
+MATCH_RULES = ("exact", "prefix", "no_space", "ending")
+
+
+def _pause(low_power, seconds):
+    """감지 루프 대기 (저전력 idle이면 소리가 날 때까지 잠듦)"""
+    if low_power is not None and not low_power.active:
+        low_power.wait_active(1.0)
+    else:
+        time.sleep(seconds)
+
+
+def match_wake_word(text, wake_words, endings=()):
+    """
+    인식된 텍스트에서 웨이크워드 찾기
+
+    규칙은 엄격한 것부터 적용합니다.
+    - exact: 웨이크워드가 그대로 포함
+    - prefix: 웨이크워드 앞 3자가 포함 (3자 이상인 단어만)
+    - no_space: 띄어쓰기를 무시하면 포함
+    - ending: endings 중 하나가 포함
+
+    Args:
+        text: 인식된 텍스트 (소문자)
+        wake_words: 웨이크워드 리스트
+        endings: 일부 매칭 문자열 (비어 있으면 ending 규칙 사용 안 함)
+
+    Returns:
+        (규칙, 매칭된 웨이크워드/문자열) 또는 None
+    """
+    for wake_word in wake_words:
+        if wake_word.lower() in text:
+            return "exact", wake_word
+
+    text_no_space = text.replace(" ", "")
+    for wake_word in wake_words:
+        wake_lower = wake_word.lower()
+        if len(wake_lower) >= 3:
+            if wake_lower[:3] in text:
+                return "prefix", wake_word
+            if wake_lower in text_no_space:
+                return "no_space", wake_word
+
+    for ending in endings:
+        if ending in text:
+            return "ending", ending
+
+    return None
+
 
 class WakeWordDetector:
     """
@@ -16,13 +73,23 @@ class WakeWordDetector:
     연속으로 듣다가 특정 단어 감지
     """
 
-    def __init__(self, recognizer, wake_words=None):
+    def __init__(self, recognizer, wake_words=None, spotter=None, capture=None, device=None, low_power=None):
         """
         Args:
             recognizer: SpeechRecognizer 인스턴스
             wake_words: 감지할 단어 리스트
+            spotter: 로컬 KeywordSpotter (있으면 음성 인식 API 없이 감지)
+            capture: 공유 AudioCaptureService (있으면 스트림을 새로 열지 않음)
+            device: 입력 장치 (기본: 실제 마이크, capture가 있으면 capture의 장치)
+            low_power: capture 위의 LowPowerListener (있으면 조용할 때 감지를 쉼)
         """
         self.recognizer = recognizer
+        self.spotter = spotter
+        self.capture = capture
+        self.low_power = low_power
+        if capture is not None:
+            device = capture.device
+        self.device = device if device is not None else SoundDeviceInput()
         self.wake_words = wake_words or [
             # 기본 이름들
             "자비스",
@@ -35,16 +102,35 @@ class WakeWordDetector:
             "아트레",
             "아이언맨",
         ]
-        self.sample_rate = 16000
+        self.sample_rate = capture.sample_rate if capture is not None else 16000
         self.is_listening = False
-
-    def listen_for_wake_word(self, chunk_duration=3.0, timeout=60.0):
+        self.vad = VoiceActivityDetector(self.sample_rate)
+
+    def _open_stream(self, callback):
+        """저전력 구독, 공유 캡처 서비스 구독 또는 전용 InputStream"""
+        if self.low_power is not None:
+            return self.low_power.listen(callback)
+        if self.capture is not None:
+            return self.capture.listen(callback)
+        return self.device.input_stream(
+            samplerate=self.sample_rate,
+            channels=1,
+            callback=callback,
+            dtype='int16',
+            blocksize=1600
+        )
+
+    def listen_for_wake_word(self, chunk_duration=3.0, timeout=60.0, hop=None):
         """
         웨이크워드를 계속 듣기
 
+        스트림은 한 번 열어 두고 계속 캡처하며, hop 간격으로 최근 창을 겹쳐 검사합니다.
+        창 경계에 걸친 단어나 인식 중에 말한 단어도 다음 창에 포함됩니다.
+
         Args:
-            chunk_duration: 한 번에 녹음할 시간 (초)
+            chunk_duration: 음성 인식으로 검사할 창 길이 (초)
             timeout: 최대 대기 시간 (초)
+            hop: 창 간격 (초, 기본: 로컬 스포터 0.2초 / 음성 인식 chunk_duration의 절반)
 
         Returns:
             bool: 웨이크워드 감지 여부
@@ -53,50 +139,88 @@ class WakeWordDetector:
         print(f"   '{self.wake_words[0]}'라고 말하세요")
         print("   (Ctrl+C로 종료)\n")
 
+        if self.spotter is not None:
+            return self._listen_local(timeout, hop or 0.2)
+
+        hop_samples = int((hop or chunk_duration / 2) * self.sample_rate)
+        window_samples = int(chunk_duration * self.sample_rate)
+        ring = AudioRingBuffer(window_samples + hop_samples + self.sample_rate)
+        vad = self.vad
+        vad.reset()
+
+        def callback(indata, frames, time_info, status):
+            ring.write(indata)
+            vad.process(indata)
+
         start_time = time.time()
+        next_hop = window_samples
+        analyzed = 0  # 마지막으로 검사한 창의 끝 위치
 
-        while time.time() - start_time < timeout:
-            try:
-                # 짧은 오디오 녹음
-                audio_data = sd.rec(
-                    int(chunk_duration * self.sample_rate),
-                    samplerate=self.sample_rate,
-                    channels=1,
-                    dtype='int16'
-                )
-                sd.wait()
-
-                # 볼륨 체크 (너무 조용하면 스킵)
-                volume = np.abs(audio_data).mean()
-                if volume < 300:  # 조용함
-                    print(".", end="", flush=True)
-                    continue
-
-                print("\n🎤 소리 감지, 인식 중...", end="", flush=True)
-
-                # 임시 파일로 저장
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-                write(temp_file.name, self.sample_rate, audio_data)
-
-                # 음성 인식
-                try:
-                    text = self.recognizer.transcribe_file(temp_file.name, language="en")
-                    text_lower = text.lower().strip()
-
-                    print(f" → '{text}'")
-
-                    # 웨이크워드 확인 (유연한 매칭)
-                    if self._check_wake_word(text_lower):
-                        return True
+        try:
+            with self._open_stream(callback):
+                while time.time() - start_time < timeout:
+                    if self.low_power is not None and (vad.last_speech_sample or 0) > analyzed:
+                        self.low_power.touch()  # 말소리가 검사될 때까지 idle로 가지 않음
+                    if ring.written < next_hop:
+                        _pause(self.low_power, 0.05)
+                        continue
+                    # 인식이 밀렸으면 가장 최근 창으로 건너뜀
+                    next_hop = max(next_hop + hop_samples, ring.written)
+                    analyzed = ring.written
+
+                    # 창 안에 말소리가 없으면 스킵 (VAD와 링 버퍼는 같은 위치 기준)
+                    last_speech = vad.last_speech_sample
+                    if last_speech is None or last_speech <= ring.written - window_samples:
+                        print(".", end="", flush=True)
+                        continue
+
+                    audio_data = ring.latest(window_samples, copy=True)
+
+                    print("\n🎤 소리 감지, 인식 중...", end="", flush=True)
+
+                    # 음성 인식 (메모리에서 바로 전달, 그동안에도 캡처는 계속됨)
+                    try:
+                        text = self.recognizer.transcribe_audio(audio_data, self.sample_rate, language="en")
+                        text_lower = text.lower().strip()
 
-                    print("   (웨이크워드 아님, 계속 대기...)")
+                        print(f" → '{text}'")
 
-                except Exception as e:
-                    print(f" → 인식 실패: {e}")
+                        # 웨이크워드 확인 (유연한 매칭)
+                        if self._check_wake_word(text_lower):
+                            return True
 
-            except KeyboardInterrupt:
-                print("\n\n중단됨")
-                return False
+                        print("   (웨이크워드 아님, 계속 대기...)")
+
+                    except Exception as e:
+                        print(f" → 인식 실패: {e}")
+
+        except KeyboardInterrupt:
+            print("\n\n중단됨")
+            return False
+
+        print("\n⏱️  타임아웃")
+        return False
+
+    def _listen_local(self, timeout, hop):
+        """로컬 키워드 스포터로 겹치는 창 감지 (API 호출 없음)"""
+        stream = SlidingWindowSpotter(self.spotter, hop=hop)
+
+        def callback(indata, frames, time_info, status):
+            stream.write(indata)
+
+        start_time = time.time()
+        try:
+            with self._open_stream(callback):
+                while time.time() - start_time < timeout:
+                    result = stream.poll()
+                    if result is not None:
+                        print(f"\n✅ 웨이크워드 감지: '{result.word}' (로컬, 거리 {result.cost:.2f})")
+                        return True
+                    _pause(self.low_power, 0.02)
+
+        except KeyboardInterrupt:
+            print("\n\n중단됨")
+            return False
 
         print("\n⏱️  타임아웃")
         return False
@@ -111,30 +235,14 @@ class WakeWordDetector:
         Returns:
             bool: 웨이크워드 포함 여부
         """
-        # 정확한 매칭
-        for wake_word in self.wake_words:
-            if wake_word.lower() in text:
-                print(f"\n✅ 웨이크워드 감지: '{wake_word}' (정확)")
-                return True
-
-        # 부분 매칭 (유사도)
-        for wake_word in self.wake_words:
-            wake_lower = wake_word.lower()
-
-            # 길이가 3자 이상인 경우만 부분 매칭
-            if len(wake_lower) >= 3:
-                # 웨이크워드의 앞 3자가 포함되어 있으면 인정
-                if wake_lower[:3] in text:
-                    print(f"\n✅ 웨이크워드 감지: '{wake_word}' (부분 매칭)")
-                    return True
-
-                # 띄어쓰기 무시 매칭
-                text_no_space = text.replace(" ", "")
-                if wake_lower in text_no_space:
-                    print(f"\n✅ 웨이크워드 감지: '{wake_word}' (띄어쓰기 무시)")
-                    return True
+        match = match_wake_word(text, self.wake_words)
+        if match is None:
+            return False
 
-        return False
+        rule, wake_word = match
+        label = {"exact": "정확", "prefix": "부분 매칭", "no_space": "띄어쓰기 무시"}[rule]
+        print(f"\n✅ 웨이크워드 감지: '{wake_word}' ({label})")
+        return True
 
     def continuous_listen(self, on_wake_word_detected):
         """
@@ -175,104 +283,251 @@ class SmartWakeWordDetector:
     침묵 감지 + 볼륨 기반 활성화
     """
 
-    def __init__(self, recognizer, wake_words=None):
+    def __init__(self, recognizer, wake_words=None, max_utterance=10.0, capture=None, spotter=None,
+                 candidate_threshold=None, accept_threshold=0.0, device=None, low_power=None):
         """
         Args:
             recognizer: SpeechRecognizer 인스턴스
             wake_words: 감지할 단어 리스트
+            max_utterance: 한 번에 녹음할 최대 발화 길이 (초)
+            capture: 공유 AudioCaptureService (있으면 스트림을 새로 열지 않음)
+            spotter: 로컬 KeywordSpotter (있으면 2단계 캐스케이드: 로컬 후보 → 후보 구간만 음성 인식으로 확인)
+            candidate_threshold: 1단계 후보 임계값 (기본: spotter.threshold)
+            accept_threshold: 1단계 거리가 이 이하이면 음성 인식 확인 생략
+            device: 입력 장치 (기본: 실제 마이크, capture가 있으면 capture의 장치)
+            low_power: capture 위의 LowPowerListener (있으면 조용할 때 감지를 쉼)
         """
         self.recognizer = recognizer
+        self.spotter = spotter
+        self.low_power = low_power
         self.wake_words = wake_words or [
             "자비스", "jarvis", "제비스",
             "아트레이디스", "atreides", "아트레이데스", "아트레",
             "아이언맨",
         ]
-        self.sample_rate = 16000
-        self.recording_buffer = []
-
-    def listen_smart(self, max_silence=2.0, min_volume=400):
+        self.capture = capture
+        if capture is not None:
+            device = capture.device
+        self.device = device if device is not None else SoundDeviceInput()
+        self.sample_rate = capture.sample_rate if capture is not None else 16000
+        self.max_utterance = max_utterance
+        # 마지막 발화가 끝난 캡처 서비스 위치 (명령 녹음의 pre-roll 기준)
+        self.last_utterance_end = None
+        # 미리 할당된 녹음 버퍼 (발화 최대 길이 + 블록 하나)
+        self.ring = AudioRingBuffer.for_duration(max_utterance + 0.1, self.sample_rate)
+
+        # 모든 녹음 경로가 같은 VAD를 공유 (노이즈 플로어 추정 유지)
+        self.vad = VoiceActivityDetector(self.sample_rate)
+
+        # 단계별 카운터 (스포터가 없으면 소리가 난 발화마다 음성 인식 호출)
+        self.stats = CascadeStats()
+        self.cascade = None
+        if spotter is not None:
+            self.cascade = WakeWordCascade(
+                spotter,
+                recognizer,
+                verify=self._check_wake_word_flexible,
+                sample_rate=self.sample_rate,
+                candidate_threshold=candidate_threshold,
+                accept_threshold=accept_threshold,
+                max_utterance=max_utterance,
+                vad=self.vad,
+                stats=self.stats,
+            )
+
+    def listen_smart(self, max_silence=2.0, min_volume=None):
         """
-        스마트 녹음: 소리가 시작되면 녹음, 침묵이 지속되면 분석
+        스마트 녹음: 말소리가 시작되면 녹음, 침묵이 지속되면 분석
 
         Args:
-            max_silence: 침묵 지속 시간 (초)
-            min_volume: 최소 볼륨 임계값
+            max_silence: 발화 후 침묵 지속 시간 (초)
+            min_volume: 최소 볼륨 (int16 평균 절댓값, 주면 적응형 VAD의 절대 하한으로 사용)
 
         Returns:
             tuple: (detected, text) - 웨이크워드 감지 여부와 인식된 텍스트
         """
         print("\n👂 대기 중... (말씀하세요)", end="", flush=True)
 
-        self.recording_buffer = []
-        silence_chunks = 0
-        max_silence_chunks = int(max_silence * 10)  # 0.1초 단위
+        vad = self.vad
+        vad.min_speech_db = volume_to_db(min_volume) if min_volume else MIN_SPEECH_DB
+
+        if self.cascade is not None:
+            return self._listen_cascade()
+
+        ring = self.ring
+        ring.clear()
+        vad.reset()
+        max_samples = int(self.max_utterance * self.sample_rate)
         is_recording = False
 
         def callback(indata, frames, time_info, status):
-            nonlocal silence_chunks, is_recording
-
-            volume = np.abs(indata).mean()
-
-            if volume > min_volume:
-                # 소리 감지
-                if not is_recording:
-                    print("\n🎤 녹음 중...", end="", flush=True)
-                    is_recording = True
-                self.recording_buffer.append(indata.copy())
-                silence_chunks = 0
-            else:
-                # 침묵
-                if is_recording:
-                    self.recording_buffer.append(indata.copy())
-                    silence_chunks += 1
+            nonlocal is_recording
+
+            ring.write(indata)
+            vad.process(indata)
+
+            if vad.speech_started and not is_recording:
+                print("\n🎤 녹음 중...", end="", flush=True)
+                is_recording = True
 
         try:
-            with sd.InputStream(
-                samplerate=self.sample_rate,
-                channels=1,
-                callback=callback,
-                dtype='int16',
-                blocksize=1600  # 0.1초
-            ):
+            with self._open_stream(callback):
                 while True:
-                    time.sleep(0.1)
-
-                    # 침묵이 지속되고 녹음된 데이터가 있으면 분석
-                    if is_recording and silence_chunks > max_silence_chunks:
+                    _pause(self.low_power, 0.1)
+                    if is_recording and self.low_power is not None:
+                        self.low_power.touch()  # 발화 끝을 판단할 때까지 idle로 가지 않음
+
+                    # 침묵이 지속되거나 최대 길이에 도달하면 분석
+                    if is_recording and (
+                        vad.endpoint(max_silence)
+                        or ring.written - vad.utterance_start_sample >= max_samples
+                    ):
                         break
 
         except KeyboardInterrupt:
             return False, ""
 
-        if not self.recording_buffer:
+        if self.capture is not None:
+            self.last_utterance_end = self.capture.position
+
+        if not is_recording:
             return False, ""
 
         print(" 처리 중...", end="", flush=True)
+        self.stats.candidates += 1
+        self.stats.verification_calls += 1
 
-        # 오디오 데이터 결합
-        audio_data = np.concatenate(self.recording_buffer, axis=0)
+        # 발화 구간만 복사 (버퍼는 다음 호출에서 재사용)
+        audio_data = ring.read(max(vad.utterance_start_sample, ring.oldest), copy=True)
 
-        # 임시 파일로 저장
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-        write(temp_file.name, self.sample_rate, audio_data)
-
-        # 음성 인식
+        # 음성 인식 (메모리에서 바로 전달)
         try:
-            text = self.recognizer.transcribe_file(temp_file.name, language="en")
+            text = self.recognizer.transcribe_audio(audio_data, self.sample_rate, language="en")
             text_lower = text.lower().strip()
 
             print(f" → '{text}'")
 
             # 웨이크워드 확인 (유연한 매칭)
             if self._check_wake_word_flexible(text_lower):
+                self.stats.verified += 1
                 return True, text
 
+            self.stats.false_accepts += 1
             return False, text
 
         except Exception as e:
             print(f" → 인식 실패: {e}")
             return False, ""
 
+    def _open_stream(self, callback):
+        """저전력 구독, 공유 캡처 서비스 구독 또는 전용 InputStream (블록 0.1초)"""
+        if self.low_power is not None:
+            return self.low_power.listen(callback)
+        if self.capture is not None:
+            return self.capture.listen(callback)
+        return self.device.input_stream(
+            samplerate=self.sample_rate,
+            channels=1,
+            callback=callback,
+            dtype='int16',
+            blocksize=1600
+        )
+
+    def _listen_cascade(self):
+        """
+        2단계 캐스케이드로 듣기
+
+        1단계(로컬)는 블록이 들어올 때마다 겹치는 창을 점수 매기고,
+        후보가 나오면 그 구간(명령이 이어지면 발화 끝까지)만 음성 인식으로 확인합니다.
+
+        Returns:
+            tuple: (detected, text)
+        """
+        cascade = self.cascade
+        cascade.reset()
+
+        def callback(indata, frames, time_info, status):
+            cascade.write(indata)
+
+        decision = None
+        announced = False
+        try:
+            with self._open_stream(callback):
+                while decision is None:
+                    _pause(self.low_power, 0.02)
+                    decision = cascade.step()
+                    if cascade.has_candidate:
+                        if self.low_power is not None:
+                            self.low_power.touch()  # 후보 확인이 끝날 때까지 idle로 가지 않음
+                        if not announced:
+                            print("\n🎤 후보 감지, 확인 중...", end="", flush=True)
+                            announced = True
+
+        except KeyboardInterrupt:
+            return False, ""
+
+        if self.capture is not None:
+            self.last_utterance_end = self.capture.position
+
+        detected, text = decision
+        if text:
+            print(f" → '{text}'")
+        return detected, text
+
+    def strip_wake_word(self, text):
+        """
+        인식된 텍스트에서 웨이크워드를 제거하고 명령 반환
+
+        "Jarvis, pick up the red block" → "pick up the red block"
+        "Pick up the red block, Jarvis." → "Pick up the red block" (웨이크워드 뒤가 비면 앞부분)
+
+        웨이크워드는 단어 단위로만 찾습니다 (한국어 조사 "자비스야"는 허용).
+        감지에 쓰는 앞 3자 매칭은 잘못 알아들은 호칭("Jarvy, ...")만 잡도록 부르는 자리에만 적용합니다.
+        소유격/축약형("Jarvis's")은 부르는 말이 아니므로 지우지 않고 문장 전체를 명령으로 봅니다.
+
+        Args:
+            text: 인식된 텍스트
+
+        Returns:
+            str: 명령 (없으면 빈 문자열)
+        """
+        tokens = list(re.finditer(r"[\w']+", text))
+        wake_words = [w.lower() for w in self.wake_words]
+        prefixes = [w[:3] for w in wake_words if len(w) >= 3]
+
+        def is_exact(word):
+            # 웨이크워드 그대로, 또는 뒤에 한국어 조사
+            return any(word == w or (word.startswith(w) and not word[len(w):].isascii()) for w in wake_words)
+
+        def is_possessive(word):
+            return word.endswith("'s") and is_exact(word[:-2])
+
+        words = [token.group(0).lower().strip("'") if not is_possessive(token.group(0).lower())
+                 else token.group(0).lower() for token in tokens]
+
+        def is_fuzzy(i):
+            # 부르는 자리(첫 단어, 또는 뒤에 쉼표/느낌표/물음표)의 앞 3자 매칭 ("jar" 같은 일반 단어는 제외)
+            word = words[i]
+            if is_possessive(word) or not any(word.startswith(p) and len(word) > len(p) for p in prefixes):
+                return False
+            return i == 0 or re.match(r"\s*[,!?]", text[tokens[i].end():]) is not None
+
+        index = next((i for i, word in enumerate(words) if is_exact(word)), None)
+        if index is None:
+            index = next((i for i in range(len(tokens)) if is_fuzzy(i)), None)
+
+        if index is None:
+            if any(is_possessive(word) for word in words):
+                return text.strip()
+            return ""
+
+        # 웨이크워드 주변 구두점/공백 제거 ("Jarvis, ..." / "..., Jarvis.")
+        after = re.sub(r"^[\s,.!?~:;'-]+", "", text[tokens[index].end():]).strip()
+        if re.search(r"\w", after):
+            return after
+        before = re.sub(r"[\s,.!?~:;'-]+$", "", text[:tokens[index].start()]).strip()
+        return before if re.search(r"\w", before) else ""
+
     def _check_wake_word_flexible(self, text):
         """
         웨이크워드 유연한 매칭
@@ -283,31 +538,15 @@ class SmartWakeWordDetector:
         Returns:
             bool: 웨이크워드 포함 여부
         """
-        # 정확한 매칭
-        for wake_word in self.wake_words:
-            if wake_word.lower() in text:
-                print(f" ✅ '{wake_word}'")
-                return True
-
-        # 부분 매칭
-        for wake_word in self.wake_words:
-            wake_lower = wake_word.lower()
-
-            if len(wake_lower) >= 3:
-                # 앞 3자 포함
-                if wake_lower[:3] in text:
-                    print(f" ✅ '{wake_word}' (부분)")
-                    return True
-
-                # 띄어쓰기 무시
-                text_no_space = text.replace(" ", "")
-                if wake_lower in text_no_space:
-                    print(f" ✅ '{wake_word}' (띄어쓰기 무시)")
-                    return True
-
-        # 특수 케이스: "비스" 또는 "트레" 같은 부분만 인식
-        if any(ending in text for ending in ["비스", "vis", "트레", "tre", "맨", "man", "자비", "jarv"]):
-            print(f" ✅ '웨이크워드' (일부 매칭)")
-            return True
+        match = match_wake_word(text, self.wake_words, WAKE_WORD_ENDINGS)
+        if match is None:
+            return False
 
-        return False
+        rule, wake_word = match
+        if rule == "ending":
+            # 특수 케이스: "비스" 또는 "트레" 같은 부분만 인식
+            print(f" ✅ '웨이크워드' (일부 매칭)")
+        else:
+            label = {"exact": "", "prefix": " (부분)", "no_space": " (띄어쓰기 무시)"}[rule]
+            print(f" ✅ '{wake_word}'{label}")
+        return True
@@ -0,0 +1,976 @@
+"""
+오디오 처리 파이프라인 테스트
+마이크/API 없이 합성 신호로 실행됩니다.
+"""
+
+import io
+import os
+import struct
+import threading
+import time
+import wave
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.perception.audio_device import AudioInputDevice, AudioOutputDevice, SimulatedInputDevice, SimulatedOutputDevice
+from src.perception.audio_io import decode_wav, encode_wav
+from src.perception.capture_service import AudioCaptureService
+from src.perception.features import mfcc
+from src.perception.frontend import FeatureFrontEnd
+from src.perception.audio_prep import UploadPreprocessor
+from src.perception.keyword_spotter import KeywordSpotter, SlidingWindowSpotter
+from src.perception.low_power import EnergyActivityDetector, LowPowerListener
+from src.perception.microphone import MicrophoneRecorder
+from src.perception.ring_buffer import AudioRingBuffer
+from src.perception.speech_recognizer import SpeechRecognizer
+from src.perception.streaming_stt import ChunkedStreamingAdapter, StreamingRecognizer, ToneVocabularyBackend, merge_words
+from src.perception.stt_backends import STTBackend, create_backend
+from src.perception.stt_cache import TranscriptionCache
+from src.perception import text_to_speech
+from src.perception.text_to_speech import PCM_SAMPLE_RATE, TextToSpeech, split_sentences
+from src.perception.vad import VoiceActivityDetector
+from src.perception.wake_cascade import WakeWordCascade
+from src.perception.wake_eval import LabeledRecording, WakeWordEvaluator, evaluate_text_rules
+from src.perception.wake_word import WAKE_WORD_ENDINGS, SmartWakeWordDetector
+
+
+SAMPLE_RATE = 16000
+
+
+def tone(seconds, freq=440.0, amplitude=8000):
+    """테스트용 사인파 (int16)"""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.int16)
+
+
+def test_wav_roundtrip_in_memory():
+    """WAV 인코딩/디코딩이 메모리에서 손실 없이 동작"""
+    audio = tone(0.5).reshape(-1, 1)
+    data = encode_wav(audio, SAMPLE_RATE)
+    assert data[:4] == b"RIFF"
+
+    decoded, sample_rate = decode_wav(data)
+    assert sample_rate == SAMPLE_RATE
+    assert np.array_equal(decoded, audio[:, 0])
+    print("✓ 메모리 WAV 인코딩")
+
+
+def test_transcribe_audio_without_files():
+    """transcribe_audio는 파일 없이 바이트로 업로드"""
+    uploads = []
+
+    def create(**kwargs):
+        uploads.append(kwargs["file"])
+        return " hello "
+
+    recognizer = SpeechRecognizer(api_key="test")
+    recognizer.client = SimpleNamespace(audio=SimpleNamespace(transcriptions=SimpleNamespace(create=create)))
+
+    assert recognizer.transcribe_audio(tone(0.2), SAMPLE_RATE) == "hello"
+    assert uploads[0].name == "audio.wav"
+    assert uploads[0].getvalue()[:4] == b"RIFF"
+    print("✓ 파일 없는 음성 인식 경로")
+
+
+def test_ring_buffer_wraparound_zero_copy():
+    """링 버퍼: 경계를 넘어도 최근 N개 샘플을 복사 없이 연속 뷰로 반환"""
+    ring = AudioRingBuffer(capacity=1000)
+    reference = np.arange(3500) % 30000
+    for start in range(0, 3500, 300):
+        ring.write(reference[start:start + 300].astype(np.int16))
+
+    assert ring.written == 3500
+    view = ring.latest(1000)
+    assert np.shares_memory(view, ring._data)
+    assert np.array_equal(view[:, 0], reference[-1000:])
+
+    chunk, position = ring.read_since(3200)
+    assert position == 3500
+    assert np.array_equal(chunk[:, 0], reference[3200:])
+
+    try:
+        ring.read(100, 200)
+        assert False, "덮어써진 구간은 읽을 수 없어야 함"
+    except ValueError:
+        pass
+    print("✓ 링 버퍼")
+
+
+def synthetic_word(freqs, speed=1.0, seed=0):
+    """음절 대신 짧은 톤을 이어 붙인 합성 '단어' (int16)"""
+    rng = np.random.default_rng(seed)
+    signal = np.concatenate([tone(0.15 * speed, f).astype(np.float64) for f in freqs])
+    return (signal + rng.normal(0, 300, len(signal))).astype(np.int16)
+
+
+def background(seconds, seed=1):
+    """배경 잡음 (int16)"""
+    return np.random.default_rng(seed).normal(0, 300, int(seconds * SAMPLE_RATE)).astype(np.int16)
+
+
+KEYWORD = [300, 900, 600, 1200]
+
+
+def enrolled_spotter():
+    spotter = KeywordSpotter(SAMPLE_RATE)
+    for i, speed in enumerate((0.9, 1.0, 1.1)):
+        spotter.enroll("jarvis", synthetic_word(KEYWORD, speed, seed=i))
+    spotter.calibrate()
+    return spotter
+
+
+def test_capture_pre_roll_and_overrun():
+    """캡처 서비스: pre-roll은 기준 위치 이전 오디오를 그대로 포함, 버퍼가 넘치면 오래된 오디오부터 버림"""
+    ramp = (np.arange(3 * SAMPLE_RATE) - 24000).astype(np.int16)  # 샘플마다 값이 달라 위치 확인 가능
+
+    capture = AudioCaptureService(device=SimulatedInputDevice(ramp, speed=0, tail="stop"),
+                                  buffer_seconds=1.0, echo_suppression=False)
+    with capture:
+        assert capture.wait_for(len(ramp), timeout=5.0)
+
+        # 기준 위치 0.25초 전부터 현재까지
+        mark = len(ramp) - SAMPLE_RATE // 2
+        audio = capture.record(0.0, start=mark, pre_roll=0.25)
+        assert np.array_equal(audio[:, 0], ramp[mark - SAMPLE_RATE // 4:])
+
+        # 1초 버퍼에 3초를 썼으므로 앞의 2초는 버려지고 가장 오래된 위치로 잘림
+        assert capture.ring.oldest == len(ramp) - SAMPLE_RATE
+        audio = capture.record(0.0, start=0, pre_roll=0.5)
+        assert np.array_equal(audio[:, 0], ramp[-SAMPLE_RATE:])
+        assert np.array_equal(capture.snapshot(5.0)[:, 0], ramp[-SAMPLE_RATE:])
+    print("✓ 캡처 pre-roll / 오래된 오디오 버림")
+
+
+def test_keyword_spotter_local_detection():
+    """키워드 스포터: 등록한 단어는 긴 창 안에서도 감지, 다른 소리는 거부"""
+    keyword = KEYWORD
+    spotter = enrolled_spotter()
+
+    # 앞뒤 잡음 + 약간 빠르고 작은 목소리
+    quiet = (synthetic_word(keyword, 1.05, seed=9) * 0.3).astype(np.int16)
+    window = np.concatenate([background(1.0), quiet, background(1.0)])
+    assert spotter.detect(window) == "jarvis"
+
+    other = np.concatenate([background(1.0), synthetic_word([1500, 400, 2000, 700]), background(1.0)])
+    assert spotter.detect(other) is None
+    assert spotter.detect(background(2.0)) is None
+    assert spotter.detect(tone(2.0)) is None
+    print("✓ 로컬 키워드 스포터")
+
+
+def test_sliding_window_across_chunk_boundary():
+    """겹치는 창: 3초 청크 경계에 걸친 단어도 한 번만, 말이 끝나자마자 감지"""
+    word = synthetic_word(KEYWORD, seed=5)
+    offset = 2.7  # 기존 3초 청크 방식이면 두 청크로 잘리는 위치
+    recording = np.concatenate([background(offset), word, background(3.0, seed=2)])
+
+    stream = SlidingWindowSpotter(enrolled_spotter(), hop=0.1)
+    detections = stream.process(recording)
+
+    assert len(detections) == 1
+    detected_at, result = detections[0]
+    word_end = offset + len(word) / SAMPLE_RATE
+    assert result.word == "jarvis"
+    assert word_end - 0.2 <= detected_at <= word_end + 0.5
+    print(f"✓ 겹치는 창 감지 (단어 끝 후 {detected_at - word_end:.2f}초)")
+
+
+class ScriptedRecognizer:
+    """transcribe_audio 호출을 기록하고 정해진 텍스트를 반환"""
+
+    def __init__(self, text):
+        self.text = text
+        self.calls = []
+
+    def transcribe_audio(self, audio, sample_rate=16000, language="en"):
+        self.calls.append(len(audio) / sample_rate)
+        return self.text
+
+
+def run_cascade(cascade, recording, blocksize=1600):
+    """녹음을 블록 단위로 흘려 보내며 첫 판단 반환"""
+    for start in range(0, len(recording), blocksize):
+        cascade.write(recording[start:start + blocksize])
+        decision = cascade.step()
+        if decision is not None:
+            return decision
+    return None
+
+
+def test_cascade_verifies_only_candidates():
+    """캐스케이드: 웨이크워드가 아닌 소리는 음성 인식 없이 거부, 후보는 짧은 구간만 확인"""
+    recognizer = ScriptedRecognizer("Jarvis.")
+    cascade = WakeWordCascade(enrolled_spotter(), recognizer, verify=lambda text: "jarvis" in text)
+
+    chatter = np.concatenate([synthetic_word([1500, 400, 2000, 700], seed=s) for s in range(5)])
+    recording = np.concatenate([background(1.0), chatter, background(1.0),
+                                synthetic_word(KEYWORD, seed=7), background(2.0)])
+    assert run_cascade(cascade, recording) == (True, "Jarvis.")
+    assert len(recognizer.calls) == 1
+    assert recognizer.calls[0] <= cascade.stage1.window + 0.01
+    assert cascade.stats.candidates == 1 and cascade.stats.verified == 1
+    assert cascade.stats.windows_scored > 20
+
+    # 2단계가 거부하면 false accept로 집계
+    rejecting = ScriptedRecognizer("hello there")
+    cascade = WakeWordCascade(enrolled_spotter(), rejecting, verify=lambda text: "jarvis" in text)
+    assert run_cascade(cascade, recording) == (False, "hello there")
+    assert cascade.stats.false_accepts == 1
+
+    # 판단(감지 스레드)은 1단계 버퍼를 건드리지 않고, 다음 write()(오디오 스레드)에서 초기화
+    written = cascade.stage1.written
+    assert written > 0 and cascade.step() is None and cascade.stage1.written == written
+    cascade.write(background(0.1))
+    assert cascade.stage1.written == len(background(0.1))
+    print(f"✓ 2단계 캐스케이드 (창 {cascade.stats.windows_scored}개, 음성 인식 1회)")
+
+
+def fan_noise(seconds, seed=3):
+    """선풍기/에어컨 같은 저주파 웅웅거림 + 약한 잡음 (평균 볼륨이 예전 임계값 500보다 큼)"""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    hum = 3000 * np.sin(2 * np.pi * 60 * t) + 2000 * np.sin(2 * np.pi * 120 * t)
+    return hum + np.random.default_rng(seed).normal(0, 200, len(t))
+
+
+def test_vad_endpoints_under_fan_noise():
+    """VAD: 고정 임계값으로는 끝나지 않는 소음 속에서도 발화 구간과 끝점을 찾음"""
+    noise = fan_noise(6.0)
+    assert np.abs(noise).mean() > 500
+
+    speech = np.zeros_like(noise)
+    word = synthetic_word(KEYWORD, seed=4).astype(np.float64) * 0.4
+    speech[SAMPLE_RATE:SAMPLE_RATE + len(word)] = word
+    recording = (noise + speech).astype(np.int16)
+    word_end = (SAMPLE_RATE + len(word)) / SAMPLE_RATE
+
+    # 소음만 있으면 발화 없음
+    assert VoiceActivityDetector(SAMPLE_RATE).segments(noise.astype(np.int16)) == []
+
+    # 오프라인 구간
+    segments = VoiceActivityDetector(SAMPLE_RATE).segments(recording)
+    assert len(segments) == 1
+    start, end = segments[0]
+    assert abs(start / SAMPLE_RATE - 1.0) < 0.1
+    assert word_end <= end / SAMPLE_RATE <= word_end + 0.4
+
+    # 스트리밍 끝점 (녹음 콜백처럼 블록 단위)
+    vad = VoiceActivityDetector(SAMPLE_RATE)
+    stopped_at = None
+    for offset in range(0, len(recording), 1024):
+        vad.process(recording[offset:offset + 1024])
+        if vad.endpoint(0.8):
+            stopped_at = (offset + 1024) / SAMPLE_RATE
+            break
+    assert stopped_at is not None and stopped_at < word_end + 1.2
+    print(f"✓ 적응형 VAD (소음 속 발화 끝 후 {stopped_at - word_end:.2f}초에 종료)")
+
+
+def wav_24bit(audio, sample_rate):
+    """int16 → 24-bit PCM WAV 바이트"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(3)
+        wav_file.setframerate(sample_rate)
+        samples = audio.astype("<i4") << 8
+        wav_file.writeframes(samples.view(np.uint8).reshape(-1, 4)[:, :3].tobytes())
+    return buffer.getvalue()
+
+
+def wav_float32(audio, sample_rate):
+    """int16 → 32-bit float WAV 바이트 (format 3, wave 모듈로는 읽을 수 없음)"""
+    data = (audio / 32768.0).astype("<f4").tobytes()
+    header = struct.pack("<4sI4s4sIHHIIHH4sI", b"RIFF", 36 + len(data), b"WAVE", b"fmt ", 16, 3, 1,
+                         sample_rate, sample_rate * 4, 4, 32, b"data", len(data))
+    return header + data
+
+
+def test_upload_preprocessing_trims_and_downsamples():
+    """업로드 전처리: 고정 길이 녹음의 무음을 잘라내고 48kHz 스테레오를 16kHz 모노로"""
+    uploads = []
+
+    def create(**kwargs):
+        uploads.append(kwargs["file"])
+        return "pick up the red block"
+
+    # 5초 녹음 중 말은 0.6초 (48kHz 스테레오)
+    word = np.repeat(synthetic_word(KEYWORD, seed=6), 3)
+    recording = np.zeros(5 * 48000, dtype=np.int16)
+    recording[48000:48000 + len(word)] = word
+    recording = (recording + background(15.0, seed=8)).astype(np.int16)
+    stereo = np.stack([recording, recording], axis=1)
+
+    recognizer = SpeechRecognizer(api_key="test", preprocessor=UploadPreprocessor(codec="wav", pad=0.2))
+    recognizer.client = SimpleNamespace(audio=SimpleNamespace(transcriptions=SimpleNamespace(create=create)))
+    assert recognizer.transcribe_audio(stereo, 48000) == "pick up the red block"
+
+    prepared = recognizer.last_upload
+    uploaded, sample_rate = decode_wav(uploads[0].getvalue())
+    assert sample_rate == 16000 and uploaded.ndim == 1
+    assert 0.6 <= prepared.duration <= 1.4
+    assert prepared.bytes_saved > 0.9 * prepared.original_bytes
+    assert recognizer.preprocessor.summary()["bytes_saved"] == prepared.bytes_saved
+
+    # 16-bit가 아닌 WAV는 전처리 없이 원본 그대로 업로드 (예전처럼)
+    for original in (wav_24bit(recording[:48000], 48000), wav_float32(recording[:48000], 48000)):
+        uploads.clear()
+        assert recognizer._transcribe_encoded(original, "wav", "en") == "pick up the red block"
+        assert uploads[-1].getvalue() == original
+    assert recognizer.preprocessor.summary()["uploads"] == 1
+    print(f"✓ 업로드 전처리 ({prepared.original_bytes // 1024}KB → {len(prepared.data) // 1024}KB)")
+
+
+def test_streaming_recognition_overlaps_speech():
+    """스트리밍 인식: 말하는 동안 구간별로 인식하고, 겹친 단어는 한 번만 남김"""
+    words = "pick up the red block and put it on blue cup".split()
+    backend = ToneVocabularyBackend({w: 400 + 300 * i for i, w in enumerate(words)})
+    command = "pick up the red block and put it on the blue cup"
+    audio = backend.synthesize(command)
+
+    partials = []
+    stream = ChunkedStreamingAdapter(backend, SAMPLE_RATE, segment=1.5, overlap=0.4, partial_interval=0.5,
+                                     on_transcript=partials.append)
+    results = list(stream.stream(audio[i:i + 1600] for i in range(0, len(audio), 1600)))
+    stream.close()
+
+    final = results[-1]
+    assert final.is_final and final.text == command
+    assert not any(t.is_final for t in results[:-1])
+    # 발화가 끝나기 전에 이미 구간 인식이 진행됨
+    assert stream.requests >= 3
+    assert merge_words(["Put", "it", "on"], ["on,", "the", "cup"]) == ["Put", "it", "on", "the", "cup"]
+
+    # 기본값: 중간 결과 요청 없이, 보통 길이(약 3초)의 명령도 말하는 동안 구간이 확정됨
+    assert len(audio) / SAMPLE_RATE < 4.0
+    defaults = ChunkedStreamingAdapter(backend, SAMPLE_RATE)
+    for i in range(0, len(audio), 1600):
+        defaults.feed(audio[i:i + 1600])
+    during_speech = defaults.requests
+    assert defaults.finish()[-1].text == command
+    defaults.close()
+    assert during_speech >= 1 and defaults.requests == during_speech + 1
+
+    # 첫 구간 인식이 실패하면 뒷부분만 남은 명령을 최종 결과로 내지 않음
+    class FlakyBackend:
+        calls = 0
+
+        def transcribe_audio(self, audio, sample_rate=16000, language="en"):
+            FlakyBackend.calls += 1
+            if FlakyBackend.calls == 1:
+                raise ConnectionError("network down")
+            return backend.transcribe_audio(audio, sample_rate, language)
+
+    flaky = ChunkedStreamingAdapter(FlakyBackend(), SAMPLE_RATE, max_workers=1)
+    for i in range(0, len(audio), 1600):
+        flaky.feed(audio[i:i + 1600])
+    try:
+        flaky.finish()
+        raise AssertionError("구간 인식 실패가 finish()에서 나야 함")
+    except ConnectionError:
+        pass
+    flaky.reset()
+    flaky.feed(audio)
+    assert flaky.finish()[-1].text == command  # reset() 후에는 다시 정상
+    flaky.close()
+
+    try:
+        StreamingRecognizer()
+        raise AssertionError("추상 클래스는 생성할 수 없어야 함")
+    except TypeError:
+        pass
+    print(f"✓ 스트리밍 인식 (요청 {stream.requests}회, 결과 {len(partials)}개)")
+
+
+class ToneArrayBackend(STTBackend):
+    """로컬 백엔드 대역: 버퍼를 직접 받아 톤 어휘로 인식"""
+
+    accepts_arrays = True
+    model_id = "tone"
+
+    def __init__(self, vocabulary):
+        self.tones = ToneVocabularyBackend(vocabulary)
+        self.received = []
+
+    def transcribe(self, audio_file, language="en"):
+        audio, sample_rate = decode_wav(audio_file.read())
+        return self.transcribe_array(audio, sample_rate, language)
+
+    def transcribe_array(self, audio, sample_rate=16000, language="en"):
+        self.received.append(audio)
+        return self.tones.transcribe_audio(audio, sample_rate, language)
+
+
+def test_local_backend_same_api():
+    """로컬 백엔드: 같은 transcribe_* API, 버퍼는 인코딩 없이 전달"""
+    backend = ToneArrayBackend({"lights": 500, "on": 900})
+    recognizer = SpeechRecognizer(backend=backend, preprocessor=UploadPreprocessor(codec="wav"))
+    audio = np.concatenate([np.zeros(8000, dtype=np.int16), backend.tones.synthesize("lights on"),
+                            np.zeros(8000, dtype=np.int16)])
+
+    assert recognizer.client is None
+    assert recognizer.transcribe_audio(audio, SAMPLE_RATE) == "lights on"
+    assert isinstance(backend.received[0], np.ndarray) and len(backend.received[0]) < len(audio)
+    assert recognizer.preprocessor.uploads == 0  # 압축/업로드 단계 없음
+    assert recognizer.transcribe_bytes(encode_wav(audio, SAMPLE_RATE)) == "lights on"
+
+    # 모델은 처음 쓸 때 로드 (생성만으로는 faster-whisper가 필요 없음)
+    assert create_backend("faster-whisper", model="tiny.en").model_id == "faster-whisper:tiny.en:int8:beam1"
+    assert create_backend("faster-whisper", model="tiny.en", beam_size=5).model_id.endswith(":beam5")
+
+    class IncompleteBackend(STTBackend):
+        def transcribe(self, audio_file, language="en"):
+            return ""
+
+    try:
+        IncompleteBackend()
+        assert False, "transcribe_array가 없는 백엔드는 생성할 수 없어야 함"
+    except TypeError:
+        pass
+    try:
+        create_backend("kaldi")
+        assert False, "알 수 없는 백엔드는 거부해야 함"
+    except ValueError:
+        pass
+    print("✓ 로컬 음성 인식 백엔드")
+
+
+def test_transcription_cache_skips_replays():
+    """결과 캐시: 같은 오디오를 다시 인식하지 않음 (메모리 → 디스크 계층)"""
+    import tempfile
+
+    backend = ToneArrayBackend({"lights": 500, "on": 900, "off": 1300})
+    audio = backend.tones.synthesize("lights on")
+    wav = encode_wav(audio, SAMPLE_RATE)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        path = f"{cache_dir}/command1.wav"
+        with open(path, "wb") as f:
+            f.write(wav)
+
+        recognizer = SpeechRecognizer(backend=backend, cache=TranscriptionCache(max_entries=2, path=cache_dir))
+        assert recognizer.transcribe_file(path) == "lights on"
+        assert recognizer.transcribe_file(path) == "lights on"
+        assert recognizer.transcribe_bytes(wav) == "lights on"  # 같은 내용 = 같은 키
+        assert len(backend.received) == 1
+
+        # 다른 오디오 / 다른 언어는 새로 인식
+        assert recognizer.transcribe_audio(backend.tones.synthesize("lights off"), SAMPLE_RATE) == "lights off"
+        recognizer.transcribe_file(path, language="ko")
+        assert len(backend.received) == 3
+
+        # 새 프로세스처럼 메모리가 비어도 디스크에서 적중
+        restarted = SpeechRecognizer(backend=backend, cache=TranscriptionCache(path=cache_dir))
+        assert restarted.transcribe_file(path) == "lights on"
+        assert len(backend.received) == 3
+        assert restarted.cache.summary()["disk_hits"] == 1
+
+        # 실시간 버퍼는 다시 나오지 않으므로 기본은 캐시하지 않음 (디스크에 쓰지 않음)
+        entries = sum(len(files) for _, _, files in os.walk(cache_dir))
+        live = SpeechRecognizer(backend=backend, cache=TranscriptionCache(path=cache_dir))
+        live.transcribe_audio(audio, SAMPLE_RATE)
+        live.transcribe_audio(audio, SAMPLE_RATE)
+        assert len(backend.received) == 5
+        assert sum(len(files) for _, _, files in os.walk(cache_dir)) == entries
+
+        # 전처리 설정이 다르면 이전 결과를 쓰지 않음
+        trimmed = SpeechRecognizer(backend=backend, cache=TranscriptionCache(path=cache_dir),
+                                   preprocessor=UploadPreprocessor(codec="wav", trim=True))
+        untrimmed = SpeechRecognizer(backend=backend, cache=TranscriptionCache(path=cache_dir),
+                                     preprocessor=UploadPreprocessor(codec="wav", trim=False))
+        trimmed.transcribe_file(path)
+        untrimmed.transcribe_file(path)
+        assert len(backend.received) == 7
+        assert trimmed.transcribe_file(path) == "lights on" and len(backend.received) == 7
+
+    # 모델이 다르면 키도 다름
+    assert TranscriptionCache.key(wav, "openai:whisper-1", "en") != TranscriptionCache.key(wav, "tone", "en")
+    print(f"✓ 음성 인식 캐시 ({recognizer.cache.summary()})")
+
+
+class SlowBackend(ToneArrayBackend):
+    """네트워크 지연을 흉내 내는 백엔드"""
+
+    def __init__(self, vocabulary, delay=0.2):
+        super().__init__(vocabulary)
+        self.delay = delay
+
+    def transcribe_array(self, audio, sample_rate=16000, language="en"):
+        import time
+
+        time.sleep(self.delay)
+        if len(audio) == 0:
+            raise RuntimeError("빈 오디오")
+        return super().transcribe_array(audio, sample_rate, language)
+
+
+def test_transcribe_many_concurrent_in_order():
+    """transcribe_many: 제한된 동시 요청, 입력 순서 유지, 항목별 오류"""
+    import time
+
+    words = ["one", "two", "three", "four", "five"]
+    backend = SlowBackend({w: 400 + 250 * i for i, w in enumerate(words)})
+    recognizer = SpeechRecognizer(backend=backend)
+    sources = [backend.tones.synthesize(w) for w in words]
+    sources.insert(2, np.zeros(0, dtype=np.int16))
+
+    started = time.perf_counter()
+    results = recognizer.transcribe_many(sources, max_workers=3)
+    elapsed = time.perf_counter() - started
+
+    assert [r.index for r in results] == list(range(len(sources)))
+    assert [r.text for r in results if r.ok] == words
+    assert not results[2].ok and "빈 오디오" in results[2].error
+    assert all(r.seconds >= backend.delay for r in results)
+    # 순차 처리(6 × 0.2s)보다 확실히 빠름
+    assert elapsed < 0.6 * len(sources) * backend.delay
+    print(f"✓ 동시 인식 ({len(sources)}개, {elapsed:.2f}s)")
+
+
+def test_simulated_device_drives_capture_paths():
+    """가상 입력 장치: 마이크 없이 웨이크워드 → 명령 녹음을 녹음 파일로 재현"""
+    command = synthetic_word([500, 1500, 800], seed=11)
+    recording = np.concatenate([background(1.0), synthetic_word(KEYWORD, seed=7), background(1.5, seed=2),
+                                command, background(1.0, seed=4)])
+
+    # 5배속 재생, 스트림이 바뀌어도 재생 위치는 이어짐
+    device = SimulatedInputDevice(recording, speed=5.0, noise_level=300)
+    recognizer = ScriptedRecognizer("Jarvis.")
+    detector = SmartWakeWordDetector(recognizer, wake_words=["jarvis"], device=device, spotter=enrolled_spotter())
+    assert detector.listen_smart(max_silence=0.8) == (True, "Jarvis.")
+    assert detector.stats.verification_calls == 1
+    assert device.elapsed < 2.0 + 1.2  # 웨이크워드 직후에 멈춤
+
+    audio = MicrophoneRecorder(device=device).record_until_silence_audio(
+        max_duration=5.0, silence_duration=0.5, start_timeout=2.0)
+    segments = VoiceActivityDetector(SAMPLE_RATE).segments(audio[:, 0])
+    assert len(segments) == 1
+    # 웨이크워드 판단(단어 끝 + 0.8초) 뒤 0.6초에 명령 시작
+    start, end = segments[0]
+    assert abs(start / SAMPLE_RATE - 0.6) < 0.15 and end - start >= len(command)
+
+    # 장치가 최대 녹음 시간보다 많이 보내도 발화 앞부분은 남음 (버퍼가 차면 더 쓰지 않음)
+    speech = np.tile(synthetic_word([500, 1500, 800], seed=11), 10)
+    fast = MicrophoneRecorder(device=SimulatedInputDevice(speech, speed=8.0, tail="stop"))
+    audio = fast.record_until_silence_audio(max_duration=0.3, silence_duration=5.0, start_timeout=5.0)
+    assert len(audio) == fast._ring.capacity > 0.3 * SAMPLE_RATE
+    assert np.array_equal(audio[:, 0], speech[:len(audio)])
+
+    # 예전 record_until_silence(10, 500)처럼 임계값을 위치 인자로 넘기면 바로 실패
+    try:
+        MicrophoneRecorder(device=device).record_until_silence(10, 500)
+        assert False, "침묵 옵션은 키워드로만 받아야 함"
+    except TypeError:
+        pass
+
+    # 공유 캡처 서비스 + 파일 재생 (블록 크기/위치는 실제 스트림과 같음)
+    capture = AudioCaptureService(device=SimulatedInputDevice.from_file(encode_wav(tone(1.0), SAMPLE_RATE),
+                                                                        speed=10.0, tail="stop"))
+    with capture:
+        captured = capture.record(0.5)
+    assert len(captured) == SAMPLE_RATE // 2 and capture.position % capture.blocksize == 0
+
+    # rec()/wait() 경로 (대기 없이 최대 속도)
+    quick = MicrophoneRecorder(device=SimulatedInputDevice(tone(0.5), speed=0))
+    assert np.array_equal(quick.record_audio(0.5)[:, 0], tone(0.5))
+
+    # 스트림 메서드를 구현하지 않은 장치는 생성 시점에 실패
+    for base in (AudioInputDevice, AudioOutputDevice):
+        try:
+            type("IncompleteDevice", (base,), {})()
+            assert False, "추상 장치는 생성할 수 없어야 함"
+        except TypeError:
+            pass
+    print(f"✓ 가상 입력 장치 ({device})")
+
+
+def test_wake_word_evaluation_curves():
+    """평가 하네스: 라벨링 녹음의 FAR/FRR 곡선, 지연, 텍스트 규칙별 오감지"""
+    pieces, events, position = [], [], 0.0
+    for i in range(8):
+        # 잡음 → (짝수 번째는 웨이크워드, 홀수 번째는 다른 단어)
+        gap = background(1.5, seed=20 + i)
+        word = synthetic_word(KEYWORD if i % 2 == 0 else [1500, 400, 2000, 700], 0.95 + 0.02 * i, seed=30 + i)
+        position += len(gap) / SAMPLE_RATE
+        if i % 2 == 0:
+            events.append((position, position + len(word) / SAMPLE_RATE))
+        position += len(word) / SAMPLE_RATE
+        pieces += [gap, word]
+    pieces.append(background(1.5, seed=40))
+    recording = LabeledRecording(np.concatenate(pieces), SAMPLE_RATE, events)
+
+    spotter = enrolled_spotter()
+    evaluator = WakeWordEvaluator(spotter)
+    times, costs = evaluator.score_windows(recording)
+    assert evaluator.realtime_factor > 1.0
+
+    curve = evaluator.sweep(recording, times, costs, thresholds=[spotter.threshold * 0.3, spotter.threshold, 10.0])
+    strict, calibrated, permissive = curve
+    assert strict.frr > calibrated.frr
+    assert calibrated.frr == 0.0 and calibrated.false_accepts == 0
+    assert calibrated.latency["p90"] < 0.5
+    assert permissive.false_accepts > 0  # 다른 단어/잡음까지 감지
+
+    # 캐스케이드: 후보마다 음성 인식 한 번
+    cascade = WakeWordCascade(spotter, ScriptedRecognizer("Jarvis."), verify=lambda text: "jarvis" in text)
+    point, counters = evaluator.evaluate_cascade(cascade, recording)
+    assert point.frr == 0.0 and point.false_accepts == 0
+    assert counters["verification_calls"] == len(events)
+
+    # 텍스트 규칙: 일부 매칭("man", "tre")이 일반 문장을 웨이크워드로 받아들임
+    report = evaluate_text_rules(
+        [("jarvis open the gripper", True), ("manual mode please", False), ("that is a tree", False),
+         ("put the jar on the table", False), ("move left", False)],
+        ["jarvis", "atreides"], WAKE_WORD_ENDINGS)
+    assert report["rules"]["exact"]["true_accepts"] == 1
+    assert report["rules"]["prefix"]["false_accepts"] == 1
+    assert report["rules"]["ending"]["false_accepts"] == 2
+    assert [row["far"] for row in report["cumulative"]] == [0.0, 0.25, 0.25, 0.75]
+    print(f"✓ 웨이크워드 평가 ({recording.duration:.0f}초 녹음, {evaluator.realtime_factor:.0f}배속, "
+          f"지연 p50 {calibrated.latency['p50']:.2f}s)")
+
+
+def play_through_capture(reference, near=None, near_at=0.0, lead=1.0):
+    """
+    로봇이 reference를 말하는 동안의 마이크 입력을 공유 캡처 서비스로 흘려 보냄
+
+    Returns:
+        (raw, cleaned, echo): 마이크 원본, 캡처 서비스가 내보낸 오디오, EchoSuppressor
+    """
+    room = np.zeros(1600)
+    room[0], room[48], room[400] = 0.7, 0.15, 0.05  # 스피커 → 마이크 (직접음 + 약한 반사)
+    delay = int(0.06 * SAMPLE_RATE)                 # 재생 시작 → 마이크 도달
+    start, end = int(lead * SAMPLE_RATE), int(lead * SAMPLE_RATE) + len(reference)
+
+    mic = background(lead + len(reference) / SAMPLE_RATE + 2.5, seed=5).astype(np.float64)
+    mic[start + delay:end + delay] += np.convolve(reference.astype(np.float64), room)[:len(reference)]
+    if near is not None:
+        offset = start + int(near_at * SAMPLE_RATE)
+        mic[offset:offset + len(near)] += near
+    raw = np.clip(mic, -32768, 32767).astype(np.int16)
+
+    capture = AudioCaptureService(device=SimulatedInputDevice(raw, speed=0, tail="stop"))
+    blocks = []
+
+    def on_block(indata, frames, time_info, status):
+        # TTS처럼 재생 시작/종료를 알림 (블록 경계 기준)
+        blocks.append(indata.copy())
+        if capture.position == start:
+            capture.echo.begin(reference)
+        elif capture.position == end - end % capture.blocksize:
+            capture.echo.end()
+
+    capture.subscribe(on_block)
+    with capture:
+        capture.device.finished.wait()
+        while capture.device.blocks_delivered > len(blocks):
+            time.sleep(0.01)
+    return raw, np.concatenate(blocks)[:len(raw), 0], capture.echo
+
+
+def test_echo_suppression_during_playback():
+    """에코 억제: 로봇이 자기 이름을 말해도 웨이크워드/VAD가 반응하지 않고, 말 끊기는 통과"""
+    speech = np.concatenate([np.zeros(1600, np.int16), synthetic_word(KEYWORD, seed=7), np.zeros(800, np.int16)])
+
+    raw, cleaned, echo = play_through_capture(speech)
+    assert SlidingWindowSpotter(enrolled_spotter(), hop=0.1).process(raw)  # 억제가 없으면 스스로 깨어남
+    assert SlidingWindowSpotter(enrolled_spotter(), hop=0.1).process(cleaned) == []
+    assert len(VoiceActivityDetector(SAMPLE_RATE).segments(raw)) == 1
+    assert VoiceActivityDetector(SAMPLE_RATE).segments(cleaned) == []
+    assert abs(echo.last_delay - 0.06) < 0.03 and not echo.active
+
+    # 재생 중 사용자가 다른 말을 하면 (barge-in) 그 말은 남음
+    near = synthetic_word([1500, 400, 2000, 700], seed=12).astype(np.float64) * 0.8
+    raw, cleaned, echo = play_through_capture(speech, near=near, near_at=0.3)
+    segments = VoiceActivityDetector(SAMPLE_RATE).segments(cleaned)
+    assert len(segments) == 1
+    start = int(1.3 * SAMPLE_RATE) + echo.n_fft
+    kept = np.sqrt(np.mean(cleaned[start:start + len(near)].astype(np.float64) ** 2)) / np.sqrt(np.mean(near ** 2))
+    assert kept > 0.6
+    print(f"✓ 에코 억제 (지연 {echo.last_delay * 1000:.0f}ms 추정, 말 끊기 에너지 {kept:.0%} 유지)")
+
+
+def test_idle_mode_skips_detector_in_silence():
+    """저전력 대기: 조용한 동안은 스포터를 돌리지 않고, 말하면 깨어나 같은 결과로 감지"""
+    energy = EnergyActivityDetector()
+    hum = fan_noise(3.0).astype(np.int16)
+    assert not any(energy.process(hum[i:i + 1600]) for i in range(0, len(hum), 1600))
+    assert energy.process(synthetic_word(KEYWORD, seed=7)[:1600])
+
+    word = synthetic_word(KEYWORD, seed=7)
+    recording = np.concatenate([background(5.0), word, background(3.0, seed=2)])
+    word_end = 5.0 + len(word) / SAMPLE_RATE
+
+    results = {}
+    for idle_mode in (False, True):
+        capture = AudioCaptureService(device=SimulatedInputDevice(recording, speed=10.0, noise_level=300))
+        low_power = LowPowerListener(capture) if idle_mode else None
+        detector = SmartWakeWordDetector(ScriptedRecognizer("Jarvis."), wake_words=["jarvis"], capture=capture,
+                                         spotter=enrolled_spotter(), low_power=low_power)
+        with capture:
+            decision = detector.listen_smart(max_silence=0.8)
+        results[idle_mode] = (decision, detector.stats.windows_scored, detector.last_utterance_end / SAMPLE_RATE)
+
+    assert results[True][0] == results[False][0] == (True, "Jarvis.")
+    assert results[True][1] < results[False][1]      # 조용한 구간은 점수 매기지 않음
+    assert results[True][2] - word_end < 1.5          # 깨어나는 데 걸리는 지연은 거의 없음
+
+    report = low_power.summary()
+    assert report["escalations"] == 1 and report["blocks_skipped"] > 20
+    assert report["idle"]["seconds"] > 0 and report["active"]["seconds"] > 0
+    print(f"✓ 저전력 대기 (창 {results[False][1]}개 → {results[True][1]}개, "
+          f"블록 {report['blocks_skipped']}개 건너뜀)")
+
+
+def test_shared_feature_frontend():
+    """공유 프론트엔드: 블록 경계와 무관하게 오프라인 MFCC와 같고, 캐스케이드에서 프레임당 한 번만 계산"""
+    audio = np.concatenate([background(0.5), synthetic_word(KEYWORD, seed=4)])
+    frontend = FeatureFrontEnd(SAMPLE_RATE)
+    levels = []
+    frontend.subscribe(lambda features: levels.append(features.level_db))
+    blocks = [frontend.process(audio[i:i + 1000]) for i in range(0, len(audio), 1000)]  # 홉(160)과 어긋난 블록
+
+    streamed = np.concatenate([block.mfcc for block in blocks])
+    offline = mfcc(audio, SAMPLE_RATE, normalize=False)
+    assert streamed.shape == offline.shape and np.allclose(streamed, offline, atol=1e-3)
+    assert [block.start_frame for block in blocks[1:]] == list(np.cumsum([b.frames for b in blocks])[:-1])
+    assert len(levels) == len(blocks) and levels[-1] > levels[0] + 10  # 레벨 미터도 같은 구독으로
+
+    # 캐스케이드: 스포터와 VAD가 같은 프레임을 받음 (FFT는 프론트엔드에서만)
+    recognizer = ScriptedRecognizer("Jarvis.")
+    cascade = WakeWordCascade(enrolled_spotter(), recognizer, verify=lambda text: "jarvis" in text)
+    calls = []
+    compute = cascade.frontend.compute
+    cascade.frontend.compute = lambda frames: calls.append(len(frames)) or compute(frames)
+
+    recording = np.concatenate([background(2.0), synthetic_word(KEYWORD, seed=4), background(2.0, seed=2)])
+    assert run_cascade(cascade, recording) == (True, "Jarvis.")
+    assert sum(calls) == cascade.frontend.frames == cascade.vad.frames
+    print(f"✓ 공유 특징 프론트엔드 (프레임 {sum(calls)}개, FFT 1회씩)")
+
+
+class FakeSpeechAPI:
+    """OpenAI audio.speech 대역: 단어당 0.1초 PCM을 chunk_delay 간격의 조각으로 보냄"""
+
+    def __init__(self, chunk_delay=0.02, chunk_bytes=4801, streaming=True, fail=()):
+        self.chunk_delay = chunk_delay
+        self.chunk_bytes = chunk_bytes  # 홀수 - 조각 경계가 샘플 중간에 걸림
+        self.fail = set(fail)
+        self.requests = []
+        self.active = self.max_active = 0
+        self._lock = threading.Lock()
+        create = self._stream if streaming else self._unavailable
+        self.with_streaming_response = SimpleNamespace(create=create)
+
+    @staticmethod
+    def pcm(text):
+        t = np.arange(int(0.1 * len(text.split()) * PCM_SAMPLE_RATE)) / PCM_SAMPLE_RATE
+        return (6000 * np.sin(2 * np.pi * 220 * t)).astype("<i2").tobytes()
+
+    @contextmanager
+    def _stream(self, model, voice, input, response_format):
+        self.requests.append(("stream", response_format))
+        if input in self.fail:
+            raise ConnectionError("합성 실패")
+        data = self.pcm(input)
+
+        def iter_bytes(chunk_size=None):
+            for start in range(0, len(data), self.chunk_bytes):
+                time.sleep(self.chunk_delay)
+                yield data[start:start + self.chunk_bytes]
+
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            yield SimpleNamespace(iter_bytes=iter_bytes)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def _unavailable(self, **kwargs):
+        raise AttributeError("with_streaming_response")
+
+    def create(self, model, voice, input, response_format):
+        self.requests.append(("create", response_format))
+        if input in self.fail:
+            raise ConnectionError("합성 실패")
+        data = self.pcm(input)
+        time.sleep(self.chunk_delay * len(data) / self.chunk_bytes)
+        return SimpleNamespace(content=data)
+
+
+class RecordingEcho:
+    """EchoSuppressor 재생 알림 기록"""
+
+    def __init__(self):
+        self.events = []
+        self.reference_samples = 0
+
+    def begin(self, reference=None, sample_rate=None, streaming=False):
+        self.events.append(("begin", sample_rate, streaming))
+
+    def add_reference(self, chunk, sample_rate=None):
+        self.reference_samples += len(chunk)
+
+    def end(self):
+        self.events.append(("end",))
+
+
+def test_streaming_tts_starts_on_first_bytes():
+    """스트리밍 TTS: 합성이 끝나기 전에 첫 조각부터 재생, 스트리밍이 안 되면 파일 없이 메모리에서 재생"""
+    text = "I turned left and I am now facing the kitchen door"
+    expected = np.frombuffer(FakeSpeechAPI.pcm(text), dtype="<i2")
+
+    speech, output, echo = FakeSpeechAPI(), SimulatedOutputDevice(), RecordingEcho()
+    tts = TextToSpeech(api_key="test", echo=echo, output=output)
+    tts.client = SimpleNamespace(audio=SimpleNamespace(speech=speech))
+    started = time.perf_counter()
+    assert tts.speak(text) == ""
+    total = time.perf_counter() - started
+
+    assert speech.requests == [("stream", "pcm")]
+    assert np.array_equal(output.audio, expected)  # 홀수 바이트 경계도 그대로 이어짐
+    assert output.chunks[0][0] == PCM_SAMPLE_RATE and len(output.chunks) > 5
+    first_audio = tts.first_audio_latency
+    assert first_audio < total / 4
+    assert echo.events == [("begin", PCM_SAMPLE_RATE, True), ("end",)]
+    assert echo.reference_samples == len(expected)
+
+    # 스트리밍 응답을 못 받으면 한 번에 합성 → 임시 파일 없이 같은 장치로 재생
+    speech, output = FakeSpeechAPI(streaming=False), SimulatedOutputDevice()
+    tts = TextToSpeech(api_key="test", output=output)
+    tts.client = SimpleNamespace(audio=SimpleNamespace(speech=speech))
+    named_temp = text_to_speech.tempfile.NamedTemporaryFile
+    text_to_speech.tempfile.NamedTemporaryFile = None
+    try:
+        assert tts.speak(text) == ""
+    finally:
+        text_to_speech.tempfile.NamedTemporaryFile = named_temp
+    assert speech.requests == [("create", "pcm")]
+    assert np.array_equal(output.audio, expected)
+    print(f"✓ 스트리밍 TTS (첫 소리 {first_audio * 1000:.0f}ms, 전체 합성 {total * 1000:.0f}ms)")
+
+
+def test_sentence_parallel_tts_plays_in_order():
+    """문장별 병렬 TTS: 동시에 합성(최대 max_workers개)하되 재생은 문장 순서대로, 실패한 문장만 건너뜀"""
+    assert split_sentences("네. 오른쪽으로 돌았습니다! 거리는 1.5m 입니다.") == [
+        "네. 오른쪽으로 돌았습니다!", "거리는 1.5m 입니다."]
+
+    sentences = [
+        "I checked every room on the first floor and found nobody there.",  # 가장 길어서 가장 늦게 끝남
+        "The kitchen light is still on.",
+        "Shall I turn it off?",
+        "I will wait here.",
+    ]
+    text = " ".join(sentences)
+    assert split_sentences(text) == sentences
+
+    speech, output = FakeSpeechAPI(chunk_delay=0.01), SimulatedOutputDevice()
+    tts = TextToSpeech(api_key="test", output=output, max_workers=2)
+    tts.client = SimpleNamespace(audio=SimpleNamespace(speech=speech))
+    started = time.perf_counter()
+    tts.speak(text)
+    total = time.perf_counter() - started
+
+    expected = np.concatenate([np.frombuffer(FakeSpeechAPI.pcm(s), dtype="<i2") for s in sentences])
+    assert np.array_equal(output.audio, expected)  # 뒤 문장이 먼저 끝나도 순서대로
+    assert len(speech.requests) == 4 and speech.max_active == 2
+    assert output.streams_opened == 1               # 문장 사이도 한 스트림으로 이어서
+    sequential = 0.01 * len(FakeSpeechAPI.pcm(text)) / speech.chunk_bytes
+    assert total < 0.8 * sequential and tts.first_audio_latency < 0.1
+
+    # 한 문장이 실패하면 그 문장만 건너뜀
+    speech, output = FakeSpeechAPI(chunk_delay=0, fail=[sentences[1]]), SimulatedOutputDevice()
+    tts = TextToSpeech(api_key="test", output=output, max_workers=2)
+    tts.client = SimpleNamespace(audio=SimpleNamespace(speech=speech))
+    tts.speak(text)
+    kept = [s for s in sentences if s != sentences[1]]
+    assert np.array_equal(output.audio, np.concatenate([np.frombuffer(FakeSpeechAPI.pcm(s), "<i2") for s in kept]))
+    # 모든 문장이 실패하면 아무 말도 못 했으므로 macOS 음성으로 대체
+    speech, output = FakeSpeechAPI(chunk_delay=0, fail=sentences), SimulatedOutputDevice()
+    tts = TextToSpeech(api_key="test", output=output, max_workers=2)
+    tts.client = SimpleNamespace(audio=SimpleNamespace(speech=speech))
+    fallback = []
+    macos_speak = text_to_speech.MacOSTTS.speak
+    text_to_speech.MacOSTTS.speak = lambda self, text, **kwargs: fallback.append(text)
+    try:
+        tts.speak(text)
+    finally:
+        text_to_speech.MacOSTTS.speak = macos_speak
+    assert len(output.audio) == 0 and fallback == [text]
+
+    # 출력 장치 오류는 문장마다 건너뛰지 않고 한 번에 중단
+    class BrokenOutput(SimulatedOutputDevice):
+        def output_stream(self, samplerate, channels=1, dtype="int16"):
+            stream = super().output_stream(samplerate, channels, dtype)
+            stream.write = lambda data: (_ for _ in ()).throw(OSError("출력 장치 끊김"))
+            return stream
+
+    speech = FakeSpeechAPI(chunk_delay=0)
+    tts = TextToSpeech(api_key="test", output=BrokenOutput(), max_workers=2)
+    tts.client = SimpleNamespace(audio=SimpleNamespace(speech=speech))
+    fallback.clear()
+    text_to_speech.MacOSTTS.speak = lambda self, text, **kwargs: fallback.append(text)
+    try:
+        tts.speak(text)
+    finally:
+        text_to_speech.MacOSTTS.speak = macos_speak
+    assert fallback == [text]
+    print(f"✓ 문장별 병렬 TTS (4문장, 동시 2개, {total * 1000:.0f}ms / 순차 {sequential * 1000:.0f}ms)")
+
+
+def test_strip_wake_word_forms():
+    """웨이크워드 제거: 앞/뒤에 붙은 호칭, 소유격, 단어 경계"""
+    detector = SmartWakeWordDetector(ScriptedRecognizer(""), device=SimulatedInputDevice())
+    cases = {
+        "Jarvis, pick up the red block": "pick up the red block",
+        "Jarvis! Open the gripper.": "Open the gripper.",
+        "Pick up the red block, Jarvis.": "Pick up the red block",   # 명령이 앞에
+        "Jarvis.": "",                                               # 호출만
+        "Jarvis's here, open the gripper": "Jarvis's here, open the gripper",  # 소유격/축약은 호칭이 아님
+        "Open Jarvis's gripper": "Open Jarvis's gripper",
+        "Hey Jarvy, wave": "wave",                                   # 잘못 들린 호칭
+        "pick up the jar": "",                                       # 일반 단어는 웨이크워드가 아님
+        "자비스야 불 켜줘": "불 켜줘",
+    }
+    for text, expected in cases.items():
+        assert detector.strip_wake_word(text) == expected, (text, detector.strip_wake_word(text))
+    print(f"✓ 웨이크워드 제거 ({len(cases)}가지 형태)")
+
+
+def main():
+    print("=" * 60)
+    print("오디오 처리 파이프라인 테스트")
+    print("=" * 60)
+
+    test_wav_roundtrip_in_memory()
+    test_transcribe_audio_without_files()
+    test_ring_buffer_wraparound_zero_copy()
+    test_capture_pre_roll_and_overrun()
+    test_keyword_spotter_local_detection()
+    test_sliding_window_across_chunk_boundary()
+    test_cascade_verifies_only_candidates()
+    test_vad_endpoints_under_fan_noise()
+    test_upload_preprocessing_trims_and_downsamples()
+    test_streaming_recognition_overlaps_speech()
+    test_local_backend_same_api()
+    test_transcription_cache_skips_replays()
+    test_transcribe_many_concurrent_in_order()
+    test_simulated_device_drives_capture_paths()
+    test_wake_word_evaluation_curves()
+    test_echo_suppression_during_playback()
+    test_idle_mode_skips_detector_in_silence()
+    test_shared_feature_frontend()
+    test_strip_wake_word_forms()
+    test_streaming_tts_starts_on_first_bytes()
+    test_sentence_parallel_tts_plays_in_order()
+
+    print("\n✅ 모든 테스트 통과!")
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+RobotBrain 호출 측정 테스트
+가짜 OpenAI 클라이언트로 API 키 없이 실행됩니다.
+"""
+
+from types import SimpleNamespace
+
+from src.brain.metrics import BrainMetrics, CallMetrics, estimate_cost
+from src.brain.robot_brain import RobotBrain
+
+
+class FakeCompletions:
+    """스트리밍 chat.completions.create 대역"""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.requests = []
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+
+        usage = SimpleNamespace(
+            prompt_tokens=1200,
+            completion_tokens=40,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=1024),
+        )
+        chunks = [
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=part))], usage=None, model=None)
+            for part in (reply[:10], reply[10:])
+        ]
+        chunks.append(SimpleNamespace(choices=[], usage=usage, model="gpt-4o-mini-2024-07-18"))
+        return iter(chunks)
+
+
+def make_brain(replies, metrics=None):
+    brain = RobotBrain(api_key="test", model="gpt-4o-mini", metrics=metrics, retry_backoff=0.0)
+    completions = FakeCompletions(replies)
+    brain.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return brain, completions
+
+
+def test_usage_recorded():
+    """토큰/비용/TTFT 기록"""
+    brain, _ = make_brain(['{"speech": "Hello there", "commands": []}'])
+    response = brain.think("hi")
+    assert response.speech == "Hello there"
+
+    call = brain.last_call
+    assert call.prompt_tokens == 1200
+    assert call.completion_tokens == 40
+    assert call.cached_tokens == 1024
+    assert call.model == "gpt-4o-mini-2024-07-18"
+    assert call.time_to_first_token is not None
+    assert call.total_time >= call.time_to_first_token
+    assert abs(call.cost_usd - estimate_cost("gpt-4o-mini", 1200, 40, 1024)) < 1e-12
+    print("✓ 토큰/비용/지연시간 기록")
+
+
+def test_retry_and_parse_failure_counted():
+    """재시도 횟수와 파싱 실패 기록"""
+    from openai import APIConnectionError
+
+    error = APIConnectionError(request=SimpleNamespace(method="POST", url="https://api.openai.com"))
+    metrics = BrainMetrics()
+    brain, completions = make_brain([error, "not json at all"], metrics=metrics)
+    response = brain.think("hi")
+
+    assert response.needs_clarification
+    assert len(completions.requests) == 2
+    assert brain.last_call.retries == 1
+    assert brain.last_call.parse_failures == 1
+    assert brain.last_call.error
+    assert metrics.summary()["errors"] == 1
+    print("✓ 재시도/파싱 실패 기록")
+
+
+def test_exports():
+    """JSON Lines / Prometheus 내보내기"""
+    metrics = BrainMetrics()
+    brain, _ = make_brain(['{"speech": "ok", "commands": []}'] * 2, metrics=metrics)
+    brain.think("one")
+    brain.think("two")
+
+    assert len(metrics.to_jsonl().splitlines()) == 2
+    text = metrics.to_prometheus()
+    assert "robot_brain_calls_total 2" in text
+    assert 'robot_brain_total_time_seconds_bucket{le="+Inf"} 2' in text
+    assert 'robot_brain_tokens_total{type="cached"} 2048' in text
+    print("✓ JSON Lines / Prometheus 내보내기")
+
+
+def test_histogram_counts_never_decrease():
+    """히스토그램 버킷은 창이 밀려도 누적, 최근 백분위수는 gauge로 따로"""
+    metrics = BrainMetrics(window=2)
+    for total_time in (0.05, 0.05, 3.0, 3.0):
+        metrics.record(CallMetrics(model="gpt-4o", total_time=total_time))
+
+    text = metrics.to_prometheus()
+    assert 'robot_brain_total_time_seconds_bucket{le="0.1"} 2' in text  # 창에서 밀려난 관측값도 유지
+    assert 'robot_brain_total_time_seconds_bucket{le="+Inf"} 4' in text
+    assert "robot_brain_total_time_seconds_count 4" in text
+    assert "# TYPE robot_brain_total_time_seconds_recent gauge" in text
+    assert 'robot_brain_total_time_seconds_recent{quantile="0.5"} 3.0' in text  # 최근 2회만
+    assert metrics.summary()["total_time_seconds_p50"] == 3.0
+
+    try:
+        RobotBrain(api_key="test", max_retries=-1)
+        raise AssertionError("ValueError가 나야 함")
+    except ValueError:
+        pass
+    print("✓ 누적 히스토그램 + 최근 백분위수")
+
+
+def main():
+    print("=" * 60)
+    print("RobotBrain 호출 측정 테스트")
+    print("=" * 60)
+
+    test_usage_recorded()
+    test_retry_and_parse_failure_counted()
+    test_exports()
+    test_histogram_counts_never_decrease()
+
+    print("\n✅ 모든 테스트 통과!")
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
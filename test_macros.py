@@ -0,0 +1,131 @@
+"""
+동작 매크로 라이브러리 테스트
+API 키 없이 로컬에서 실행됩니다.
+"""
+
+from src.brain.macros import MacroLibrary
+from src.brain.robot_brain import ActionCommand, RobotBrain
+from src.motion.action_executor import ActionExecutor
+from src.simulation.simple_robot_sim import SimpleRobotSimulator
+
+
+def _pick_plan(obj):
+    return [
+        ActionCommand(action_type="move", target_object=obj, reasoning="approach"),
+        ActionCommand(action_type="pick", target_object=obj, reasoning="grasp"),
+        ActionCommand(action_type="place", location={"x": 0.0, "y": 0.3, "z": 0.05}, reasoning="put down"),
+    ]
+
+
+def test_record_and_match_with_slots():
+    """물체 이름이 슬롯으로 추상화되는지 확인"""
+    library = MacroLibrary()
+    macro = library.record("Please pick up the red block!", _pick_plan("red_block"))
+    assert macro.template == "pick up the {0}"
+    assert macro.slot_count == 1
+
+    found = library.match("pick up the green block")
+    assert found is not None
+    macro, slots = found
+    assert slots == ["green_block"]
+
+    commands = library.expand(macro.name, slots)
+    assert [c.target_object for c in commands] == ["green_block", "green_block", None]
+    print("✓ 슬롯 매크로 기록/매칭")
+
+
+def test_context_dependent_intent_not_recorded():
+    """맥락 의존 요청은 저장하지 않음"""
+    library = MacroLibrary()
+    assert library.record("put it down", _pick_plan("red_block")) is None
+    assert len(library) == 0
+    print("✓ 맥락 의존 요청 제외")
+
+
+def test_compound_and_context_requests_go_to_llm():
+    """복합/맥락 의존 요청은 슬롯이 뒷부분을 삼키지 않고 매칭되지 않음"""
+    library = MacroLibrary()
+    library.record("pick up the red block", _pick_plan("red_block"))
+
+    assert library.match("pick up the red block and put it on the blue cup") is None
+    assert library.match("pick up the red block and the blue cup") is None
+    assert library.match("pick up the red block then wave") is None
+    assert library.match("pick up that") is None
+    assert library.match("pick up the red block again") is None
+
+    # 물체 목록을 주면 슬롯은 아는 물체만
+    assert library.match("pick up the blue cup", known_objects=["blue_cup"])[1] == ["blue_cup"]
+    assert library.match("pick up the big shiny thing", known_objects=["blue_cup"]) is None
+
+    # 템플릿 자체에 있는 접속어는 허용
+    library.record("swap the red block and the blue cup", _pick_plan("red_block") + _pick_plan("blue_cup"))
+    assert library.match("swap the green block and the red cup")[1] == ["green_block", "red_cup"]
+
+    brain = RobotBrain(api_key="test", macro_library=library)
+    assert brain._match_macro("pick up the red block and put it on the blue cup") is None
+    print("✓ 복합/맥락 요청은 LLM으로")
+
+
+def test_executor_records_and_brain_skips_llm():
+    """실행 성공 시 기록되고, 다음 요청은 LLM 없이 매크로 호출로 응답"""
+    library = MacroLibrary()
+    executor = ActionExecutor(SimpleRobotSimulator(), macro_library=library)
+    assert executor.execute_commands(_pick_plan("red_block"), intent="pick up the red block")
+    assert len(library) == 1
+
+    brain = RobotBrain(api_key="test", macro_library=library, known_objects=lambda: executor.sim.objects)
+    brain.client = None  # LLM이 호출되면 실패함
+    response = brain.think("pick up the blue cup")
+    assert len(response.commands) == 1
+    assert response.commands[0].action_type == "macro"
+
+    assert executor.execute_commands(response.commands)
+    assert executor.sim.get_object_position("blue_cup") == (0.0, 0.3, 0.05)
+    print("✓ 실행 기록 + LLM 생략")
+
+
+def test_unknown_slots_and_recorded_coordinates_go_to_llm():
+    """시뮬레이터에 없는 물체/뒤에 붙은 단어는 LLM으로, 기록된 물체 좌표는 다른 물체에 재사용하지 않음"""
+    sim = SimpleRobotSimulator()
+    library = MacroLibrary()
+    plan = _pick_plan("red_block")
+    plan[0] = ActionCommand(action_type="move", target_object="red_block",
+                            location={"x": 0.3, "y": 0.0, "z": 0.05}, reasoning="approach")
+    library.record("pick up the red block", plan)
+    assert "location" not in library.macros["pick up the {0}"].commands[0]  # 이름으로 위치를 찾음
+
+    brain = RobotBrain(api_key="test", macro_library=library, known_objects=lambda: sim.objects)
+    assert brain._match_macro("pick up the blue cup") is not None
+    assert brain._match_macro("pick up the red block slowly") is None
+    assert brain._match_macro("pick up the knife") is None
+    # 물체 목록이 없으면 슬롯을 검증할 수 없으므로 슬롯 매크로는 쓰지 않음
+    assert RobotBrain(api_key="test", macro_library=library)._match_macro("pick up the blue cup") is None
+
+    # 슬롯 물체에 좌표가 붙은 계획(놓을 위치 등)은 기록한 물체일 때만 재사용
+    library.record("put the red block away", [
+        ActionCommand(action_type="place", target_object="red_block",
+                      location={"x": 0.0, "y": 0.3, "z": 0.05}, reasoning="put down"),
+    ])
+    assert library.match("put the red block away", known_objects=sim.objects) is not None
+    assert library.match("put the blue cup away", known_objects=sim.objects) is None
+    print("✓ 모르는 슬롯/기록된 좌표는 LLM으로")
+
+
+def main():
+    print("=" * 60)
+    print("동작 매크로 라이브러리 테스트")
+    print("=" * 60)
+
+    test_record_and_match_with_slots()
+    test_context_dependent_intent_not_recorded()
+    test_compound_and_context_requests_go_to_llm()
+    test_executor_records_and_brain_skips_llm()
+    test_unknown_slots_and_recorded_coordinates_go_to_llm()
+
+    print("\n✅ 모든 테스트 통과!")
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
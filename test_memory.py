@@ -0,0 +1,64 @@
+"""
+장기 기억 저장소 테스트
+API 키 없이 로컬에서 실행됩니다.
+"""
+
+import tempfile
+
+from src.brain.memory import MemoryStore
+
+
+def test_top_k_retrieval():
+    """관련 기억이 상위에 검색되는지 확인"""
+    memory = MemoryStore()
+    memory.add_fact("the user's cup is the blue one")
+    memory.add("User: pick up the red block\nRobot: Picking up the red block.")
+    memory.add("User: go home\nRobot: Returning home.")
+
+    hits = memory.search("which cup is mine?", k=2)
+    assert hits, "검색 결과 없음"
+    assert hits[0].kind == "fact"
+    assert "blue" in hits[0].text
+    print("✓ top-k 검색")
+
+
+def test_dedupe():
+    """중복 기억은 저장하지 않음"""
+    memory = MemoryStore()
+    assert memory.add_fact("the user's cup is the blue one")
+    assert not memory.add_fact("The user's cup is the blue one")
+    assert len(memory) == 1
+    print("✓ 중복 제거")
+
+
+def test_persistence_and_growth():
+    """memmap 저장 후 재로드 + 용량 확장"""
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = MemoryStore(path=tmp, initial_capacity=2)
+        for i in range(5):
+            memory.add_fact(f"object number {i} is stored in bin {i * 7}")
+        assert len(memory) == 5
+
+        reloaded = MemoryStore(path=tmp, initial_capacity=2)
+        assert len(reloaded) == 5
+        hits = reloaded.search("object number 3 bin", k=1)
+        assert hits and "number 3" in hits[0].text
+    print("✓ 저장/재로드")
+
+
+def main():
+    print("=" * 60)
+    print("장기 기억 저장소 테스트")
+    print("=" * 60)
+
+    test_top_k_retrieval()
+    test_dedupe()
+    test_persistence_and_growth()
+
+    print("\n✅ 모든 테스트 통과!")
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+RobotResponse 파싱/보정 테스트
+API 키 없이 로컬에서 실행됩니다.
+"""
+
+import json
+
+from src.brain.json_repair import repair_json
+from src.brain.robot_brain import RESPONSE_SCHEMA, parse_robot_response
+
+
+def test_fast_path():
+    """올바른 JSON은 보정 없이 파싱"""
+    response, repaired = parse_robot_response(
+        '{"speech": "Done", "commands": [{"action_type": "home", "target_object": null, '
+        '"location": null, "parameters": null, "reasoning": "reset"}], '
+        '"needs_clarification": false, "clarification_question": null}'
+    )
+    assert not repaired
+    assert response.commands[0].action_type == "home"
+    print("✓ 빠른 파싱 경로")
+
+
+def test_strict_nulls_dropped():
+    """strict 출력의 null 항목은 제거되어 실행기 기본값이 쓰임"""
+    response, _ = parse_robot_response(
+        '{"speech": "ok", "commands": [{"action_type": "place", "target_object": null, '
+        '"location": {"x": 0.1, "y": 0.2, "z": null}, '
+        '"parameters": {"angle": null, "duration": null, "macro": null, "slots": null}, '
+        '"reasoning": "drop"}], "needs_clarification": false, "clarification_question": null}'
+    )
+    command = response.commands[0]
+    assert command.location == {"x": 0.1, "y": 0.2}
+    assert command.parameters is None
+    print("✓ strict null 정리")
+
+
+def test_repair_near_valid_json():
+    """코드 블록, 작은따옴표, Python 리터럴, 뒤쪽 쉼표, 잘린 출력 보정"""
+    text = (
+        "Here you go:\n```json\n{'speech': 'Picking it up', 'commands': "
+        "[{'action_type': 'pick', 'target_object': 'red_block', 'reasoning': 'grab',},], "
+        "'needs_clarification': False}\n```"
+    )
+    response, repaired = parse_robot_response(text)
+    assert repaired
+    assert response.commands[0].target_object == "red_block"
+
+    response, repaired = parse_robot_response('{"speech": "Moving to the gre')
+    assert repaired
+    assert response.speech == "Moving to the gre"
+
+    # 따옴표 없는 비ASCII 단어: 보정이 죽지 않고 JSONDecodeError로 실패 처리
+    assert repair_json('{"a": 한}') == '{"a": 한}'
+    try:
+        parse_robot_response('{"speech": 안녕, "commands": []}')
+        raise AssertionError("JSONDecodeError가 나야 함")
+    except json.JSONDecodeError:
+        pass
+    print("✓ 로컬 JSON 보정")
+
+
+def test_schema_is_strict():
+    """모든 객체가 닫혀 있고 모든 속성이 required"""
+    def walk(node):
+        if isinstance(node, dict):
+            if "properties" in node:
+                assert node["additionalProperties"] is False
+                assert set(node["required"]) == set(node["properties"])
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(RESPONSE_SCHEMA)
+    print("✓ strict 스키마")
+
+
+def main():
+    print("=" * 60)
+    print("RobotResponse 파싱/보정 테스트")
+    print("=" * 60)
+
+    test_fast_path()
+    test_strict_nulls_dropped()
+    test_repair_near_valid_json()
+    test_schema_is_strict()
+
+    print("\n✅ 모든 테스트 통과!")
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
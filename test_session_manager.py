@@ -0,0 +1,107 @@
+"""
+다중 세션 관리자 테스트
+가짜 OpenAI 클라이언트로 API 키 없이 실행됩니다.
+"""
+
+import json
+import tempfile
+from types import SimpleNamespace
+
+from src.brain.session_manager import BrainSessionManager
+
+
+class EchoCompletions:
+    """마지막 사용자 메시지를 그대로 말하는 스트리밍 대역"""
+
+    def create(self, **kwargs):
+        text = kwargs["messages"][-1]["content"]
+        reply = json.dumps({"speech": f"echo: {text}", "commands": []})
+        return iter([
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=reply))], usage=None, model=None)
+        ])
+
+
+def make_manager(tmp, **kwargs):
+    manager = BrainSessionManager(api_key="test", storage_dir=tmp, **kwargs)
+    fake = SimpleNamespace(chat=SimpleNamespace(completions=EchoCompletions()))
+    manager.pool.clients = [fake]
+    manager.pool.acquire = lambda: fake
+    return manager
+
+
+def test_independent_sessions_with_history_cap():
+    """세션 독립성 + 대화 이력 상한"""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = make_manager(tmp, max_history=4)
+        for i in range(5):
+            manager.think("arm-1", f"a{i}")
+        manager.think("arm-2", "hello")
+
+        history = manager.history("arm-1")
+        assert len(history) == 4
+        assert history[0] == {"role": "user", "content": "a3"}
+        assert manager.history("arm-2")[0]["content"] == "hello"
+    print("✓ 세션 독립성 + 이력 상한")
+
+
+def test_eviction_and_restore():
+    """유휴/초과 세션 디스크 내보내기 후 복원"""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = make_manager(tmp, max_sessions=2, idle_timeout=60)
+        for sid in ("a", "b", "c"):
+            manager.think(sid, f"hi {sid}")
+
+        assert manager.stats()["resident_sessions"] == 2
+        assert manager.evictions == 1
+        assert sorted(manager.session_ids()) == ["a", "b", "c"]
+
+        assert manager.evict_idle(now=float("inf")) == 2
+        assert manager.stats()["resident_sessions"] == 0
+
+        response = manager.think("a", "again")
+        assert response.speech == "echo: again"
+        assert [m["content"] for m in manager.history("a")][0] == "hi a"
+        assert manager.restores == 1
+    print("✓ 세션 내보내기/복원")
+
+
+def test_busy_session_not_evicted_and_unknown_history():
+    """처리 중인 세션은 내보내지 않고 건너뜀, 없는 세션 조회는 세션을 만들지 않음"""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = make_manager(tmp, max_sessions=1)
+        manager.think("busy", "hi")
+        busy = manager._sessions["busy"]
+        with busy.lock:  # LLM 호출 중인 것처럼
+            manager.think("other", "hello")  # 전역 잠금에서 기다리지 않음
+            assert "busy" in manager._sessions and manager.evictions == 0
+            assert manager.evict_idle(now=float("inf")) == 1  # other만
+        manager.think("next", "hey")
+        assert "busy" not in manager._sessions and manager.evictions == 2
+
+        try:
+            manager.history("nobody")
+            raise AssertionError("KeyError가 나야 함")
+        except KeyError:
+            pass
+        assert "nobody" not in manager.session_ids()
+        assert manager.history("busy")[0]["content"] == "hi"  # 내보낸 세션은 디스크에서 읽음
+        assert "busy" not in manager._sessions
+    print("✓ 바쁜 세션 건너뜀 + 없는 세션 404")
+
+
+def main():
+    print("=" * 60)
+    print("다중 세션 관리자 테스트")
+    print("=" * 60)
+
+    test_independent_sessions_with_history_cap()
+    test_eviction_and_restore()
+    test_busy_session_not_evicted_and_unknown_history()
+
+    print("\n✅ 모든 테스트 통과!")
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())